@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Convert flat goal logs into month shards.
+
+Rewrites _data/logs/<goal>.yml as _data/logs/<goal>/YYYY-MM.yml, folding any
+pending journal entries first (see storage.migrate_goal_logs). Goals that
+are already sharded are left alone, so it is safe to re-run. Jekyll pages
+should read logs through _includes/goal-logs.html, which handles both layouts.
+
+Usage:
+    python mcp-server/scripts/shard_logs.py [--repo PATH] [GOAL ...]
+
+Stop the server first; a running instance keeps working but may log a
+warning about files changing underneath it.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "mcp-server" / "src"))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repo", type=Path, default=ROOT, help="repo root containing _data/")
+    parser.add_argument("goals", nargs="*", help="goal IDs to convert (default: all flat logs)")
+    args = parser.parse_args()
+
+    os.environ.setdefault("REPO_PATH", str(args.repo))
+    from goals_mcp import storage
+
+    migrated = {}
+    for goal_id in args.goals or [None]:
+        migrated.update(storage.migrate_goal_logs(goal_id))
+
+    if not migrated:
+        print("Nothing to migrate")
+    for goal_id, shards in migrated.items():
+        print(f"{goal_id}: {shards} month file(s) in _data/logs/{goal_id}/")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Check that storage's libyaml fast path matches the pure-Python YAML path.
+
+For every _data/**/*.yml file this verifies that:
+  - the C loader parses to the same data as yaml.safe_load
+  - the streaming comment-only check agrees with the old line-split check
+  - header extraction and _yaml_dump produce byte-identical output to the
+    old save_yaml code (pure yaml.dump)
+  - block-list files split into chunks that reassemble to the original text
+
+Then it benchmarks load/dump on a synthetic multi-year goal log.
+
+Usage:
+    python mcp-server/scripts/yaml_parity.py [--repo PATH] [--days N]
+
+Exits non-zero on any mismatch.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "mcp-server" / "src"))
+
+
+def old_is_comment_only(content: str) -> bool:
+    lines = [l.strip() for l in content.split('\n') if l.strip() and not l.strip().startswith('#')]
+    return not lines
+
+
+def old_header(content: str) -> str:
+    header_lines = []
+    for line in content.split('\n'):
+        if line.strip().startswith('#') or not line.strip():
+            header_lines.append(line)
+        else:
+            break
+    return '\n'.join(header_lines) + '\n' if header_lines else ''
+
+
+def check_parity(repo: Path) -> int:
+    import yaml
+    from goals_mcp import storage, yaml_list
+
+    failures = 0
+    files = sorted((repo / "_data").rglob("*.yml"))
+    for path in files:
+        rel = path.relative_to(repo)
+        content = path.read_text()
+        problems = []
+
+        if old_is_comment_only(content) != (storage._CONTENT_LINE.search(content) is None):
+            problems.append("comment-only check differs")
+
+        expected = [] if old_is_comment_only(content) else (yaml.safe_load(content) or [])
+        data = storage._parse_yaml(path, content)
+        if data != expected:
+            problems.append("parsed data differs")
+
+        new_header = storage._render_yaml(path, []).rstrip()
+        if new_header != old_header(content).rstrip():
+            problems.append("header differs")
+
+        if expected:
+            old_text = old_header(content) + yaml.dump(expected, default_flow_style=False, allow_unicode=True)
+            if storage._render_yaml(path, expected) != old_text:
+                problems.append("dump differs")
+
+        if isinstance(expected, list) and expected:
+            split = yaml_list.split_items(content)
+            if split is not None:
+                header, chunks = split
+                if header + "".join(chunks) != content + ("" if content.endswith("\n") else "\n"):
+                    problems.append("chunks don't reassemble")
+                if "".join(yaml_list.render_item(i) for i in expected) != yaml.dump(
+                        expected, default_flow_style=False, allow_unicode=True):
+                    problems.append("per-item render differs")
+
+        if problems:
+            failures += 1
+            print(f"FAIL {rel}: {', '.join(problems)}")
+
+    print(f"{len(files) - failures}/{len(files)} files identical")
+    return failures
+
+
+def synthetic_log(days: int) -> list:
+    rng = random.Random(2026)
+    start = date(2026, 1, 1)
+    logs = []
+    for i in range(days):
+        entries = []
+        for _ in range(rng.randint(1, 4)):
+            entry = {"value": rng.randint(5, 90)}
+            if rng.random() < 0.6:
+                entry["notes"] = " ".join(rng.choice(["push", "pull", "legs", "run", "stretch", "felt good",
+                                                      "tired", "PR on bench", "skipped warm-up"])
+                                          for _ in range(rng.randint(3, 25)))
+            entries.append(entry)
+        logs.append({
+            "date": (start + timedelta(days=i)).isoformat(),
+            "entries": entries,
+            "total": sum(e["value"] for e in entries),
+        })
+    return logs
+
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def benchmark(days: int) -> None:
+    import yaml
+    from goals_mcp import storage
+
+    logs = synthetic_log(days)
+    text = yaml.dump(logs, default_flow_style=False, allow_unicode=True)
+    print(f"\nSynthetic log: {days} days, {len(text) / 1024:.0f} KiB")
+    if storage._CYamlDumper is None:
+        print("libyaml not available; fast path disabled")
+
+    rows = [
+        ("load", lambda: yaml.safe_load(text), lambda: storage._yaml_load(text)),
+        ("dump", lambda: yaml.dump(logs, default_flow_style=False, allow_unicode=True),
+         lambda: storage._yaml_dump(logs)),
+    ]
+    for name, old, new in rows:
+        t_old, t_new = timed(old), timed(new)
+        print(f"  {name}: pure {t_old * 1000:8.1f} ms   fast {t_new * 1000:8.1f} ms   {t_old / t_new:5.1f}x")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repo", type=Path, default=ROOT, help="repo root containing _data/")
+    parser.add_argument("--days", type=int, default=3 * 365, help="days in the benchmark log")
+    args = parser.parse_args()
+
+    os.environ.setdefault("REPO_PATH", str(args.repo))
+    failures = check_parity(args.repo)
+    benchmark(args.days)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
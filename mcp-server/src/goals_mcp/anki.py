@@ -13,6 +13,8 @@ import urllib.request
 from dataclasses import dataclass
 from enum import Enum
 
+from . import metrics
+
 logger = logging.getLogger(__name__)
 
 ANKI_CONNECT_URL = "http://localhost:8765"
@@ -50,7 +52,7 @@ def _anki_request(action: str, **params) -> dict:
         headers={"Content-Type": "application/json"},
     )
     try:
-        with urllib.request.urlopen(req, timeout=10) as response:
+        with metrics.dependency("ankiconnect", action), urllib.request.urlopen(req, timeout=10) as response:
             result = json.loads(response.read().decode("utf-8"))
             if result.get("error"):
                 raise Exception(result["error"])
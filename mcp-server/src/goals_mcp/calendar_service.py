@@ -8,6 +8,9 @@ from typing import Optional
 from gcsa.google_calendar import GoogleCalendar
 from gcsa.event import Event
 from gcsa.attendee import Attendee
+from googleapiclient.errors import HttpError
+
+from . import metrics
 
 
 # Token storage location
@@ -41,6 +44,7 @@ def is_authenticated() -> bool:
     return TOKEN_PATH.exists() and CREDENTIALS_PATH.exists()
 
 
+@metrics.timed("google_calendar")
 def get_calendars() -> list[dict]:
     """
     Get list of available calendars.
@@ -64,6 +68,7 @@ def get_calendars() -> list[dict]:
         return []
 
 
+@metrics.timed("google_calendar")
 def resolve_calendar(name: str) -> Optional[str]:
     """
     Resolve calendar name to calendar ID.
@@ -88,6 +93,7 @@ def resolve_calendar(name: str) -> Optional[str]:
         return None
 
 
+@metrics.timed("google_calendar")
 def get_upcoming_events(hours_ahead: int = 8, hours_back: int = 0) -> list[dict]:
     """
     Get calendar events within a time window.
@@ -145,6 +151,7 @@ def get_upcoming_events(hours_ahead: int = 8, hours_back: int = 0) -> list[dict]
     return events
 
 
+@metrics.timed("google_calendar")
 def schedule_goal(
     goal_id: str,
     goal_name: str,
@@ -219,6 +226,7 @@ def schedule_goal(
         return {"success": False, "message": f"Failed to schedule: {e}"}
 
 
+@metrics.timed("google_calendar")
 def get_event_info(event_id: str) -> dict | None:
     """
     Get info about a calendar event.
@@ -245,6 +253,112 @@ def get_event_info(event_id: str) -> dict | None:
         return {"exists": False}
 
 
+# Slack around the scheduled times when listing events for drift; events
+# moved further away than this are looked up one by one.
+DRIFT_WINDOW = timedelta(days=7)
+
+
+def _lookup_event(gc: GoogleCalendar, event_id: str) -> tuple:
+    """
+    (start, error) for one event. start is None only if the calendar
+    confirmed the event is gone (404/410 or cancelled); error is set instead
+    when the lookup itself failed.
+    """
+    try:
+        event = gc.get_event(event_id)
+    except HttpError as e:
+        if e.resp.status in (404, 410):
+            return None, None
+        return None, f"HTTP {e.resp.status}"
+    except Exception as e:
+        return None, str(e) or type(e).__name__
+    if not event or event.other.get("status") == "cancelled":
+        return None, None
+    return event.start, None
+
+
+def _local_naive(value) -> Optional[datetime]:
+    """A datetime as naive local time, the way todos store scheduled_for (None for all-day dates)."""
+    if not isinstance(value, datetime):
+        return None
+    return value.astimezone().replace(tzinfo=None) if value.tzinfo else value
+
+
+@metrics.timed("google_calendar")
+def diff_scheduled_tasks(scheduled_tasks: list[dict]) -> Optional[list[dict]]:
+    """
+    Compare scheduled todo tasks with their calendar events.
+
+    scheduled_tasks are get_all_scheduled_tasks() entries ({goal_id, unit, task});
+    tasks without both event_id and scheduled_for are skipped. [Goal] events
+    on the default calendar (where schedule creates linked events) are read
+    with one paged listing around the scheduled times and joined by event_id
+    in memory; only events missing from it are fetched individually.
+
+    Returns a dict per drifted task with: goal_id, unit, task_id, name,
+    event_id, scheduled_for, status and calendar_start (naive local datetime,
+    for "moved"). status is "moved", "deleted" (the calendar confirmed it) or
+    "unknown" (the lookup failed; error says why). Or None if not
+    authenticated.
+    """
+    gc = get_calendar()
+    if not gc:
+        return None
+
+    linked = []
+    for st in scheduled_tasks:
+        task = st["task"]
+        if not task.get("event_id") or not task.get("scheduled_for"):
+            continue
+        try:
+            when = _local_naive(datetime.fromisoformat(task["scheduled_for"]))
+        except (TypeError, ValueError):
+            continue
+        linked.append((st, task, when))
+    if not linked:
+        return []
+
+    # event_id -> (start, lookup error); start is None if the event is gone
+    starts = {}
+    times = [when for _, _, when in linked]
+    try:
+        for event in gc.get_events(time_min=min(times) - DRIFT_WINDOW, time_max=max(times) + DRIFT_WINDOW,
+                                   single_events=True, query="[Goal]", calendar_id=gc.default_calendar):
+            starts[event.event_id] = (event.start, None)
+    except Exception as e:
+        # Fall back to looking each event up
+        print(f"Calendar error: {e}")
+
+    drift = []
+    for st, task, when in linked:
+        event_id = task["event_id"]
+        if event_id not in starts:
+            starts[event_id] = _lookup_event(gc, event_id)
+
+        entry = {
+            "goal_id": st["goal_id"],
+            "unit": st["unit"],
+            "task_id": task.get("id"),
+            "name": task.get("name", task.get("id")),
+            "event_id": event_id,
+            "scheduled_for": task["scheduled_for"],
+        }
+        start, error = starts[event_id]
+        if error is not None:
+            drift.append({**entry, "status": "unknown", "calendar_start": None, "error": error})
+            continue
+        if start is None:
+            drift.append({**entry, "status": "deleted", "calendar_start": None})
+            continue
+        cal_start = _local_naive(start)
+        # Times that differ by more than 1 minute
+        if cal_start is not None and abs((cal_start - when).total_seconds()) > 60:
+            drift.append({**entry, "status": "moved", "calendar_start": cal_start})
+
+    return drift
+
+
+@metrics.timed("google_calendar")
 def reschedule_goal(event_id: str, new_time: datetime) -> dict:
     """
     Reschedule an existing goal event.
@@ -282,6 +396,7 @@ def reschedule_goal(event_id: str, new_time: datetime) -> dict:
         return {"success": False, "message": f"Failed to reschedule: {e}"}
 
 
+@metrics.timed("google_calendar")
 def unschedule_goal(event_id: str) -> dict:
     """
     Remove a scheduled goal event.
@@ -303,6 +418,7 @@ def unschedule_goal(event_id: str) -> dict:
         return {"success": False, "message": f"Failed to remove: {e}"}
 
 
+@metrics.timed("google_calendar")
 def _check_calendar_conflicts(cal_id: str, cal_name: str, time: datetime, end_time: datetime) -> list[dict]:
     """Check a single calendar for conflicts (sync helper)."""
     conflicts = []
@@ -376,6 +492,7 @@ def check_conflicts(time: datetime, duration_min: int = 30) -> list[dict]:
         return asyncio.run(check_conflicts_async(time, duration_min))
 
 
+@metrics.timed("google_calendar")
 def find_goal_event_today(goal_id: str) -> Optional[str]:
     """
     Find today's scheduled event for a goal.
@@ -402,6 +519,7 @@ def find_goal_event_today(goal_id: str) -> Optional[str]:
     return None
 
 
+@metrics.timed("google_calendar")
 def mark_goal_complete(event_id: str) -> dict:
     """
     Mark a goal event as complete by prefixing with checkmark.
@@ -440,6 +558,7 @@ def mark_goal_complete(event_id: str) -> dict:
         return {"success": False, "message": f"Failed: {e}"}
 
 
+@metrics.timed("google_calendar")
 def get_missed_scheduled(hours_back: int = 24) -> list[dict]:
     """
     Find goal events that passed without being marked complete.
@@ -0,0 +1,169 @@
+"""
+Date-indexed view of _data/daily.yml.
+
+Keeps the parsed entries with a date -> position index and a sorted date
+array for range queries, refreshed only when the file's stat key changes.
+Updates splice the changed entry's YAML into the existing text (see
+yaml_list) instead of re-dumping the whole year, and install the result as
+the new state so the next lookup doesn't reparse.
+"""
+
+import copy
+import threading
+from bisect import bisect_left, bisect_right
+
+from . import yaml_list
+from .storage import (
+    _active_txn, _note_read, _outside_transaction, _queue_write, _stat_key, get_daily_path,
+    load_yaml, to_date_str,
+)
+
+_lock = threading.Lock()
+
+_key = None                  # stat key of the file the state below reflects
+_header = ""
+_entries: list[dict] = []
+_chunks: list[str] | None = None   # per-entry text, None if the file isn't a plain block list
+_index: dict[str, int] = {}        # date -> position of its first entry
+_dates: list[str] = []             # sorted dates with an entry
+
+
+def _install(key, header: str, entries: list, chunks: list[str] | None) -> None:
+    global _key, _header, _entries, _chunks, _index, _dates
+    index = {}
+    for i, entry in enumerate(entries):
+        if isinstance(entry, dict):
+            index.setdefault(to_date_str(entry.get("date")), i)
+    _key, _header, _entries, _chunks = key, header, entries, chunks
+    _index = index
+    _dates = sorted(index)
+
+
+def _refresh() -> None:
+    """Reload the state if daily.yml changed on disk."""
+    path = get_daily_path()
+    key = _stat_key(path)
+    if key is None:
+        _install(None, "", [], [])
+    elif key != _key:
+        # The file itself, not a copy pinned by the current transaction
+        with _outside_transaction():
+            entries = load_yaml(path)
+        if not isinstance(entries, list):
+            entries = []
+        split = yaml_list.split_items(path.read_text())
+        header, chunks = split if split else ("", None)
+        if chunks is not None and len(chunks) != len(entries):
+            chunks = None
+        _install(key, header, entries, chunks)
+    # The current transaction's answers come from this version
+    _note_read(path, _key)
+
+
+def _pending() -> bool:
+    """True if daily.yml has an unflushed write in the current transaction."""
+    txn = _active_txn.get()
+    return bool(txn and get_daily_path() in txn.dirty)
+
+
+def _current_entries() -> list:
+    """The entries as the caller should see them (pending writes included)."""
+    if _pending():
+        entries = load_yaml(get_daily_path())
+        return entries if isinstance(entries, list) else []
+    _refresh()
+    return _entries
+
+
+def get(date: str) -> dict | None:
+    """Entry for a YYYY-MM-DD date, or None."""
+    with _lock:
+        if _pending():
+            for entry in _current_entries():
+                if to_date_str(entry.get("date")) == date:
+                    return entry
+            return None
+        _refresh()
+        i = _index.get(date)
+        return copy.deepcopy(_entries[i]) if i is not None else None
+
+
+def between(start: str, end: str) -> list[dict]:
+    """Entries dated start..end inclusive, in date order."""
+    with _lock:
+        if _pending():
+            entries = [e for e in _current_entries() if start <= to_date_str(e.get("date")) <= end]
+            return sorted(entries, key=lambda e: to_date_str(e.get("date")))
+        _refresh()
+        dates = _dates[bisect_left(_dates, start):bisect_right(_dates, end)]
+        return [copy.deepcopy(_entries[_index[d]]) for d in dates]
+
+
+def save(entries: list) -> None:
+    """Write the full entry list, reusing the text of unchanged entries."""
+    path = get_daily_path()
+    with _lock:
+        if not _pending():
+            _refresh()
+        base_key, header = _key, _header
+        old_entries, old_chunks = _entries, _chunks
+
+    rendered = {}
+
+    def render(data):
+        if old_chunks is None or _stat_key(path) != base_key:
+            # Not a plain list, or changed underneath us: fall back to a full dump
+            split = yaml_list.split_items(path.read_text()) if path.exists() else None
+            new_header = split[0] if split else ""
+            text, chunks = yaml_list.render_list(new_header, data)
+        else:
+            new_header = header
+            text, chunks = yaml_list.render_list(header, data, old_entries, old_chunks)
+        rendered.update(header=new_header, entries=data, chunks=chunks)
+        return text
+
+    def after():
+        if rendered:
+            with _lock:
+                _install(_stat_key(path), rendered["header"], rendered["entries"], rendered["chunks"])
+
+    _queue_write(path, entries, render, after)
+
+
+def update(date: str, fields: dict) -> dict:
+    """Update or create the entry for date (see storage.update_daily_entry)."""
+    with _lock:
+        entries = list(_current_entries())
+        found_idx = None
+        if _pending():
+            for i, entry in enumerate(entries):
+                if to_date_str(entry.get("date")) == date:
+                    found_idx = i
+                    break
+        else:
+            found_idx = _index.get(date)
+
+    if found_idx is not None:
+        # Update a copy: the cached state must not change before the write lands
+        result = dict(entries[found_idx])
+        for key, value in fields.items():
+            if value is not None:
+                result[key] = value
+        entries[found_idx] = result
+    else:
+        # Create new entry with defaults
+        result = {
+            "date": date,
+            "calendar": fields.get("calendar", False),
+            "fitness": fields.get("fitness", 0),
+            "hindi": fields.get("hindi", 0),
+        }
+        # Add optional fields if provided
+        if "mood" in fields:
+            result["mood"] = fields["mood"]
+        if "notes" in fields:
+            result["notes"] = fields["notes"]
+        entries.append(result)
+
+    save(entries)
+    return copy.deepcopy(result)
@@ -0,0 +1,217 @@
+"""
+Runs blocking tool handlers off the event loop.
+
+Tool handlers do blocking file, Google Calendar, wger, AnkiConnect, Pushover
+and gh I/O. run() hands them to a shared thread pool so one slow call doesn't
+stall every other session on the loop. Each integration has its own limit on
+calls in flight, so a hung API can hold at most that many workers; calls over
+the limit wait on the loop, not in the pool. The limits leave at least one
+worker for tools that only touch local files.
+
+Queue depth and wait times are recorded per integration; see queue_stats().
+
+Handlers that make several independent external reads (check_in, status)
+start them together with FanOut and collect them against one deadline, so
+their latency is bounded by the slowest read (or the deadline), not the sum.
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+logger = logging.getLogger(__name__)
+
+TOOL_WORKERS = int(os.environ.get("GOALS_TOOL_WORKERS", "8"))
+
+# Calls in flight per integration; the rest queue
+INTEGRATION_LIMITS = {
+    "local": TOOL_WORKERS,
+    "calendar": 4,
+    "wger": 2,
+    "practice": 1,   # AnkiConnect, gh gist, Pushover
+}
+
+# Log queue waits longer than this
+QUEUE_SLOW_SECONDS = 1.0
+
+# Threads for FanOut reads. Reads that miss their deadline keep running, so
+# this also caps how many hung calls can pile up.
+FANOUT_WORKERS = int(os.environ.get("GOALS_FANOUT_WORKERS", "16"))
+
+# Default latency budget for a FanOut
+FANOUT_TIMEOUT_SECONDS = float(os.environ.get("GOALS_FANOUT_TIMEOUT", "5"))
+
+# FanOut.result() for a read that missed the deadline
+TIMED_OUT = object()
+
+_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_fanout_executor: ThreadPoolExecutor | None = None
+_stats: dict[str, dict] = {}
+
+# Semaphores belong to a loop: event loop -> integration -> semaphore
+_limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=TOOL_WORKERS, thread_name_prefix="goals-tool")
+        return _executor
+
+
+def _limit(loop: asyncio.AbstractEventLoop, integration: str) -> asyncio.Semaphore:
+    per_loop = _limits.setdefault(loop, {})
+    semaphore = per_loop.get(integration)
+    if semaphore is None:
+        limit = INTEGRATION_LIMITS.get(integration, INTEGRATION_LIMITS["local"])
+        semaphore = per_loop[integration] = asyncio.Semaphore(min(limit, TOOL_WORKERS))
+    return semaphore
+
+
+def _stat(integration: str) -> dict:
+    """Counters for integration; call with _lock held."""
+    s = _stats.get(integration)
+    if s is None:
+        s = _stats[integration] = {
+            "limit": min(INTEGRATION_LIMITS.get(integration, INTEGRATION_LIMITS["local"]), TOOL_WORKERS),
+            "calls": 0, "queued": 0, "queued_max": 0, "in_flight": 0,
+            "wait_total": 0.0, "wait_max": 0.0,
+            "run_total": 0.0, "run_max": 0.0,
+        }
+    return s
+
+
+def _queued(integration: str, delta: int) -> None:
+    with _lock:
+        s = _stat(integration)
+        s["queued"] += delta
+        s["queued_max"] = max(s["queued_max"], s["queued"])
+
+
+def _started(integration: str, waited: float) -> None:
+    with _lock:
+        s = _stat(integration)
+        s["queued"] -= 1
+        s["in_flight"] += 1
+        s["calls"] += 1
+        s["wait_total"] += waited
+        s["wait_max"] = max(s["wait_max"], waited)
+    if waited > QUEUE_SLOW_SECONDS:
+        logger.warning(f"Tool call for {integration} queued {waited:.2f}s")
+
+
+def _finished(integration: str, ran: float) -> None:
+    with _lock:
+        s = _stat(integration)
+        s["in_flight"] -= 1
+        s["run_total"] += ran
+        s["run_max"] = max(s["run_max"], ran)
+
+
+async def run(integration: str, fn, *args):
+    """
+    Run fn(*args) in the tool pool under integration's limit and return its
+    result. fn runs in a copy of the caller's context, like asyncio.to_thread.
+    """
+    loop = asyncio.get_running_loop()
+    limit = _limit(loop, integration)
+    queued_at = time.monotonic()
+    _queued(integration, 1)
+    try:
+        await limit.acquire()
+    except BaseException:
+        _queued(integration, -1)
+        raise
+
+    def call():
+        start = time.monotonic()
+        _started(integration, start - queued_at)
+        try:
+            return fn(*args)
+        finally:
+            _finished(integration, time.monotonic() - start)
+
+    def done(future: Future) -> None:
+        # Free the slot when the call ends, not when its caller stops waiting
+        if future.cancelled():
+            _queued(integration, -1)
+        try:
+            loop.call_soon_threadsafe(limit.release)
+        except RuntimeError:
+            pass   # loop already closed
+
+    try:
+        future = _pool().submit(contextvars.copy_context().run, call)
+    except BaseException:
+        _queued(integration, -1)
+        limit.release()
+        raise
+    future.add_done_callback(done)
+    return await asyncio.wrap_future(future)
+
+
+def _fanout_pool() -> ThreadPoolExecutor:
+    global _fanout_executor
+    with _lock:
+        if _fanout_executor is None:
+            _fanout_executor = ThreadPoolExecutor(max_workers=FANOUT_WORKERS, thread_name_prefix="goals-fanout")
+        return _fanout_executor
+
+
+class FanOut:
+    """
+    External reads started together and collected against one deadline.
+
+    Reads run in plain worker threads, outside the caller's transaction, so
+    they must not touch storage.
+    """
+
+    def __init__(self, timeout: float = None):
+        self.timeout = FANOUT_TIMEOUT_SECONDS if timeout is None else timeout
+        self.deadline = time.monotonic() + self.timeout
+        self.futures: dict = {}
+
+    def submit(self, key, fn, *args) -> None:
+        """Start fn(*args) now (unless key was already submitted); collect it with result(key)."""
+        if key not in self.futures:
+            self.futures[key] = _fanout_pool().submit(fn, *args)
+
+    def result(self, key):
+        """
+        The read's result (re-raising its exception), or TIMED_OUT if the
+        deadline passed first.
+        """
+        try:
+            return self.futures[key].result(timeout=max(0.0, self.deadline - time.monotonic()))
+        except FutureTimeout:
+            logger.warning(f"{key} missed its {self.timeout:g}s deadline")
+            return TIMED_OUT
+
+
+def queue_stats() -> dict[str, dict]:
+    """
+    Per-integration counters: limit, calls started, queued now (and the
+    most ever), in flight now, queue wait and run times (seconds).
+    """
+    with _lock:
+        return {integration: dict(s) for integration, s in _stats.items()}
+
+
+def shutdown() -> None:
+    """Stop the pools, dropping queued calls (running ones finish in the background)."""
+    global _executor, _fanout_executor
+    with _lock:
+        executors = (_executor, _fanout_executor)
+        _executor = _fanout_executor = None
+    for executor in executors:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -10,6 +10,8 @@ import tempfile
 from dataclasses import dataclass
 from pathlib import Path
 
+from . import metrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +22,7 @@ class GistResult:
     message: str
 
 
+@metrics.timed("gh")
 def create_gist(
     content: str,
     description: str = "Hindi Practice Prompt",
@@ -2,7 +2,8 @@
 
 import subprocess
 from datetime import datetime
-from .storage import REPO_PATH
+from . import metrics
+from .storage import REPO_PATH, sync_lock
 
 
 def get_today_str() -> str:
@@ -10,6 +11,7 @@ def get_today_str() -> str:
     return datetime.now().strftime("%Y-%m-%d")
 
 
+@metrics.timed("git")
 def get_last_commit_info() -> dict | None:
     """
     Get info about the last commit.
@@ -45,6 +47,7 @@ def is_todays_status_commit(commit_info: dict | None) -> bool:
     return commit_info["date"] == today and commit_info["message"] == expected_message
 
 
+@metrics.timed("git")
 def commit_and_push() -> dict:
     """
     Git add, commit, and push changes.
@@ -61,20 +64,22 @@ def commit_and_push() -> dict:
         today = get_today_str()
         daily_message = f"status updates-{today}"
 
-        # Unstage everything first (in case user has other files staged)
-        subprocess.run(
-            ["git", "reset", "HEAD"],
-            cwd=REPO_PATH,
-            capture_output=True
-        )
+        # Stage with writers paused so a transaction is never half-committed
+        with sync_lock():
+            # Unstage everything first (in case user has other files staged)
+            subprocess.run(
+                ["git", "reset", "HEAD"],
+                cwd=REPO_PATH,
+                capture_output=True
+            )
 
-        # Git add only _data/
-        subprocess.run(
-            ["git", "add", "_data/"],
-            cwd=REPO_PATH,
-            check=True,
-            capture_output=True
-        )
+            # Git add only _data/
+            subprocess.run(
+                ["git", "add", "_data/"],
+                cwd=REPO_PATH,
+                check=True,
+                capture_output=True
+            )
 
         # Check if there are staged changes
         status_result = subprocess.run(
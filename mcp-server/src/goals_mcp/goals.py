@@ -1,23 +1,43 @@
 """Goal logic: progression tracking, current position, todos computation."""
 
+import os
+from bisect import bisect_left, bisect_right
+from contextvars import ContextVar
 from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
 
+from . import log_aggregates, sqlite_mirror
 from .storage import (
-    get_goal_logs, discover_content, get_today, to_date_str,
-    get_schedule, get_current_week, get_unit_todo
+    REPO_PATH, get_goal_logs, get_goal_log_months, discover_content, get_today, to_date_str,
+    get_schedule, get_current_week, get_unit_todo, get_goal_completed_items, _completed_items,
+    get_goal_log_paths, get_todo_path, get_version, has_pending_writes,
 )
 
 
+# Todo files read while computing one goal's todo: path -> version before the read
+_todo_reads: ContextVar[dict | None] = ContextVar("_todo_reads", default=None)
+
+
+def _unit_todo(goal_id: str, unit: str) -> dict:
+    """get_unit_todo, noting the file for compute_todos' memo."""
+    reads = _todo_reads.get()
+    if reads is not None:
+        path = get_todo_path(goal_id, unit)
+        reads.setdefault(path, get_version(path))
+    return get_unit_todo(goal_id, unit)
+
+
 def has_scheduled_tasks(goal_id: str, unit: str) -> bool:
     """Check if a goal/unit has any scheduled tasks."""
-    todo = get_unit_todo(goal_id, unit)
+    todo = _unit_todo(goal_id, unit)
     tasks = todo.get("tasks", [])
     return any(t.get("scheduled_for") or t.get("event_id") for t in tasks)
 
 
 def get_unscheduled_tasks(goal_id: str, unit: str) -> list[str]:
     """Get list of task names that are not scheduled and not done."""
-    todo = get_unit_todo(goal_id, unit)
+    todo = _unit_todo(goal_id, unit)
     tasks = todo.get("tasks", [])
     return [
         t.get("name", t.get("id"))
@@ -28,18 +48,92 @@ def get_unscheduled_tasks(goal_id: str, unit: str) -> list[str]:
 
 def get_completed_items(logs: list) -> set:
     """Get set of completed top-level items from logs."""
-    completed = set()
-    for log in logs:
-        if log.get("done") and log.get("path"):
-            top_item = log["path"].split("/")[0]
-            completed.add(top_item)
-    return completed
+    return set(_completed_items(logs))
+
 
+class _GoalLogs:
+    """
+    The log questions compute_todos asks about one goal.
 
-def get_current(goal_config: dict, logs: list) -> dict:
+    Answered with indexed queries when the SQLite mirror is on, and from the
+    write-time aggregates (log_aggregates) otherwise. While the current
+    transaction has unwritten log changes, sharded logs are read only for the
+    months a question covers, and flat logs are loaded once and scanned.
+    """
+
+    def __init__(self, goal_id: str):
+        self.goal_id = goal_id
+        self.mirrored = sqlite_mirror.ready("logs", goal_id)
+        self.aggregates = None if self.mirrored else log_aggregates.current(goal_id)
+        self._records = None
+
+    @property
+    def records(self) -> list:
+        if self._records is None:
+            self._records = get_goal_logs(self.goal_id)
+        return self._records
+
+    def last_date(self):
+        """Date of the last record that has one."""
+        if self.mirrored:
+            return sqlite_mirror.log_last_date(self.goal_id)
+        if self.aggregates is not None:
+            return self.aggregates["last_date"]
+        months = None if self._records is not None else get_goal_log_months(self.goal_id)
+        if months is None:
+            chunks = [self.records]
+        else:
+            # Newest month first; usually only the last shard is read
+            chunks = (get_goal_logs(self.goal_id, f"{m}-01", f"{m}-31") for m in reversed(months))
+        for logs in chunks:
+            for log in reversed(logs):
+                if "date" in log:
+                    return log["date"]
+        return None
+
+    def since(self, start: str, end: str = None) -> tuple:
+        """(records, sum of value, sum of total-or-value) dated start..end."""
+        if self.mirrored:
+            return sqlite_mirror.log_stats(self.goal_id, start, end)
+        if self.aggregates is not None:
+            return log_aggregates.stats(self.aggregates, start, end)
+        if self._records is None:
+            logs = get_goal_logs(self.goal_id, start, end)
+        else:
+            logs = [l for l in self.records
+                    if to_date_str(l.get("date")) >= start and (end is None or to_date_str(l.get("date")) <= end)]
+        return (
+            len(logs),
+            sum(l.get("value", 0) for l in logs),
+            # Handle both nested format (total field) and flat format (value field)
+            sum(l.get("total", l.get("value", 0)) for l in logs),
+        )
+
+    def completed(self) -> set:
+        if self.mirrored:
+            return sqlite_mirror.log_completed_items(self.goal_id)
+        if self.aggregates is not None:
+            return self.aggregates["completed"]
+        if self._records is not None:
+            return get_completed_items(self._records)
+        return get_goal_completed_items(self.goal_id)
+
+
+def _completed_positions(items: list, completed) -> list[int]:
+    """Sorted positions in items (a sorted list) of the completed ones."""
+    positions = []
+    for name in completed:
+        positions.extend(range(bisect_left(items, name), bisect_right(items, name)))
+    positions.sort()
+    return positions
+
+
+def get_current(goal_config: dict, logs: list = None, completed: set = None) -> dict:
     """
     Compute current position for a goal based on progression type.
 
+    Pass either the goal's logs or the set of completed items from them.
+
     Returns dict with:
       - current: current item name (or None)
       - done: count of completed items
@@ -53,15 +147,16 @@ def get_current(goal_config: dict, logs: list) -> dict:
         return {"current": None, "done": 0, "total": 0}
 
     items = discover_content(content_path)
-    completed = get_completed_items(logs)
-    done_count = len([i for i in items if i in completed])
+    if completed is None:
+        completed = get_completed_items(logs or [])
+    done = _completed_positions(items, completed)
+    done_count = len(done)
 
     if progression == "sequential":
-        current = None
-        for item in items:
-            if item not in completed:
-                current = item
-                break
+        # done[i] - i never decreases, so the first gap in the completed
+        # positions (the first item not done) can be found by bisection
+        first_open = bisect_left(range(done_count), True, key=lambda i: done[i] > i)
+        current = items[first_open] if first_open < len(items) else None
         return {
             "current": current,
             "done": done_count,
@@ -161,11 +256,107 @@ def get_urgency_config(goal_config: dict) -> dict:
     return {"type": "none"}
 
 
+def _nag_times(urgency: dict) -> tuple:
+    """(nag_from, due_by) of a daily goal as times of day."""
+    if "due_time" in urgency:
+        # Parsed when goals.yml was compiled
+        return urgency["nag_time"], urgency["due_time"]
+    try:
+        nag_time = datetime.strptime(urgency.get("nag_from", "07:00"), "%H:%M").time()
+        due_time = datetime.strptime(urgency.get("due_by", "23:59"), "%H:%M").time()
+    except ValueError:
+        nag_time = datetime.strptime("07:00", "%H:%M").time()
+        due_time = datetime.strptime("23:59", "%H:%M").time()
+    return nag_time, due_time
+
+
+def _nag_phase(urgency: dict, now: datetime) -> str:
+    """Where now falls for a daily goal: "quiet" before nag_from, "due", or "overdue" after due_by."""
+    nag_time, due_time = _nag_times(urgency)
+    current_time = now.time()
+    if current_time > due_time:
+        return "overdue"
+    if current_time >= nag_time:
+        return "due"
+    return "quiet"
+
+
+def _urgency(config: dict, goal_id: str, goal_config: dict) -> dict:
+    """A goal's urgency spec, precomputed if config is a compiled GoalsConfig."""
+    specs = getattr(config, "urgency", None)
+    if specs is not None and goal_id in specs:
+        return specs[goal_id]
+    return get_urgency_config(goal_config)
+
+
+def next_todo_change(config: dict, now: datetime) -> datetime:
+    """The next time a goal's todo can change without any file changing (see _todo_key)."""
+    changes = [datetime.combine(now.date() + timedelta(days=1), datetime.min.time())]
+    for goal_id, goal_config in config.get("goals", {}).items():
+        urgency = _urgency(config, goal_id, goal_config)
+        if urgency.get("cadence") != "daily":
+            continue
+        nag_time, due_time = _nag_times(urgency)
+        # Due from nag_from on; overdue only once past due_by
+        for at in (datetime.combine(now.date(), nag_time),
+                   datetime.combine(now.date(), due_time) + timedelta(microseconds=1)):
+            if at > now:
+                changes.append(at)
+    return min(changes)
+
+
+# Per-goal todo memo: goal_id -> (inputs key, todo files read and their versions, todo or None)
+_todo_memo: dict[str, tuple[tuple, dict, dict | None]] = {}
+
+
+@lru_cache(maxsize=None)
+def _todo_input_paths(goal_id: str) -> tuple:
+    """Log files and directories and schedule.yml, which a goal's todo is computed from."""
+    return tuple(get_goal_log_paths(goal_id) + [REPO_PATH / "_data" / "schedule.yml"])
+
+
+def _listing_version(path: Path) -> tuple | None:
+    """Changes when entries are added to, removed from or renamed in a directory."""
+    try:
+        st = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return (st.st_mtime_ns, st.st_ino)
+
+
+def _todo_key(goal_id: str, goal_config: dict, urgency: dict, now: datetime) -> tuple | None:
+    """
+    What a goal's todo depends on besides the todo files it reads (which
+    compute_todos checks separately): its config, its log files, schedule.yml,
+    its content directory's listing and a time bucket that flips at day
+    rollovers (which also covers week rollovers) and, for daily goals, at
+    nag_from and due_by. None if the current transaction has unwritten changes
+    to any of its files.
+
+    goal_config is the compiled config's own (read-only) dict, so comparing
+    keys checks it by identity until goals.yml is reloaded. Only the content
+    directory's item names are read, so its mtime stands in for its entries.
+    """
+    paths = _todo_input_paths(goal_id)
+    if has_pending_writes([*paths, REPO_PATH / "_data" / "todos" / goal_id]):
+        return None
+
+    bucket = now.strftime("%Y-%m-%d")
+    if urgency.get("cadence") == "daily":
+        bucket = (bucket, _nag_phase(urgency, now))
+    content = goal_config.get("content")
+    listing = _listing_version(REPO_PATH / content) if content else None
+    return (goal_config, bucket, listing, tuple(get_version(p) for p in paths))
+
+
 def compute_todos(config: dict) -> list[dict]:
     """
     Compute what needs attention today.
 
     Returns todos with priority: "overdue" (red), "due" (yellow), "info" (gray)
+
+    Each goal's todo is memoized and only recomputed when its inputs change
+    (see _todo_key), or a todo file it read changed.
     """
     todos = []
     today = get_today()
@@ -173,396 +364,403 @@ def compute_todos(config: dict) -> list[dict]:
     goals = config.get("goals", {})
 
     for goal_id, goal_config in goals.items():
-        logs = get_goal_logs(goal_id)
-        name = goal_config.get("name", goal_id)
-        unit = goal_config.get("unit", "")
-
-        # Get urgency configuration
-        urgency = get_urgency_config(goal_config)
-        urgency_type = urgency.get("type", "none")
-
-        # Find last log date
-        last_log_date = None
-        for log in reversed(logs):
-            if "date" in log:
-                last_log_date = log["date"]
-                break
+        urgency = _urgency(config, goal_id, goal_config)
+        key = _todo_key(goal_id, goal_config, urgency, now)
+        memo = _todo_memo.get(goal_id)
+        if (key is not None and memo is not None and memo[0] == key
+                and all(get_version(p) == v for p, v in memo[1].items())):
+            todo = memo[2]
+        else:
+            token = _todo_reads.set({})
+            try:
+                todo = _goal_todo(goal_id, goal_config, urgency, today, now)
+                reads = _todo_reads.get()
+            finally:
+                _todo_reads.reset(token)
+            if key is not None:
+                _todo_memo[goal_id] = (key, reads, todo)
+        if todo is not None:
+            todos.append(dict(todo))
 
-        # Process based on urgency type
-        if urgency_type == "cadence":
-            cadence = urgency.get("cadence")
+    # Sort by priority: overdue first, then due, then info
+    priority_order = {"overdue": 0, "due": 1, "info": 2}
+    todos.sort(key=lambda x: priority_order.get(x.get("priority", "info"), 99))
 
-            if cadence == "daily":
-                progression = goal_config.get("progression")
+    return todos
 
-                # For time-weekly goals, check current week's todo tasks instead of generic logs
-                if progression == "time-weekly":
-                    schedule = get_schedule()
-                    current_week = get_current_week(schedule)
-                    week_num = current_week.get("number", 1)
-                    unit = f"week-{week_num}"
 
-                    # Get today's day name (mon, tue, wed, etc.)
-                    day_names = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
-                    today_day = day_names[now.weekday()]
+def _goal_todo(goal_id: str, goal_config: dict, urgency: dict, today: str, now: datetime) -> dict | None:
+    """The todo for one goal, or None if it needs no attention."""
+    logs = _GoalLogs(goal_id)
+    name = goal_config.get("name", goal_id)
+    unit = goal_config.get("unit", "")
 
-                    # Check todo tasks for today
-                    todo = get_unit_todo(goal_id, unit)
-                    tasks = todo.get("tasks", [])
+    urgency_type = urgency.get("type", "none")
 
-                    # Find today's task(s)
-                    today_tasks = [t for t in tasks if today_day in t.get("id", "").lower()]
+    # Find last log date
+    last_log_date = logs.last_date()
 
-                    if today_tasks:
-                        done_tasks = [t for t in today_tasks if t.get("done")]
-                        pending_tasks = [t for t in today_tasks if not t.get("done")]
+    # Process based on urgency type
+    if urgency_type == "cadence":
+        cadence = urgency.get("cadence")
 
-                        if pending_tasks:
-                            task_names = ", ".join(t.get("name", t.get("id")) for t in pending_tasks[:2])
-                            todos.append({
-                                "goal": goal_id,
-                                "name": name,
-                                "message": f"{name}: {task_names}",
-                                "priority": "due"
-                            })
-                        elif done_tasks:
-                            todos.append({
-                                "goal": goal_id,
-                                "name": name,
-                                "message": f"{name}: today's tasks done ✓",
-                                "priority": "info"
-                            })
-                    else:
-                        # No day-specific tasks, show general progress
-                        pending = [t for t in tasks if not t.get("done")]
-                        if pending:
-                            todos.append({
-                                "goal": goal_id,
-                                "name": name,
-                                "message": f"{name}: week {week_num} - {len(pending)} tasks pending",
-                                "priority": "info"
-                            })
-                else:
-                    # Regular daily cadence - check logs
-                    today_logs = [l for l in logs if to_date_str(l.get("date")) == today]
-                    if not today_logs:
-                        due_by = urgency.get("due_by", "23:59")
-                        nag_from = urgency.get("nag_from", "07:00")
-
-                        # Parse times
-                        try:
-                            due_time = datetime.strptime(due_by, "%H:%M").time()
-                            nag_time = datetime.strptime(nag_from, "%H:%M").time()
-                        except ValueError:
-                            due_time = datetime.strptime("23:59", "%H:%M").time()
-                            nag_time = datetime.strptime("07:00", "%H:%M").time()
-
-                        current_time = now.time()
-
-                        if current_time > due_time:
-                            # Overdue - past due_by time
-                            todos.append({
-                                "goal": goal_id,
-                                "name": name,
-                                "message": f"{name}: overdue (due by {due_by})",
-                                "priority": "overdue"
-                            })
-                        elif current_time >= nag_time:
-                            # Due - between nag_from and due_by
-                            todos.append({
-                                "goal": goal_id,
-                                "name": name,
-                                "message": f"{name}: not done today",
-                                "priority": "due"
-                            })
-                        # Before nag_from: don't show
-
-            elif cadence == "weekly":
-                week_start = now - timedelta(days=now.weekday())
-                week_start_str = week_start.strftime("%Y-%m-%d")
-                week_logs = [l for l in logs if to_date_str(l.get("date")) >= week_start_str]
-
-                if not week_logs:
-                    # Nothing logged this week
-                    day_of_week = now.weekday()  # 0=Monday, 6=Sunday
-                    if day_of_week >= 4:  # Thursday or later
-                        todos.append({
+        if cadence == "daily":
+            progression = goal_config.get("progression")
+
+            # For time-weekly goals, check current week's todo tasks instead of generic logs
+            if progression == "time-weekly":
+                current_week = get_current_week()
+                week_num = current_week.get("number", 1)
+                unit = f"week-{week_num}"
+
+                # Get today's day name (mon, tue, wed, etc.)
+                day_names = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+                today_day = day_names[now.weekday()]
+
+                # Check todo tasks for today
+                todo = _unit_todo(goal_id, unit)
+                tasks = todo.get("tasks", [])
+
+                # Find today's task(s)
+                today_tasks = [t for t in tasks if today_day in t.get("id", "").lower()]
+
+                if today_tasks:
+                    done_tasks = [t for t in today_tasks if t.get("done")]
+                    pending_tasks = [t for t in today_tasks if not t.get("done")]
+
+                    if pending_tasks:
+                        task_names = ", ".join(t.get("name", t.get("id")) for t in pending_tasks[:2])
+                        return {
                             "goal": goal_id,
                             "name": name,
-                            "message": f"{name}: nothing logged this week",
-                            "priority": "overdue"
-                        })
-                    else:
-                        todos.append({
+                            "message": f"{name}: {task_names}",
+                            "priority": "due"
+                        }
+                    elif done_tasks:
+                        return {
                             "goal": goal_id,
                             "name": name,
-                            "message": f"{name}: week started, nothing logged",
-                            "priority": "due"
-                        })
+                            "message": f"{name}: today's tasks done ✓",
+                            "priority": "info"
+                        }
                 else:
-                    # Show progress
-                    total = sum(l.get("value", 0) for l in week_logs)
-                    todos.append({
-                        "goal": goal_id,
-                        "name": name,
-                        "message": f"{name}: {total} {unit} this week",
-                        "priority": "info"
-                    })
+                    # No day-specific tasks, show general progress
+                    pending = [t for t in tasks if not t.get("done")]
+                    if pending:
+                        return {
+                            "goal": goal_id,
+                            "name": name,
+                            "message": f"{name}: week {week_num} - {len(pending)} tasks pending",
+                            "priority": "info"
+                        }
+            else:
+                # Regular daily cadence - check logs
+                today_count, _, _ = logs.since(today, today)
+                if not today_count:
+                    due_by = urgency.get("due_by", "23:59")
 
-            elif cadence == "biweekly":
-                if last_log_date:
-                    last_date = datetime.strptime(to_date_str(last_log_date), "%Y-%m-%d")
-                    days_since = (now - last_date).days
+                    phase = _nag_phase(urgency, now)
 
-                    if days_since >= 14:
-                        todos.append({
+                    if phase == "overdue":
+                        # Overdue - past due_by time
+                        return {
                             "goal": goal_id,
                             "name": name,
-                            "message": f"{name}: {days_since} days since last (overdue)",
+                            "message": f"{name}: overdue (due by {due_by})",
                             "priority": "overdue"
-                        })
-                    elif days_since >= 12:
-                        todos.append({
+                        }
+                    elif phase == "due":
+                        # Due - between nag_from and due_by
+                        return {
                             "goal": goal_id,
                             "name": name,
-                            "message": f"{name}: {days_since} days since last",
+                            "message": f"{name}: not done today",
                             "priority": "due"
-                        })
-                    else:
-                        # Show info
-                        todos.append({
-                            "goal": goal_id,
-                            "name": name,
-                            "message": f"{name}: {days_since} days since last",
-                            "priority": "info"
-                        })
+                        }
+                    # Before nag_from: don't show
+
+        elif cadence == "weekly":
+            week_start = now - timedelta(days=now.weekday())
+            week_start_str = week_start.strftime("%Y-%m-%d")
+            week_count, week_value, _ = logs.since(week_start_str)
+
+            if not week_count:
+                # Nothing logged this week
+                day_of_week = now.weekday()  # 0=Monday, 6=Sunday
+                if day_of_week >= 4:  # Thursday or later
+                    return {
+                        "goal": goal_id,
+                        "name": name,
+                        "message": f"{name}: nothing logged this week",
+                        "priority": "overdue"
+                    }
                 else:
-                    # Never done - check if goal has started
-                    start_str = goal_config.get("start")
-                    if start_str:
-                        start_date = datetime.strptime(to_date_str(start_str), "%Y-%m-%d")
-                        if now.date() >= start_date.date():
-                            days_since_start = (now - start_date).days
-                            if days_since_start >= 14:
-                                todos.append({
-                                    "goal": goal_id,
-                                    "name": name,
-                                    "message": f"{name}: never done (overdue)",
-                                    "priority": "overdue"
-                                })
-                            elif days_since_start >= 0:
-                                todos.append({
-                                    "goal": goal_id,
-                                    "name": name,
-                                    "message": f"{name}: never done",
-                                    "priority": "due"
-                                })
-                    else:
-                        todos.append({
-                            "goal": goal_id,
-                            "name": name,
-                            "message": f"{name}: never done",
-                            "priority": "due"
-                        })
-
-        elif urgency_type == "target":
-            base_target = urgency.get("target", 0)
-            warn_at = urgency.get("warn_at", 0.5)
-            under_is_good = urgency.get("under_is_good", False)
-            period = urgency.get("period", "weekly")
-
-            # Look up week-specific target from schedule.yml if available
-            schedule = get_schedule()
-            current_week = get_current_week(schedule)
-            week_num = current_week.get("number", 1)
-
-            goal_schedule = schedule.get("goals", {}).get(goal_id, {})
-            weekly_targets = goal_schedule.get("weekly_targets", {})
-            target = weekly_targets.get(week_num, base_target)
-
-            # Calculate period totals
-            if period == "weekly":
-                week_start = now - timedelta(days=now.weekday())
-                period_start_str = week_start.strftime("%Y-%m-%d")
+                    return {
+                        "goal": goal_id,
+                        "name": name,
+                        "message": f"{name}: week started, nothing logged",
+                        "priority": "due"
+                    }
             else:
-                period_start_str = today
-
-            period_logs = [l for l in logs if to_date_str(l.get("date")) >= period_start_str]
-            # Handle both nested format (total field) and flat format (value field)
-            period_total = sum(l.get("total", l.get("value", 0)) for l in period_logs)
-
-            day_of_week = now.weekday()  # 0=Monday, 6=Sunday
-            threshold = target * warn_at
+                # Show progress
+                total = week_value
+                return {
+                    "goal": goal_id,
+                    "name": name,
+                    "message": f"{name}: {total} {unit} this week",
+                    "priority": "info"
+                }
+
+        elif cadence == "biweekly":
+            if last_log_date:
+                last_date = datetime.strptime(to_date_str(last_log_date), "%Y-%m-%d")
+                days_since = (now - last_date).days
 
-            if under_is_good:
-                # For spend-less: being under target is good
-                if period_total > target:
-                    todos.append({
+                if days_since >= 14:
+                    return {
                         "goal": goal_id,
                         "name": name,
-                        "message": f"{name}: {period_total}/{target} {unit} (over budget!)",
+                        "message": f"{name}: {days_since} days since last (overdue)",
                         "priority": "overdue"
-                    })
-                elif period_total > threshold:
-                    todos.append({
+                    }
+                elif days_since >= 12:
+                    return {
                         "goal": goal_id,
                         "name": name,
-                        "message": f"{name}: {period_total}/{target} {unit} (approaching limit)",
+                        "message": f"{name}: {days_since} days since last",
                         "priority": "due"
-                    })
+                    }
                 else:
-                    todos.append({
+                    # Show info
+                    return {
                         "goal": goal_id,
                         "name": name,
-                        "message": f"{name}: {period_total}/{target} {unit}",
+                        "message": f"{name}: {days_since} days since last",
                         "priority": "info"
-                    })
+                    }
             else:
-                # For fitness: hitting target is good
-                if period_total >= target:
-                    todos.append({
-                        "goal": goal_id,
-                        "name": name,
-                        "message": f"{name}: {period_total}/{target} {unit} (target met!)",
-                        "priority": "info"
-                    })
-                elif day_of_week >= 3 and period_total < threshold:
-                    # Thursday or later and under 50% - overdue
-                    todos.append({
+                # Never done - check if goal has started
+                start_str = goal_config.get("start")
+                if start_str:
+                    start_date = datetime.strptime(to_date_str(start_str), "%Y-%m-%d")
+                    if now.date() >= start_date.date():
+                        days_since_start = (now - start_date).days
+                        if days_since_start >= 14:
+                            return {
+                                "goal": goal_id,
+                                "name": name,
+                                "message": f"{name}: never done (overdue)",
+                                "priority": "overdue"
+                            }
+                        elif days_since_start >= 0:
+                            return {
+                                "goal": goal_id,
+                                "name": name,
+                                "message": f"{name}: never done",
+                                "priority": "due"
+                            }
+                else:
+                    return {
                         "goal": goal_id,
                         "name": name,
-                        "message": f"{name}: {period_total}/{target} {unit} (behind pace)",
-                        "priority": "overdue"
-                    })
-                elif period_total < target:
-                    todos.append({
+                        "message": f"{name}: never done",
+                        "priority": "due"
+                    }
+
+    elif urgency_type == "target":
+        base_target = urgency.get("target", 0)
+        warn_at = urgency.get("warn_at", 0.5)
+        under_is_good = urgency.get("under_is_good", False)
+        period = urgency.get("period", "weekly")
+
+        # Look up week-specific target from schedule.yml if available
+        schedule = get_schedule()
+        current_week = get_current_week()
+        week_num = current_week.get("number", 1)
+
+        goal_schedule = schedule.get("goals", {}).get(goal_id, {})
+        weekly_targets = goal_schedule.get("weekly_targets", {})
+        target = weekly_targets.get(week_num, base_target)
+
+        # Calculate period totals
+        if period == "weekly":
+            week_start = now - timedelta(days=now.weekday())
+            period_start_str = week_start.strftime("%Y-%m-%d")
+        else:
+            period_start_str = today
+
+        _, _, period_total = logs.since(period_start_str)
+
+        day_of_week = now.weekday()  # 0=Monday, 6=Sunday
+        threshold = target * warn_at
+
+        if under_is_good:
+            # For spend-less: being under target is good
+            if period_total > target:
+                return {
+                    "goal": goal_id,
+                    "name": name,
+                    "message": f"{name}: {period_total}/{target} {unit} (over budget!)",
+                    "priority": "overdue"
+                }
+            elif period_total > threshold:
+                return {
+                    "goal": goal_id,
+                    "name": name,
+                    "message": f"{name}: {period_total}/{target} {unit} (approaching limit)",
+                    "priority": "due"
+                }
+            else:
+                return {
+                    "goal": goal_id,
+                    "name": name,
+                    "message": f"{name}: {period_total}/{target} {unit}",
+                    "priority": "info"
+                }
+        else:
+            # For fitness: hitting target is good
+            if period_total >= target:
+                return {
+                    "goal": goal_id,
+                    "name": name,
+                    "message": f"{name}: {period_total}/{target} {unit} (target met!)",
+                    "priority": "info"
+                }
+            elif day_of_week >= 3 and period_total < threshold:
+                # Thursday or later and under 50% - overdue
+                return {
+                    "goal": goal_id,
+                    "name": name,
+                    "message": f"{name}: {period_total}/{target} {unit} (behind pace)",
+                    "priority": "overdue"
+                }
+            elif period_total < target:
+                return {
+                    "goal": goal_id,
+                    "name": name,
+                    "message": f"{name}: {period_total}/{target} {unit}",
+                    "priority": "due"
+                }
+
+    elif urgency_type == "stale":
+        stale_days = urgency.get("stale_days", 5)
+        overdue_days = urgency.get("overdue_days", 7)
+
+        if last_log_date:
+            last_date = datetime.strptime(to_date_str(last_log_date), "%Y-%m-%d")
+            days_since = (now - last_date).days
+
+            if days_since >= overdue_days:
+                return {
+                    "goal": goal_id,
+                    "name": name,
+                    "message": f"{name}: {days_since} days since last session",
+                    "priority": "overdue"
+                }
+            elif days_since >= stale_days:
+                return {
+                    "goal": goal_id,
+                    "name": name,
+                    "message": f"{name}: {days_since} days since last session",
+                    "priority": "due"
+                }
+            else:
+                # Show current progress
+                current_info = get_current(goal_config, completed=logs.completed())
+                current = current_info.get("current")
+                done = current_info.get("done", 0)
+                total = current_info.get("total", 0)
+                if current:
+                    return {
                         "goal": goal_id,
                         "name": name,
-                        "message": f"{name}: {period_total}/{target} {unit}",
-                        "priority": "due"
-                    })
-
-        elif urgency_type == "stale":
-            stale_days = urgency.get("stale_days", 5)
-            overdue_days = urgency.get("overdue_days", 7)
-
-            if last_log_date:
-                last_date = datetime.strptime(to_date_str(last_log_date), "%Y-%m-%d")
-                days_since = (now - last_date).days
-
-                if days_since >= overdue_days:
-                    todos.append({
+                        "message": f"{name}: on {current} ({done}/{total})",
+                        "priority": "info"
+                    }
+        else:
+            # Never started - check weekly tasks first, then chapter scheduling
+            current_week = get_current_week()
+            week_num = current_week.get("number", 1)
+            week_unit = f"week-{week_num}"
+
+            # Check if there are weekly tasks
+            week_todo = _unit_todo(goal_id, week_unit)
+            week_tasks = week_todo.get("tasks", [])
+            pending_week_tasks = [t for t in week_tasks if not t.get("done")]
+
+            if pending_week_tasks:
+                # Show pending weekly tasks
+                unscheduled = [t for t in pending_week_tasks if not t.get("scheduled_for") and not t.get("event_id")]
+                if unscheduled:
+                    task_names = ", ".join(t.get("name", t.get("id")) for t in unscheduled[:2])
+                    suffix = f" (+{len(unscheduled) - 2} more)" if len(unscheduled) > 2 else ""
+                    return {
                         "goal": goal_id,
                         "name": name,
-                        "message": f"{name}: {days_since} days since last session",
+                        "message": f"{name}: {task_names}{suffix} not scheduled",
                         "priority": "overdue"
-                    })
-                elif days_since >= stale_days:
-                    todos.append({
+                    }
+                else:
+                    task_names = ", ".join(t.get("name", t.get("id")) for t in pending_week_tasks[:2])
+                    return {
                         "goal": goal_id,
                         "name": name,
-                        "message": f"{name}: {days_since} days since last session",
+                        "message": f"{name}: {task_names} scheduled",
                         "priority": "due"
-                    })
-                else:
-                    # Show current progress
-                    current_info = get_current(goal_config, logs)
-                    current = current_info.get("current")
-                    done = current_info.get("done", 0)
-                    total = current_info.get("total", 0)
-                    if current:
-                        todos.append({
-                            "goal": goal_id,
-                            "name": name,
-                            "message": f"{name}: on {current} ({done}/{total})",
-                            "priority": "info"
-                        })
+                    }
             else:
-                # Never started - check weekly tasks first, then chapter scheduling
-                schedule = get_schedule()
-                current_week = get_current_week(schedule)
-                week_num = current_week.get("number", 1)
-                week_unit = f"week-{week_num}"
-
-                # Check if there are weekly tasks
-                week_todo = get_unit_todo(goal_id, week_unit)
-                week_tasks = week_todo.get("tasks", [])
-                pending_week_tasks = [t for t in week_tasks if not t.get("done")]
-
-                if pending_week_tasks:
-                    # Show pending weekly tasks
-                    unscheduled = [t for t in pending_week_tasks if not t.get("scheduled_for") and not t.get("event_id")]
-                    if unscheduled:
-                        task_names = ", ".join(t.get("name", t.get("id")) for t in unscheduled[:2])
-                        suffix = f" (+{len(unscheduled) - 2} more)" if len(unscheduled) > 2 else ""
-                        todos.append({
+                # No weekly tasks - check chapter scheduling
+                current_info = get_current(goal_config, completed=logs.completed())
+                current = current_info.get("current")
+                if current:
+                    is_scheduled = has_scheduled_tasks(goal_id, current)
+                    if is_scheduled:
+                        return {
                             "goal": goal_id,
                             "name": name,
-                            "message": f"{name}: {task_names}{suffix} not scheduled",
-                            "priority": "overdue"
-                        })
-                    else:
-                        task_names = ", ".join(t.get("name", t.get("id")) for t in pending_week_tasks[:2])
-                        todos.append({
-                            "goal": goal_id,
-                            "name": name,
-                            "message": f"{name}: {task_names} scheduled",
+                            "message": f"{name}: {current} scheduled but not started",
                             "priority": "due"
-                        })
-                else:
-                    # No weekly tasks - check chapter scheduling
-                    current_info = get_current(goal_config, logs)
-                    current = current_info.get("current")
-                    if current:
-                        is_scheduled = has_scheduled_tasks(goal_id, current)
-                        if is_scheduled:
-                            todos.append({
-                                "goal": goal_id,
-                                "name": name,
-                                "message": f"{name}: {current} scheduled but not started",
-                                "priority": "due"
-                            })
-                        else:
-                            todos.append({
-                                "goal": goal_id,
-                                "name": name,
-                                "message": f"{name}: {current} not scheduled",
-                                "priority": "overdue"
-                            })
+                        }
                     else:
-                        todos.append({
+                        return {
                             "goal": goal_id,
                             "name": name,
-                            "message": f"{name}: no content found",
-                            "priority": "info"
-                        })
-
-        elif urgency_type == "none":
-            # Flexible goals - just show progress
-            progression = goal_config.get("progression")
-            if progression:
-                current_info = get_current(goal_config, logs)
-                done = current_info.get("done", 0)
-                total = current_info.get("total", 0)
-                if total > 0:
-                    todos.append({
+                            "message": f"{name}: {current} not scheduled",
+                            "priority": "overdue"
+                        }
+                else:
+                    return {
                         "goal": goal_id,
                         "name": name,
-                        "message": f"{name}: {done}/{total} done",
+                        "message": f"{name}: no content found",
                         "priority": "info"
-                    })
-
-    # Sort by priority: overdue first, then due, then info
-    priority_order = {"overdue": 0, "due": 1, "info": 2}
-    todos.sort(key=lambda x: priority_order.get(x.get("priority", "info"), 99))
-
-    return todos
+                    }
+
+    elif urgency_type == "none":
+        # Flexible goals - just show progress
+        progression = goal_config.get("progression")
+        if progression:
+            current_info = get_current(goal_config, completed=logs.completed())
+            done = current_info.get("done", 0)
+            total = current_info.get("total", 0)
+            if total > 0:
+                return {
+                    "goal": goal_id,
+                    "name": name,
+                    "message": f"{name}: {done}/{total} done",
+                    "priority": "info"
+                }
 
 
 def resolve_goal_id(goals: dict, input_name: str) -> str | None:
     """Resolve alias or name to goal ID."""
     input_lower = input_name.lower()
 
+    aliases = getattr(goals, "aliases", None)
+    if aliases is not None:
+        # Compiled goals (goals_config.GoalsMap)
+        return aliases.get(input_lower)
+
     if input_lower in goals:
         return input_lower
 
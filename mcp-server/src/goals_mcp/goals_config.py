@@ -0,0 +1,89 @@
+"""
+Compiled, read-only view of goals.yml.
+
+get_goals_config() returns a GoalsConfig: the goals.yml mapping, frozen so
+one copy can be shared by every caller, plus what used to be worked out again
+on each call:
+
+- aliases: lowercased alias or name (and goal id) -> goal_id, for resolve_goal_id
+- urgency: each goal's get_urgency_config() spec; daily goals' nag_from and
+  due_by are also parsed into "nag_time"/"due_time" (datetime.time)
+- kinds: each goal's progression ("time-weekly", "sequential", "unordered", or None)
+
+Compiled once per version of goals.yml (storage._cached_derive).
+"""
+
+from .goals import _nag_times, get_urgency_config
+
+
+class FrozenDict(dict):
+    """A dict that raises on modification."""
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("goals config is read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return FrozenDict((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class GoalsMap(FrozenDict):
+    """The goals: section, with its alias map."""
+
+    def __init__(self, goals=()):
+        super().__init__(goals)
+        # Goal ids win over aliases and names; otherwise the first goal listed does
+        aliases = dict.fromkeys(self)
+        for goal_id in aliases:
+            aliases[goal_id] = goal_id
+        for goal_id, goal_config in self.items():
+            if not isinstance(goal_config, dict):
+                continue
+            for alias in goal_config.get("aliases", ()):
+                aliases.setdefault(str(alias).lower(), goal_id)
+            aliases.setdefault(str(goal_config.get("name", "")).lower(), goal_id)
+        self.aliases = aliases
+
+
+class GoalsConfig(FrozenDict):
+    """goals.yml, compiled. Use it like the dict load_yaml would return."""
+
+    def __init__(self, data=()):
+        super().__init__(data)
+        goals = self.get("goals")
+        if not isinstance(goals, GoalsMap):
+            dict.__setitem__(self, "goals", GoalsMap(goals or {}))
+            goals = self["goals"]
+
+        self.urgency = {}
+        self.kinds = {}
+        for goal_id, goal_config in goals.items():
+            if not isinstance(goal_config, dict):
+                continue
+            urgency = get_urgency_config(goal_config)
+            if urgency.get("cadence") == "daily":
+                urgency["nag_time"], urgency["due_time"] = _nag_times(urgency)
+            self.urgency[goal_id] = FrozenDict(urgency)
+            self.kinds[goal_id] = goal_config.get("progression")
+
+    def goals_of_kind(self, kind: str) -> frozenset:
+        """Ids of the goals with this progression."""
+        return frozenset(g for g, k in self.kinds.items() if k == kind)
+
+
+def compile_config(data) -> GoalsConfig:
+    """Build the GoalsConfig for a parsed goals.yml."""
+    if not isinstance(data, dict):
+        data = {}
+    frozen = _freeze(data)
+    return GoalsConfig(frozen)
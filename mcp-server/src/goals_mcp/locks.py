@@ -0,0 +1,163 @@
+"""
+Per-file locks shared by threads and processes.
+
+Each data file gets a sibling lock file (.daily.yml.lock next to daily.yml).
+A lock is an in-process threading.Lock (so threads queue fairly without
+spinning on the OS lock) plus an fcntl.flock on the lock file (so a stdio
+instance and the SSE container can share one checkout). Data files are
+replaced by rename, which is why the lock lives on a separate file.
+
+Wait and hold times are recorded per path; see lock_stats(), exported at
+/metrics as goals_lock_*.
+"""
+
+import fcntl
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Give up (and fail the caller) after this long; guards against deadlocks
+LOCK_TIMEOUT = float(os.environ.get("GOALS_LOCK_TIMEOUT", "30"))
+
+# Log waits/holds longer than this
+LOCK_SLOW_SECONDS = 1.0
+
+_registry_lock = threading.Lock()
+_thread_locks: dict[Path, threading.Lock] = {}
+_stats: dict[Path, dict] = {}
+
+# Paths the current thread holds exclusively
+_owned = threading.local()
+
+
+class LockTimeout(TimeoutError):
+    """Raised when a file lock can't be acquired within LOCK_TIMEOUT."""
+
+
+class _Held:
+    """An acquired lock; pass to release()."""
+
+    __slots__ = ("path", "fd", "shared", "acquired_at")
+
+    def __init__(self, path: Path, fd: int, shared: bool, acquired_at: float):
+        self.path = path
+        self.fd = fd
+        self.shared = shared
+        self.acquired_at = acquired_at
+
+
+def lock_file_for(path: Path) -> Path:
+    return path.parent / f".{path.name}.lock"
+
+
+def _owned_paths() -> set:
+    paths = getattr(_owned, "paths", None)
+    if paths is None:
+        paths = _owned.paths = set()
+    return paths
+
+
+def _thread_lock(path: Path) -> threading.Lock:
+    with _registry_lock:
+        lock = _thread_locks.get(path)
+        if lock is None:
+            lock = _thread_locks[path] = threading.Lock()
+        return lock
+
+
+def _record(path: Path, field: str, seconds: float) -> None:
+    with _registry_lock:
+        s = _stats.setdefault(path, {
+            "acquired": 0, "contended": 0,
+            "wait_total": 0.0, "wait_max": 0.0,
+            "hold_total": 0.0, "hold_max": 0.0,
+        })
+        if field == "wait":
+            s["acquired"] += 1
+            if seconds > 0.001:
+                s["contended"] += 1
+        s[f"{field}_total"] += seconds
+        s[f"{field}_max"] = max(s[f"{field}_max"], seconds)
+    if seconds > LOCK_SLOW_SECONDS:
+        logger.warning(f"Lock on {path.name}: {field} {seconds:.2f}s")
+
+
+def acquire(path: Path, shared: bool = False, timeout: float = None) -> _Held:
+    """
+    Lock path for this thread and process.
+
+    Shared locks only exclude exclusive ones across processes; in-process
+    they skip the thread lock. A shared lock on a path this thread already
+    holds exclusively is a no-op. Raises LockTimeout after `timeout` seconds.
+    """
+    timeout = LOCK_TIMEOUT if timeout is None else timeout
+    start = time.monotonic()
+    deadline = start + timeout
+
+    if shared and path in _owned_paths():
+        return _Held(path, None, True, start)
+
+    thread_lock = None if shared else _thread_lock(path)
+    if thread_lock is not None and not thread_lock.acquire(timeout=timeout):
+        raise LockTimeout(f"Timed out waiting for lock on {path}")
+
+    try:
+        lock_path = lock_file_for(path)
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        op = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+        delay = 0.001
+        while True:
+            try:
+                fcntl.flock(fd, op | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise LockTimeout(f"Timed out waiting for lock on {path}")
+                time.sleep(delay)
+                delay = min(delay * 2, 0.05)
+    except BaseException:
+        if thread_lock is not None:
+            thread_lock.release()
+        raise
+
+    now = time.monotonic()
+    _record(path, "wait", now - start)
+    if not shared:
+        _owned_paths().add(path)
+    return _Held(path, fd, shared, now)
+
+
+def release(held: _Held) -> None:
+    if held.fd is None:
+        return
+    _record(held.path, "hold", time.monotonic() - held.acquired_at)
+    try:
+        fcntl.flock(held.fd, fcntl.LOCK_UN)
+    finally:
+        os.close(held.fd)
+        if not held.shared:
+            _owned_paths().discard(held.path)
+            _thread_lock(held.path).release()
+
+
+@contextmanager
+def locked(path: Path, shared: bool = False, timeout: float = None):
+    """Hold the lock on path for the duration of the block."""
+    held = acquire(path, shared, timeout)
+    try:
+        yield
+    finally:
+        release(held)
+
+
+def lock_stats() -> dict[str, dict]:
+    """Per-path counters: acquisitions, contended acquisitions, wait and hold times (seconds)."""
+    with _registry_lock:
+        return {str(path): dict(s) for path, s in _stats.items()}
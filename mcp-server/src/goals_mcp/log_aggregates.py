@@ -0,0 +1,230 @@
+"""
+Per-goal log aggregates, maintained at write time.
+
+For each goal: the date of the last log record, per-day totals (records, sum
+of value, sum of total-or-value) and the completed content items. compute_todos
+answers its log questions from these instead of rescanning the logs; a week or
+day period is a bisect over the sorted dates and at most seven day lookups.
+
+Aggregates are tied to the versions of the goal's log files (flat YAML, shard
+directory, journals). Journal appends apply their entry as a delta on the
+spot; any other change (compaction, save_goal_logs, hand edits, another
+process) is picked up as a version mismatch and rebuilt from the logs on next
+use. They're persisted per goal in ~/.goals-mcp/log-aggregates/, so a restart
+only rebuilds goals whose logs changed in the meantime.
+"""
+
+import json
+import logging
+import threading
+from bisect import bisect_left, bisect_right, insort
+
+from .storage import (
+    REPO_PATH, STATE_DIR, _atomic_write_text, _completed_items, _outside_transaction,
+    get_goal_log_paths, get_goal_logs, get_version, has_pending_writes, to_date_str,
+)
+
+logger = logging.getLogger(__name__)
+
+AGGREGATES_DIR = STATE_DIR / "log-aggregates"
+AGGREGATES_VERSION = 2
+
+# Debounce for persisting after appends
+SAVE_DELAY_SECONDS = 5.0
+
+_JOURNAL = 2   # position of the journal in get_goal_log_paths()
+
+_lock = threading.Lock()
+_goals: dict[str, dict] = {}
+_loaded: set[str] = set()
+_unsaved: set[str] = set()
+_timer: threading.Timer | None = None
+
+
+def _freeze(value):
+    """JSON lists back into the tuples get_version() returns."""
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _entries_total(record: dict) -> int | float:
+    """A day record's total as _apply_log_entry recomputes it."""
+    return sum(e["value"] for e in record.get("entries") or [] if isinstance(e, dict) and isinstance(e.get("value"), (int, float)))
+
+
+def _add(agg: dict, date: str, count: int, value, total) -> None:
+    day = agg["days"].get(date)
+    if day is None:
+        day = agg["days"][date] = [0, 0, 0]
+        insort(agg["dates"], date)
+    day[0] += count
+    day[1] += value
+    day[2] += total
+
+
+def _build(goal_id: str, versions: tuple) -> dict:
+    """Aggregate a goal's logs from scratch."""
+    with _outside_transaction():
+        logs = get_goal_logs(goal_id)
+    agg = {"versions": versions, "last_date": None, "days": {}, "dates": [],
+           "anchors": {}, "completed": frozenset()}
+    if not isinstance(logs, list):
+        return agg
+    for log in logs:
+        if "date" in log:
+            agg["last_date"] = to_date_str(log["date"])
+        date = to_date_str(log.get("date"))
+        if not date:
+            continue
+        _add(agg, date, 1, log.get("value", 0), log.get("total", log.get("value", 0)))
+        # The record a journal entry for this date would be added to
+        if isinstance(log.get("date"), str) and log["date"] not in agg["anchors"]:
+            agg["anchors"][log["date"]] = [_entries_total(log), log.get("total", log.get("value", 0))]
+    agg["completed"] = _completed_items(logs)
+    return agg
+
+
+def _path(goal_id: str):
+    return AGGREGATES_DIR / f"{goal_id}.json"
+
+
+def _load(goal_id: str) -> dict | None:
+    """The persisted aggregates for a goal, read once per process."""
+    if goal_id in _loaded:
+        return None
+    _loaded.add(goal_id)
+    try:
+        data = json.loads(_path(goal_id).read_text())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable log aggregates for {goal_id}: {e}")
+        return None
+    if data.get("version") != AGGREGATES_VERSION or data.get("repo") != str(REPO_PATH):
+        return None
+    agg = {
+        "versions": _freeze(data["versions"]),
+        "last_date": data["last_date"],
+        "days": data["days"],
+        "dates": sorted(data["days"]),
+        "anchors": data["anchors"],
+        "completed": frozenset(data["completed"]),
+    }
+    _goals[goal_id] = agg
+    return agg
+
+
+def current(goal_id: str) -> dict | None:
+    """
+    Aggregates matching the goal's logs on disk, rebuilt if they changed.
+    None if the current transaction has unwritten changes to them.
+    """
+    paths = get_goal_log_paths(goal_id)
+    if has_pending_writes(paths):
+        return None
+    versions = tuple(get_version(p) for p in paths)
+    with _lock:
+        agg = _goals.get(goal_id) or _load(goal_id)
+        if agg is not None and agg["versions"] == versions:
+            return agg
+
+    agg = _build(goal_id, versions)
+    with _lock:
+        _goals[goal_id] = agg
+        _unsaved.add(goal_id)
+    _save_soon()
+    return agg
+
+
+def record_append(goal_id: str, records: list[dict], before: tuple | None, after: tuple) -> None:
+    """
+    Apply one journal write of records ({"date", "entry"}, see
+    storage.append_goal_log). before and after are the journal's stat keys
+    around the write; if the aggregates weren't current as of before, they're
+    dropped and rebuilt on next use.
+    """
+    with _lock:
+        agg = _goals.get(goal_id)
+        if agg is None:
+            return
+        known = agg["versions"][_JOURNAL]
+        if known != before and not (known is None and before is not None and before[1] == 0):
+            del _goals[goal_id]
+            return
+
+        for record in records:
+            date, entry = record["date"], record["entry"]
+            value = entry.get("value", 0) if isinstance(entry.get("value"), (int, float)) else 0
+            anchor = agg["anchors"].get(date)
+            if anchor is None:
+                # A new day record at the end of the log
+                agg["anchors"][date] = [value, value]
+                agg["last_date"] = date
+                _add(agg, date, 1, 0, value)
+            else:
+                total = anchor[0] + value
+                _add(agg, date, 0, 0, total - anchor[1])
+                agg["anchors"][date] = [total, total]
+
+        versions = list(agg["versions"])
+        versions[_JOURNAL] = after
+        agg["versions"] = tuple(versions)
+        _unsaved.add(goal_id)
+    _save_soon()
+
+
+def stats(agg: dict, start: str, end: str = None) -> tuple:
+    """(records, sum of value, sum of total-or-value) dated start..end inclusive."""
+    with _lock:
+        dates = agg["dates"]
+        lo = bisect_left(dates, start)
+        hi = bisect_right(dates, end) if end is not None else len(dates)
+        count = value = total = 0
+        for date in dates[lo:hi]:
+            c, v, t = agg["days"][date]
+            count += c
+            value += v
+            total += t
+        return count, value, total
+
+
+def save() -> int:
+    """Persist aggregates changed since the last save. Returns goals written."""
+    global _timer
+    with _lock:
+        _timer = None
+        payloads = {}
+        for goal_id in _unsaved:
+            agg = _goals.get(goal_id)
+            if agg is None:
+                continue
+            try:
+                payloads[goal_id] = json.dumps({
+                    "version": AGGREGATES_VERSION,
+                    "repo": str(REPO_PATH),
+                    "versions": agg["versions"],
+                    "last_date": agg["last_date"],
+                    "days": agg["days"],
+                    "anchors": agg["anchors"],
+                    "completed": sorted(agg["completed"]),
+                })
+            except TypeError as e:
+                logger.warning(f"Could not persist log aggregates for {goal_id}: {e}")
+        _unsaved.clear()
+    for goal_id, payload in payloads.items():
+        try:
+            _atomic_write_text(_path(goal_id), payload)
+        except OSError as e:
+            logger.warning(f"Could not persist log aggregates for {goal_id}: {e}")
+    return len(payloads)
+
+
+def _save_soon() -> None:
+    global _timer
+    with _lock:
+        if _timer is not None:
+            return
+        _timer = threading.Timer(SAVE_DELAY_SECONDS, save)
+        _timer.daemon = True
+        _timer.start()
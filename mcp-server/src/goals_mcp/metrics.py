@@ -0,0 +1,203 @@
+"""
+Latency and error metrics, exported as Prometheus text at /metrics.
+
+- goals_tool_*: per tool call, timed in tools.handle_tool (queue wait included)
+- goals_dependency_*: per outbound call to Google Calendar, Google Tasks,
+  wger, AnkiConnect, Pushover, gh and git, timed with timed()/dependency()
+- goals_dispatch_*: dispatch.queue_stats(), per integration
+- goals_lock_*: locks.lock_stats(), per data file (path relative to the repo)
+
+A dependency call counts as an error if it raises or returns a failed result
+(a dict or result object with success False); most integration helpers catch
+their own exceptions and report failure that way.
+"""
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Histogram bucket bounds (seconds)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_lock = threading.Lock()
+
+# name -> (help, type); metrics render in this order
+_FAMILIES = {
+    "goals_tool_duration_seconds": ("Tool call latency, including queue wait.", "histogram"),
+    "goals_tool_errors_total": ("Tool calls that raised.", "counter"),
+    "goals_tool_in_flight": ("Tool calls running or queued now.", "gauge"),
+    "goals_dependency_duration_seconds": ("Outbound call latency.", "histogram"),
+    "goals_dependency_errors_total": ("Outbound calls that raised or failed.", "counter"),
+}
+
+# name -> labels (tuple of (key, value) pairs) -> value; histograms hold
+# [bucket counts..., sum, count]
+_values: dict[str, dict[tuple, object]] = {name: {} for name in _FAMILIES}
+
+
+def _observe(name: str, labels: tuple, seconds: float) -> None:
+    with _lock:
+        h = _values[name].get(labels)
+        if h is None:
+            h = _values[name][labels] = [0] * len(BUCKETS) + [0.0, 0]
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                h[i] += 1
+        h[-2] += seconds
+        h[-1] += 1
+
+
+def _add(name: str, labels: tuple, delta: float = 1) -> None:
+    with _lock:
+        series = _values[name]
+        series[labels] = series.get(labels, 0) + delta
+
+
+@contextmanager
+def track_tool(tool: str):
+    """Time a tool call and count it in flight; exceptions count as errors."""
+    labels = (("tool", tool),)
+    _add("goals_tool_in_flight", labels)
+    start = time.monotonic()
+    try:
+        yield
+    except BaseException:
+        _add("goals_tool_errors_total", labels)
+        raise
+    finally:
+        _observe("goals_tool_duration_seconds", labels, time.monotonic() - start)
+        _add("goals_tool_in_flight", labels, -1)
+
+
+def _failed(result) -> bool:
+    if isinstance(result, dict):
+        return result.get("success") is False
+    return getattr(result, "success", None) is False
+
+
+class _Call:
+    """What dependency() yields; set failed for a call that didn't raise but didn't work."""
+
+    failed = False
+
+
+@contextmanager
+def dependency(name: str, operation: str):
+    """Time an outbound call to name (e.g. "wger") doing operation."""
+    labels = (("dependency", name), ("operation", operation))
+    call = _Call()
+    start = time.monotonic()
+    try:
+        yield call
+    except BaseException:
+        call.failed = True
+        raise
+    finally:
+        _observe("goals_dependency_duration_seconds", labels, time.monotonic() - start)
+        if call.failed:
+            _add("goals_dependency_errors_total", labels)
+
+
+def timed(name: str, operation: str = None):
+    """Decorator: time each call as dependency(name, operation or the function's name)."""
+
+    def decorate(fn):
+        op = operation or fn.__name__.lstrip("_")
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with dependency(name, op) as call:
+                result = fn(*args, **kwargs)
+                call.failed = _failed(result)
+                return result
+
+        return wrapper
+
+    return decorate
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _number(value) -> str:
+    if isinstance(value, float):
+        return repr(value) if value != int(value) else str(int(value))
+    return str(value)
+
+
+def _dispatch_families() -> list[tuple[str, str, str, dict]]:
+    from . import dispatch
+
+    stats = dispatch.queue_stats()
+    families = [
+        ("goals_dispatch_limit", "Calls allowed in flight per integration.", "gauge", "limit"),
+        ("goals_dispatch_queued", "Tool calls waiting for a slot now.", "gauge", "queued"),
+        ("goals_dispatch_in_flight", "Tool calls running in the pool now.", "gauge", "in_flight"),
+        ("goals_dispatch_calls_total", "Tool calls started in the pool.", "counter", "calls"),
+        ("goals_dispatch_wait_seconds_total", "Time tool calls spent queued.", "counter", "wait_total"),
+        ("goals_dispatch_run_seconds_total", "Time tool calls spent running.", "counter", "run_total"),
+    ]
+    return [
+        (name, help_text, kind, {(("integration", i),): s[key] for i, s in stats.items()})
+        for name, help_text, kind, key in families
+    ]
+
+
+def _lock_families() -> list[tuple[str, str, str, dict]]:
+    from . import locks
+    from .storage import REPO_PATH
+
+    stats = {}
+    for path, s in locks.lock_stats().items():
+        try:
+            path = str(Path(path).relative_to(REPO_PATH))
+        except ValueError:
+            pass
+        stats[path] = s
+    families = [
+        ("goals_lock_acquired_total", "File lock acquisitions.", "counter", "acquired"),
+        ("goals_lock_contended_total", "File lock acquisitions that had to wait.", "counter", "contended"),
+        ("goals_lock_wait_seconds_total", "Time spent waiting for file locks.", "counter", "wait_total"),
+        ("goals_lock_wait_seconds_max", "Longest wait for a file lock.", "gauge", "wait_max"),
+        ("goals_lock_hold_seconds_total", "Time file locks were held.", "counter", "hold_total"),
+        ("goals_lock_hold_seconds_max", "Longest hold of a file lock.", "gauge", "hold_max"),
+    ]
+    return [
+        (name, help_text, kind, {(("path", p),): s[key] for p, s in stats.items()})
+        for name, help_text, kind, key in families
+    ]
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    with _lock:
+        snapshot = {name: {k: list(v) if isinstance(v, list) else v for k, v in series.items()}
+                    for name, series in _values.items()}
+
+    families = [(name, help_text, kind, snapshot[name]) for name, (help_text, kind) in _FAMILIES.items()]
+    families += _dispatch_families()
+    families += _lock_families()
+
+    lines = []
+    for name, help_text, kind, series in families:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in sorted(series.items()):
+            if kind != "histogram":
+                lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                continue
+            for bound, count in zip(BUCKETS, value):
+                lines.append(f"{name}_bucket{_labels(labels + (('le', _number(bound)),))} {count}")
+            lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {value[-1]}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(value[-2])}")
+            lines.append(f"{name}_count{_labels(labels)} {value[-1]}")
+    return "\n".join(lines) + "\n"
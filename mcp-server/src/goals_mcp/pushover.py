@@ -10,6 +10,8 @@ import os
 import urllib.request
 from dataclasses import dataclass
 
+from . import metrics
+
 logger = logging.getLogger(__name__)
 
 PUSHOVER_API_URL = "https://api.pushover.net/1/messages.json"
@@ -36,6 +38,7 @@ def get_credentials() -> tuple[str, str]:
     return user_key, api_token
 
 
+@metrics.timed("pushover")
 def push_notification(
     title: str,
     message: str,
@@ -0,0 +1,179 @@
+"""
+Compiled view of schedule.yml and the week adjustments in current.yml.
+
+Maps a date to its week by bisecting the sorted week start dates, looks weeks
+up by number through a dict, and resolves each goal's effective week
+(offset_weeks, override_week, paused_until) once per day. Rebuilt only when
+schedule.yml or current.yml changes.
+
+A schedule whose weeks aren't in order and disjoint is matched with the
+first-match linear scan storage.get_current_week has always used.
+"""
+
+import threading
+from bisect import bisect_right
+
+from .storage import (
+    REPO_PATH, _outside_transaction, get_current_progress, get_schedule, get_today,
+    get_version, has_pending_writes,
+)
+
+_lock = threading.Lock()
+_state: "_Compiled | None" = None
+
+
+def _schedule_path():
+    return REPO_PATH / "_data" / "schedule.yml"
+
+
+def _current_path():
+    return REPO_PATH / "_data" / "current.yml"
+
+
+class _Compiled:
+    """One compiled (schedule.yml, current.yml) pair."""
+
+    def __init__(self, key: tuple, schedule: dict, current: dict):
+        self.key = key
+        self.weeks = schedule.get("weeks", []) or []
+        self.current = current if isinstance(current, dict) else {}
+        self.by_number = {}
+        for week in self.weeks:
+            self.by_number.setdefault(week["number"], week)
+        self.starts = [w["start"] for w in self.weeks]
+        ends = [w["end"] for w in self.weeks]
+        self.ordered = (
+            all(isinstance(d, str) for d in self.starts + ends)
+            and all(s <= e for s, e in zip(self.starts, ends))
+            and all(e < s for e, s in zip(ends, self.starts[1:]))
+        )
+        self.effective: dict[tuple[str, str], dict] = {}   # (goal_id, today) -> effective week
+
+    def week_for(self, date: str) -> dict | None:
+        """The schedule week containing date, or None."""
+        if not self.ordered:
+            for week in self.weeks:
+                if week["start"] <= date <= week["end"]:
+                    return week
+            return None
+        i = bisect_right(self.starts, date) - 1
+        if i >= 0 and date <= self.weeks[i]["end"]:
+            return self.weeks[i]
+        return None
+
+    def current_week(self, today: str) -> dict:
+        week = self.week_for(today)
+        if week is not None:
+            return {"number": week["number"], "start": week["start"], "end": week["end"]}
+
+        # Fallback: return week 1 or last week based on date
+        if self.weeks:
+            if today < self.weeks[0]["start"]:
+                return dict(self.weeks[0])
+            if today > self.weeks[-1]["end"]:
+                return dict(self.weeks[-1])
+
+        return {"number": 1, "start": "?", "end": "?"}
+
+    def effective_week(self, goal_id: str, today: str) -> dict:
+        cached = self.effective.get((goal_id, today))
+        if cached is None:
+            cached = self.effective[(goal_id, today)] = self._resolve(goal_id, today)
+        return dict(cached)
+
+    def _resolve(self, goal_id: str, today: str) -> dict:
+        """Same rules as storage.get_effective_week."""
+        base_week = self.current_week(today)
+        goal_current = self.current.get(goal_id, {})
+
+        paused_until = goal_current.get("paused_until")
+        if paused_until and today < paused_until:
+            return {
+                "number": base_week["number"],
+                "start": base_week["start"],
+                "end": base_week["end"],
+                "adjusted": True,
+                "paused": True,
+                "paused_until": paused_until,
+                "reason": goal_current.get("adjustment_reason", "Paused")
+            }
+
+        override = goal_current.get("override_week")
+        if override:
+            week = self.by_number.get(override)
+            return {
+                "number": override,
+                "start": week["start"] if week else "?",
+                "end": week["end"] if week else "?",
+                "adjusted": True,
+                "paused": False,
+                "reason": goal_current.get("adjustment_reason", f"Overridden to week {override}")
+                if week else goal_current.get("adjustment_reason")
+            }
+
+        offset = goal_current.get("offset_weeks", 0)
+        if offset:
+            effective_num = max(1, base_week["number"] - offset)
+            week = self.by_number.get(effective_num)
+            if week:
+                return {
+                    "number": effective_num,
+                    "start": week["start"],
+                    "end": week["end"],
+                    "adjusted": True,
+                    "paused": False,
+                    "reason": goal_current.get("adjustment_reason", f"Offset by {offset} weeks")
+                }
+
+        return {
+            "number": base_week["number"],
+            "start": base_week["start"],
+            "end": base_week["end"],
+            "adjusted": False,
+            "paused": False,
+            "reason": None
+        }
+
+
+def _compiled() -> _Compiled:
+    """The compiled schedule for the files on disk."""
+    global _state
+    key = (get_version(_schedule_path()), get_version(_current_path()))
+    state = _state
+    if state is not None and state.key == key:
+        return state
+    with _lock:
+        if _state is not None and _state.key == key:
+            return _state
+        with _outside_transaction():
+            schedule = get_schedule()
+            current = get_current_progress()
+        _state = _Compiled(key, schedule if isinstance(schedule, dict) else {}, current)
+        return _state
+
+
+def week_for(date: str) -> dict | None:
+    """The schedule week (number, start, end) containing a YYYY-MM-DD date, or None."""
+    week = _compiled().week_for(date)
+    return {"number": week["number"], "start": week["start"], "end": week["end"]} if week else None
+
+
+def week(number: int) -> dict | None:
+    """The schedule week with this number, or None."""
+    week = _compiled().by_number.get(number)
+    return dict(week) if week else None
+
+
+def current_week() -> dict:
+    """See storage.get_current_week."""
+    return _compiled().current_week(get_today())
+
+
+def effective_week(goal_id: str) -> dict | None:
+    """
+    See storage.get_effective_week. None if the current transaction has an
+    unwritten change to current.yml (the caller should resolve it from that).
+    """
+    if has_pending_writes([_current_path()]):
+        return None
+    return _compiled().effective_week(goal_id, get_today())
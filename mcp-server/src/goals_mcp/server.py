@@ -5,16 +5,18 @@ import sys
 import asyncio
 import logging
 from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, Prompt, PromptMessage, TextContent
 
-from .storage import get_goals_config, get_today
-from .goals import compute_todos
+from .storage import REPO_PATH, get_goals_config, get_today, compact_goal_logs
+from .goals import compute_todos, next_todo_change
 from .tools import get_tool_definitions, handle_tool
 from .git import commit_and_push
-from . import wger_service
+from . import dispatch, log_aggregates, metrics, snapshot, sqlite_mirror, storage, watcher, wger_service
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -25,8 +27,47 @@ logger = logging.getLogger(__name__)
 app = Server("goals-2026")
 
 
+# get_urgent_summary() result and when it expires: at the next time-bucket
+# flip (next_todo_change), or sooner if nothing reports external edits. Dropped
+# on every storage write, and on watcher events (hand edits, git pulls, the
+# other server process) while the watcher runs.
+_summary_cache: tuple[datetime, str] | None = None
+_summary_generation = 0
+
+# Without the watcher, hand edits to _data/ show up in the summary within this long
+SUMMARY_UNWATCHED_SECONDS = 30
+
+
+def _forget_summary(path: Path) -> None:
+    global _summary_cache, _summary_generation
+    if REPO_PATH in path.parents:
+        _summary_generation += 1
+        _summary_cache = None
+
+
+storage.add_write_hook(_forget_summary)
+watcher.subscribe(_forget_summary)
+
+
 def get_urgent_summary() -> str:
     """Get a summary of urgent goals for injection."""
+    global _summary_cache
+    now = datetime.now()
+    cached = _summary_cache
+    if cached is not None and now < cached[0]:
+        return cached[1]
+
+    generation = _summary_generation
+    summary = _urgent_summary()
+    if generation == _summary_generation:
+        expires = next_todo_change(get_goals_config(), now)
+        if not watcher.is_active():
+            expires = min(expires, now + timedelta(seconds=SUMMARY_UNWATCHED_SECONDS))
+        _summary_cache = (expires, summary)
+    return summary
+
+
+def _urgent_summary() -> str:
     config = get_goals_config()
     todos = compute_todos(config)
 
@@ -105,17 +146,52 @@ async def list_tools() -> list[Tool]:
 @app.call_tool()
 async def call_tool(name: str, arguments: dict):
     """Handle tool calls."""
-    return await handle_tool(name, arguments)
+    try:
+        return await handle_tool(name, arguments)
+    finally:
+        # Persist anything newly parsed for the next cold start
+        snapshot.save_soon()
 
 
 async def run_stdio():
     """Run the MCP server via stdio."""
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(read_stream, write_stream, app.create_initialization_options())
+    snapshot.load()
+    await asyncio.to_thread(snapshot.warm)
+    await asyncio.to_thread(sqlite_mirror.start)
+    # Journals are git-ignored: fold them in while running, not just on a clean exit
+    compact_task = asyncio.create_task(background_compact_task())
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(read_stream, write_stream, app.create_initialization_options())
+    finally:
+        compact_task.cancel()
+        dispatch.shutdown()
+        await asyncio.to_thread(compact_goal_logs)
+        snapshot.save()
+        log_aggregates.save()
 
 
 # Background sync task
 SYNC_INTERVAL_SECONDS = 60 * 60  # 1 hour
+COMPACT_INTERVAL_SECONDS = 5 * 60  # 5 minutes
+
+
+async def background_compact_task():
+    """Background task that folds log journals into the YAML logs."""
+    while True:
+        await asyncio.sleep(COMPACT_INTERVAL_SECONDS)
+        try:
+            folded = await asyncio.to_thread(compact_goal_logs)
+            if folded:
+                logger.info(f"Compacted {folded} journal entries into logs")
+        except Exception as e:
+            logger.error(f"Log compaction error: {e}")
+
+
+def _compact_and_commit() -> dict:
+    # Commit canonical YAML, not journals
+    compact_goal_logs()
+    return commit_and_push()
 
 
 async def background_sync_task():
@@ -123,7 +199,7 @@ async def background_sync_task():
     while True:
         await asyncio.sleep(SYNC_INTERVAL_SECONDS)
         try:
-            result = commit_and_push()
+            result = await asyncio.to_thread(_compact_and_commit)
             if "Nothing to commit" not in result["message"]:
                 logger.info(f"Background sync: {result['message']}")
         except Exception as e:
@@ -165,7 +241,7 @@ def create_sse_app():
     """Create SSE web application."""
     from starlette.applications import Starlette
     from starlette.routing import Route, Mount
-    from starlette.responses import HTMLResponse
+    from starlette.responses import HTMLResponse, PlainTextResponse
     from mcp.server.sse import SseServerTransport
 
     sse = SseServerTransport("/messages/")
@@ -176,18 +252,32 @@ def create_sse_app():
         # Check wger connection on startup
         check_wger_connection()
 
+        # Reuse the last run's parses, then bring the SQLite mirror (if enabled) up to date
+        snapshot.load()
+        await asyncio.to_thread(snapshot.warm)
+        await asyncio.to_thread(sqlite_mirror.start)
+        # Publish changes to _data/ and content dirs so caches skip per-call stats
+        await asyncio.to_thread(watcher.start)
+
         # Load Anki mastery in background (non-blocking)
         anki_task = asyncio.create_task(load_anki_mastery())
 
         sync_task = asyncio.create_task(background_sync_task())
         logger.info("Started hourly background sync task")
+        compact_task = asyncio.create_task(background_compact_task())
         yield
         anki_task.cancel()
         sync_task.cancel()
+        compact_task.cancel()
         try:
             await sync_task
         except asyncio.CancelledError:
             logger.info("Background sync task stopped")
+        watcher.stop()
+        dispatch.shutdown()
+        await asyncio.to_thread(compact_goal_logs)
+        snapshot.save()
+        log_aggregates.save()
 
     async def handle_sse(request):
         async with sse.connect_sse(
@@ -237,10 +327,14 @@ def create_sse_app():
         """
         return HTMLResponse(html)
 
+    async def metrics_page(request):
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
     return Starlette(
         routes=[
             Route("/", homepage),
             Route("/sse", handle_sse),
+            Route("/metrics", metrics_page),
             Mount("/messages", app=handle_messages),
         ],
         lifespan=lifespan
@@ -0,0 +1,171 @@
+"""
+Parsed-document snapshot for fast cold starts.
+
+Saves storage's parse cache (goals.yml, schedule.yml, current.yml, logs,
+todos... as pickled documents) to ~/.goals-mcp/parse-snapshot.pickle, so a
+fresh stdio launch or container reuses the previous run's parses instead of
+re-running YAML and ruamel loads.
+
+Each file is validated when it's first read: unchanged mtime and size, or
+failing that an unchanged content hash (git checkouts touch files without
+changing them), means its snapshot entry is used; anything else is parsed
+as usual. The snapshot is discarded wholesale if it was written for another
+checkout or by different Python/YAML library versions, since pickled ruamel
+objects depend on their class layout.
+"""
+
+import hashlib
+import logging
+import pickle
+import sys
+import threading
+from pathlib import Path
+
+import ruamel.yaml
+import yaml
+
+from . import storage
+from .storage import REPO_PATH, STATE_DIR, _atomic_write_bytes, _doc_cache_lock, _stat_key
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PATH = STATE_DIR / "parse-snapshot.pickle"
+SNAPSHOT_VERSION = 1
+
+# Debounce for save_soon()
+SAVE_DELAY_SECONDS = 5.0
+
+_lock = threading.Lock()
+_timer: threading.Timer | None = None
+_saved: tuple = ({}, frozenset())                 # (path -> stat key, carried paths) as of the last save
+_digests: dict[Path, tuple[tuple, str]] = {}      # path -> ((mtime_ns, size), sha256)
+
+
+def _fingerprint() -> tuple:
+    return (SNAPSHOT_VERSION, str(REPO_PATH), sys.version_info[:2], ruamel.yaml.__version__, yaml.__version__)
+
+
+def load() -> int:
+    """Seed the parse cache from the last snapshot. Returns the number of files offered."""
+    global _saved
+    try:
+        raw = SNAPSHOT_PATH.read_bytes()
+    except FileNotFoundError:
+        return 0
+    try:
+        snapshot = pickle.loads(raw)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable parse snapshot: {e}")
+        return 0
+    if not isinstance(snapshot, dict) or snapshot.get("fingerprint") != _fingerprint():
+        return 0
+
+    docs = {REPO_PATH / rel: entry for rel, entry in snapshot["files"].items()}
+    with _doc_cache_lock:
+        for path, entry in docs.items():
+            if path not in storage._doc_cache:
+                storage._snapshot_docs[path] = entry
+    with _lock:
+        for path, (mtime_ns, size, digest, _, _) in docs.items():
+            _digests[path] = ((mtime_ns, size), digest)
+        _saved = ({}, frozenset(docs))
+    return len(docs)
+
+
+def _digest(path: Path, key: tuple) -> str | None:
+    """Content hash of path as of stat key, or None if it has changed since."""
+    cached = _digests.get(path)
+    if cached and cached[0] == key[:2]:
+        return cached[1]
+    try:
+        content = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    if _stat_key(path) != key:
+        return None
+    digest = hashlib.sha256(content).hexdigest()
+    _digests[path] = (key[:2], digest)
+    return digest
+
+
+def save() -> int:
+    """Write the current parse cache to disk (skipped if nothing was parsed since). Returns files saved."""
+    global _saved
+    with _doc_cache_lock:
+        cache = dict(storage._doc_cache)
+        carried = dict(storage._snapshot_docs)
+
+    with _lock:
+        state = ({path: entry[0] for path, entry in cache.items()}, frozenset(carried))
+        if state == _saved:
+            return 0
+
+        files = {}
+        # Entries from the last snapshot this run never read: still validated on use
+        for path, entry in carried.items():
+            files[str(path.relative_to(REPO_PATH))] = entry
+        for path, (key, blob, parser) in cache.items():
+            try:
+                rel = str(path.relative_to(REPO_PATH))
+            except ValueError:
+                continue
+            digest = _digest(path, key)
+            if digest is not None:
+                files[rel] = (key[0], key[1], digest, parser, blob)
+
+        snapshot = {"fingerprint": _fingerprint(), "files": files}
+        try:
+            _atomic_write_bytes(SNAPSHOT_PATH, pickle.dumps(snapshot, pickle.HIGHEST_PROTOCOL))
+        except OSError as e:
+            logger.warning(f"Could not write parse snapshot: {e}")
+            return 0
+        _saved = state
+        return len(files)
+
+
+def warm() -> int:
+    """
+    Read every data file through its usual reader, then save.
+
+    With a valid snapshot this is mostly unpickling; otherwise it does the
+    parsing up front so the first request doesn't. Returns files saved.
+    """
+    data = REPO_PATH / "_data"
+    with storage._outside_transaction():
+        storage.get_goals_config()
+        storage.get_schedule()
+        storage.get_current_progress()
+        storage.get_daily_entries()
+        storage.get_memory_entries()
+        logs = data / "logs"
+        if logs.is_dir():
+            goal_ids = {p.stem for p in logs.glob("*.yml")}
+            goal_ids.update(p.name for p in logs.iterdir() if p.is_dir() and not p.name.startswith("."))
+            for goal_id in sorted(goal_ids):
+                storage.get_goal_logs(goal_id)
+        todos = data / "todos"
+        if todos.is_dir():
+            for path in sorted(todos.glob("*/*.yml")):
+                storage.get_unit_todo(path.parent.name, path.stem)
+    return save()
+
+
+def _save_in_background() -> None:
+    global _timer
+    with _lock:
+        _timer = None
+    try:
+        save()
+    except Exception as e:
+        logger.warning(f"Parse snapshot save failed: {e}")
+
+
+def save_soon() -> None:
+    """Save the snapshot in a few seconds (repeated calls in the meantime are folded)."""
+    global _timer
+    with _lock:
+        if _timer is not None:
+            return
+        _timer = threading.Timer(SAVE_DELAY_SECONDS, _save_in_background)
+        _timer.daemon = True
+        _timer.start()
@@ -0,0 +1,486 @@
+"""
+Optional SQLite mirror of _data for indexed queries.
+
+Set GOALS_SQLITE_MIRROR=1 to keep a WAL-mode database in ~/.goals-mcp/ with
+logs, todos, daily.yml and memory.yml as tables. The YAML files stay the
+source of truth (Jekyll and git read them); the mirror is derived data and
+can be deleted at any time.
+
+The mirror is organised by source: one per goal log (flat YAML or month
+shards, plus journals),
+one per todo unit, and one each for daily.yml and memory.yml.
+Each source records the stat keys and a content hash of its files, and is
+reloaded only when its files changed:
+
+- storage calls the write hook after every write, so the writer's own source
+  is resynced immediately.
+- ready() stats the sources a query needs and resyncs any that changed, so
+  hand edits, git pulls and other processes are picked up.
+- When a file's stat changed but its hash didn't (git checkout, touch), only
+  the stat is updated.
+
+Queries inside a transaction that has pending writes to the files they read
+fall back to the YAML path (ready() returns False). Otherwise the transaction
+records the versions the mirror holds, as it does for YAML reads, so a
+commit still catches a file changed after the query.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+from pathlib import Path
+
+from .storage import (
+    REPO_PATH, STATE_DIR, _active_txn, _apply_log_entry, _note_read, _parse_journal, _parse_yaml,
+    _stat_key, add_write_hook, to_date_str,
+)
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.environ.get("GOALS_SQLITE_MIRROR", "").lower() in ("1", "true", "yes", "on")
+
+DB_PATH = STATE_DIR / "mirror.sqlite3"
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS sources (name TEXT PRIMARY KEY, stat TEXT NOT NULL, hash TEXT NOT NULL);
+
+-- One row per top-level log record. value/total hold numbers exactly as in
+-- the YAML (untyped columns keep ints as ints); item is the top-level path
+-- of a done record.
+CREATE TABLE IF NOT EXISTS logs (
+    goal TEXT NOT NULL, pos INTEGER NOT NULL, has_date INTEGER NOT NULL, date TEXT NOT NULL,
+    value, total, item TEXT,
+    PRIMARY KEY (goal, pos)
+);
+CREATE INDEX IF NOT EXISTS logs_goal_date ON logs (goal, date);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    goal TEXT NOT NULL, unit TEXT NOT NULL, pos INTEGER NOT NULL, id TEXT,
+    done INTEGER NOT NULL, scheduled INTEGER NOT NULL, event_id TEXT, data TEXT NOT NULL,
+    PRIMARY KEY (goal, unit, pos)
+);
+CREATE INDEX IF NOT EXISTS tasks_pending ON tasks (done, goal);
+CREATE INDEX IF NOT EXISTS tasks_event ON tasks (event_id);
+
+CREATE TABLE IF NOT EXISTS daily (pos INTEGER PRIMARY KEY, date TEXT NOT NULL, data BLOB NOT NULL);
+CREATE INDEX IF NOT EXISTS daily_date ON daily (date);
+
+CREATE TABLE IF NOT EXISTS memory (pos INTEGER PRIMARY KEY, date TEXT NOT NULL, data BLOB NOT NULL);
+"""
+
+_lock = threading.Lock()
+_conn: sqlite3.Connection | None = None
+_failed = False
+
+# (goal, unit) -> position in the last todos directory walk
+_unit_order: dict[tuple[str, str], int] = {}
+
+
+def _data_dir() -> Path:
+    return REPO_PATH / "_data"
+
+
+# --- Sources ---
+
+_LOG_SUFFIXES = (".journal.compacting", ".journal", ".yml")
+
+
+def _source_paths(name: str) -> list[Path]:
+    """Files a source is built from, in the order they are merged."""
+    data = _data_dir()
+    kind, _, rest = name.partition("/")
+    if kind == "logs":
+        logs = data / "logs"
+        shards = sorted((logs / rest).glob("*.yml")) if (logs / rest).is_dir() else []
+        return [logs / f"{rest}.yml", *shards, logs / f"{rest}.journal.compacting", logs / f"{rest}.journal"]
+    if kind == "todos":
+        return [data / "todos" / f"{rest}.yml"]
+    return [data / f"{name}.yml"]
+
+
+def _source_of(path: Path) -> str | None:
+    """Source a data file belongs to, or None if it isn't mirrored."""
+    try:
+        parts = path.relative_to(_data_dir()).parts
+    except ValueError:
+        return None
+    if len(parts) == 1 and parts[0] in ("daily.yml", "memory.yml"):
+        return parts[0][:-4]
+    if len(parts) == 2 and parts[0] == "logs":
+        if path.is_dir() and not parts[1].startswith("."):
+            return f"logs/{parts[1]}"
+        for suffix in _LOG_SUFFIXES:
+            if parts[1].endswith(suffix):
+                return f"logs/{parts[1][:-len(suffix)]}"
+    if len(parts) == 3 and parts[0] == "logs" and not parts[1].startswith(".") and parts[2].endswith(".yml"):
+        return f"logs/{parts[1]}"
+    if len(parts) == 3 and parts[0] == "todos" and parts[2].endswith(".yml"):
+        return f"todos/{parts[1]}/{parts[2][:-4]}"
+    return None
+
+
+def _log_sources() -> list[str]:
+    logs = _data_dir() / "logs"
+    if not logs.is_dir():
+        return []
+    return sorted({name for name in map(_source_of, logs.iterdir()) if name})
+
+
+def _todo_sources() -> list[str]:
+    """Todo sources in directory order (the order task queries return them in)."""
+    todos = _data_dir() / "todos"
+    if not todos.is_dir():
+        return []
+    return [
+        f"todos/{goal_dir.name}/{f.stem}"
+        for goal_dir in todos.iterdir() if goal_dir.is_dir()
+        for f in goal_dir.glob("*.yml")
+    ]
+
+
+def _all_sources() -> list[str]:
+    return _log_sources() + _todo_sources() + ["daily", "memory"]
+
+
+# --- Loading ---
+
+def _number(value):
+    return value if isinstance(value, (int, float)) else None
+
+
+def _load_logs(conn: sqlite3.Connection, name: str, paths: list[Path], texts: list[str | None]) -> None:
+    goal = name.split("/", 1)[1]
+    logs = []
+    # Flat log and/or month shards (in month order), then the journals
+    for path, text in zip(paths[:-2], texts[:-2]):
+        data = _parse_yaml(path, text) if text is not None else []
+        if isinstance(data, list):
+            logs.extend(data)
+    for path, text in zip(paths[-2:], texts[-2:]):
+        if text is not None:
+            for record in _parse_journal(path, text):
+                _apply_log_entry(logs, record["date"], record["entry"])
+
+    rows = []
+    for pos, log in enumerate(logs):
+        if not isinstance(log, dict):
+            continue
+        path = log.get("path")
+        item = path.split("/")[0] if log.get("done") and isinstance(path, str) and path else None
+        rows.append((
+            goal, pos, "date" in log, to_date_str(log.get("date")),
+            _number(log.get("value", 0)), _number(log.get("total", log.get("value", 0))), item,
+        ))
+    conn.execute("DELETE FROM logs WHERE goal = ?", (goal,))
+    conn.executemany("INSERT INTO logs VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+
+def _load_todos(conn: sqlite3.Connection, name: str, paths: list[Path], texts: list[str | None]) -> None:
+    from .task_index import _plain
+
+    _, goal, unit = name.split("/", 2)
+    data = _parse_yaml(paths[0], texts[0]) if texts[0] is not None else {}
+    tasks = data.get("tasks") if isinstance(data, dict) else None
+    rows = []
+    for pos, task in enumerate(t for t in tasks or [] if isinstance(t, dict)):
+        task = _plain(task)
+        done = bool(task.get("done", False))
+        rows.append((
+            goal, unit, pos, task.get("id"), done, not done and bool(task.get("scheduled_for")),
+            task.get("event_id") or None, json.dumps(task),
+        ))
+    conn.execute("DELETE FROM tasks WHERE goal = ? AND unit = ?", (goal, unit))
+    conn.executemany("INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+
+def _load_list(conn: sqlite3.Connection, name: str, paths: list[Path], texts: list[str | None]) -> None:
+    entries = _parse_yaml(paths[0], texts[0]) if texts[0] is not None else []
+    rows = [
+        (pos, to_date_str(entry.get("date")), pickle.dumps(entry, pickle.HIGHEST_PROTOCOL))
+        for pos, entry in enumerate(entries if isinstance(entries, list) else [])
+        if isinstance(entry, dict)
+    ]
+    conn.execute(f"DELETE FROM {name}")
+    conn.executemany(f"INSERT INTO {name} VALUES (?, ?, ?)", rows)
+
+
+def _loader(name: str):
+    kind = name.split("/", 1)[0]
+    if kind == "logs":
+        return _load_logs
+    if kind == "todos":
+        return _load_todos
+    return _load_list
+
+
+def _stat_json(paths: list[Path]) -> str:
+    return json.dumps([_stat_key(p) for p in paths])
+
+
+def _sync(conn: sqlite3.Connection, name: str) -> None:
+    """Reload one source if its files changed since it was last mirrored."""
+    paths = _source_paths(name)
+    stat = _stat_json(paths)
+    row = conn.execute("SELECT stat, hash FROM sources WHERE name = ?", (name,)).fetchone()
+    if row and row[0] == stat:
+        return
+    if row is None and not any(p.exists() for p in paths):
+        return  # never mirrored and still nothing to mirror
+
+    texts, digest = [], hashlib.sha256()
+    for path in paths:
+        try:
+            raw = path.read_bytes()
+        except FileNotFoundError:
+            texts.append(None)
+            digest.update(b"\x00missing")
+            continue
+        texts.append(raw.decode())
+        digest.update(len(raw).to_bytes(8, "big") + raw)
+    content_hash = digest.hexdigest()
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if row and row[1] == content_hash:
+            conn.execute("UPDATE sources SET stat = ? WHERE name = ?", (stat, name))
+        else:
+            _loader(name)(conn, name, paths, texts)
+            if all(text is None for text in texts):
+                conn.execute("DELETE FROM sources WHERE name = ?", (name,))
+            else:
+                conn.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?)", (name, stat, content_hash))
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _drop_missing(conn: sqlite3.Connection, prefix: str, present: list[str]) -> None:
+    """Remove mirrored sources under prefix whose files are gone."""
+    present = set(present)
+    stale = [
+        name for (name,) in conn.execute("SELECT name FROM sources WHERE name LIKE ?", (prefix + "%",))
+        if name not in present
+    ]
+    for name in stale:
+        _sync(conn, name)
+
+
+# --- Connection ---
+
+def _open() -> sqlite3.Connection:
+    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version == SCHEMA_VERSION:
+        conn.executescript(_SCHEMA)
+        row = conn.execute("SELECT value FROM meta WHERE key = 'repo'").fetchone()
+        if row and row[0] == str(REPO_PATH):
+            return conn
+    # New, outdated or built for another checkout: start over
+    tables = [name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+    for table in tables:
+        conn.execute(f"DROP TABLE IF EXISTS {table}")
+    conn.executescript(_SCHEMA)
+    conn.execute("INSERT OR REPLACE INTO meta VALUES ('repo', ?)", (str(REPO_PATH),))
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def _connection() -> sqlite3.Connection | None:
+    """The open mirror (caller holds _lock), or None if disabled or unusable."""
+    global _conn, _failed
+    if _conn is not None or _failed or not ENABLED:
+        return _conn
+    try:
+        conn = _open()
+        names = _all_sources()
+        for name in names:
+            _sync(conn, name)
+        _drop_missing(conn, "", names)
+    except Exception as e:
+        _failed = True
+        logger.warning(f"SQLite mirror disabled: {e}")
+        return None
+    _conn = conn
+    add_write_hook(_on_write)
+    return conn
+
+
+def start() -> None:
+    """Open the mirror and bring it up to date (no-op unless enabled)."""
+    if ENABLED:
+        with _lock:
+            _connection()
+
+
+def _on_write(path: Path) -> None:
+    """storage write hook: resync the source the written file belongs to."""
+    name = _source_of(path)
+    if name is None:
+        return
+    with _lock:
+        if _conn is None:
+            return
+        try:
+            _sync(_conn, name)
+        except Exception as e:
+            logger.warning(f"SQLite mirror: could not sync {name}: {e}")
+            try:
+                # Forget the source so the next ready() retries it
+                _conn.execute("DELETE FROM sources WHERE name = ?", (name,))
+            except sqlite3.Error:
+                pass
+
+
+# --- Queries ---
+
+def _pending_in_txn(paths: list[Path]) -> bool:
+    txn = _active_txn.get()
+    return bool(txn) and any(p in txn.dirty or p in txn.appends for p in paths)
+
+
+def _note_mirrored(conn: sqlite3.Connection, sources: dict[str, list[Path]]) -> bool:
+    """
+    Record the file versions the mirror holds as read by the current
+    transaction, so commit catches writes made since. False if a source's
+    files changed shape since it was synced (a new month shard).
+    """
+    for name, paths in sources.items():
+        row = conn.execute("SELECT stat FROM sources WHERE name = ?", (name,)).fetchone()
+        keys = json.loads(row[0]) if row else [None] * len(paths)
+        if len(keys) != len(paths):
+            return False
+        for path, key in zip(paths, keys):
+            _note_read(path, tuple(key) if key else None)
+    return True
+
+
+def ready(kind: str, goal_id: str = None) -> bool:
+    """
+    True if queries of kind ("logs", "todos", "daily", "memory") can be
+    answered from the mirror right now. Syncs what changed first.
+    False means the caller should read the YAML instead.
+    """
+    if not ENABLED:
+        return False
+
+    if kind == "logs":
+        names = [f"logs/{goal_id}"]
+    elif kind == "todos":
+        names = _todo_sources()
+    else:
+        names = [kind]
+
+    sources = {name: _source_paths(name) for name in names}
+    if kind == "todos":
+        txn = _active_txn.get()
+        todos = _data_dir() / "todos"
+        if txn and any(todos in p.parents for p in txn.dirty):
+            return False
+    elif _pending_in_txn([p for paths in sources.values() for p in paths]):
+        return False
+
+    # Stat outside the lock; only sources whose files changed sync under it
+    stats = {name: _stat_json(paths) for name, paths in sources.items()}
+    with _lock:
+        conn = _connection()
+        if conn is None:
+            return False
+        try:
+            mirrored = dict(conn.execute("SELECT name, stat FROM sources"))
+            for name in names:
+                if mirrored.get(name, json.dumps([None] * len(sources[name]))) != stats[name]:
+                    _sync(conn, name)
+            if kind == "todos":
+                _drop_missing(conn, "todos/", names)
+                _unit_order.clear()
+                _unit_order.update({tuple(name.split("/", 2)[1:]): i for i, name in enumerate(names)})
+            if _active_txn.get() is not None and not _note_mirrored(conn, sources):
+                return False
+        except Exception as e:
+            logger.warning(f"SQLite mirror: falling back to YAML for {kind}: {e}")
+            return False
+    return True
+
+
+def _query(sql: str, params: tuple = ()) -> list[tuple]:
+    with _lock:
+        return _conn.execute(sql, params).fetchall()
+
+
+def log_last_date(goal_id: str) -> str | None:
+    """Date of the last log record that has one (in file order)."""
+    rows = _query("SELECT date FROM logs WHERE goal = ? AND has_date ORDER BY pos DESC LIMIT 1", (goal_id,))
+    return rows[0][0] if rows else None
+
+
+def log_stats(goal_id: str, start: str, end: str = None) -> tuple[int, int | float, int | float]:
+    """(records, sum of value, sum of total-or-value) for records dated start..end."""
+    sql = "SELECT COUNT(*), SUM(value), SUM(total) FROM logs WHERE goal = ? AND date >= ?"
+    params = (goal_id, start)
+    if end is not None:
+        sql += " AND date <= ?"
+        params += (end,)
+    count, value, total = _query(sql, params)[0]
+    return count, value or 0, total or 0
+
+
+def log_completed_items(goal_id: str) -> set:
+    """Top-level content items with a done log record."""
+    return {item for (item,) in _query(
+        "SELECT DISTINCT item FROM logs WHERE goal = ? AND item IS NOT NULL", (goal_id,))}
+
+
+def _task_results(rows: list[tuple]) -> list[dict]:
+    """Rows of (goal, unit, pos, data) as task results, in directory then file order."""
+    rows.sort(key=lambda r: (_unit_order.get((r[0], r[1]), len(_unit_order)), r[2]))
+    return [{"goal_id": goal, "unit": unit, "task": json.loads(data)} for goal, unit, _, data in rows]
+
+
+def pending_tasks(goal_id: str = None) -> list[dict]:
+    """All not-done tasks, optionally for one goal."""
+    if goal_id:
+        rows = _query("SELECT goal, unit, pos, data FROM tasks WHERE done = 0 AND goal = ?", (goal_id,))
+    else:
+        rows = _query("SELECT goal, unit, pos, data FROM tasks WHERE done = 0")
+    return _task_results(rows)
+
+
+def scheduled_tasks() -> list[dict]:
+    """All not-done tasks that have scheduled_for set."""
+    return _task_results(_query("SELECT goal, unit, pos, data FROM tasks WHERE scheduled"))
+
+
+def find_by_event_id(event_id: str) -> dict | None:
+    """The task linked to a calendar event, or None."""
+    rows = _task_results(_query("SELECT goal, unit, pos, data FROM tasks WHERE event_id = ?", (event_id,)))
+    return rows[0] if rows else None
+
+
+def daily_entry(date: str) -> dict | None:
+    """First daily entry for a YYYY-MM-DD date."""
+    rows = _query("SELECT data FROM daily WHERE date = ? ORDER BY pos LIMIT 1", (date,))
+    return pickle.loads(rows[0][0]) if rows else None
+
+
+def daily_between(start: str, end: str) -> list[dict]:
+    """First entry for each date in start..end inclusive, in date order."""
+    rows = _query("SELECT data, MIN(pos) FROM daily WHERE date BETWEEN ? AND ? "
+                  "GROUP BY date ORDER BY date", (start, end))
+    return [pickle.loads(data) for data, _ in rows]
+
+
+def recent_memory(limit: int) -> list[dict]:
+    """The last `limit` memory entries, oldest first."""
+    rows = _query("SELECT data FROM memory ORDER BY pos DESC LIMIT ?", (limit,))
+    return [pickle.loads(data) for (data,) in reversed(rows)]
@@ -1,14 +1,31 @@
 """YAML storage operations for goals and logs."""
 
+import fcntl
+import hashlib
+import io
+import json
+import logging
 import os
+import pickle
+import re
+import shutil
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
 from datetime import date as date_type
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 import yaml
 from ruamel.yaml import YAML
 
+from . import locks
+
+logger = logging.getLogger(__name__)
+
 
 def to_date_str(value) -> str:
     """Convert date value to string, handling both str and datetime.date."""
@@ -43,11 +60,67 @@ def _discover_repo_path() -> Path:
 
 REPO_PATH = _discover_repo_path()
 
-# Round-trip YAML parser for preserving structure
-_ruamel = YAML(typ='rt')  # Explicit round-trip mode
-_ruamel.preserve_quotes = True
-_ruamel.default_flow_style = False
-_ruamel.indent(mapping=2, sequence=4, offset=2)  # Match original file style
+# Local state (sidecar indexes, snapshots) lives next to the OAuth tokens
+STATE_DIR = Path.home() / ".goals-mcp"
+
+# Round-trip YAML parser for preserving structure. A YAML instance keeps
+# per-document state while loading or dumping, so each thread gets its own.
+_ruamel_local = threading.local()
+
+
+def _ruamel() -> YAML:
+    yaml = getattr(_ruamel_local, "yaml", None)
+    if yaml is None:
+        yaml = _ruamel_local.yaml = YAML(typ='rt')  # Explicit round-trip mode
+        yaml.preserve_quotes = True
+        yaml.default_flow_style = False
+        yaml.indent(mapping=2, sequence=4, offset=2)  # Match original file style
+    return yaml
+
+# libyaml bindings when available (several times faster), pure Python otherwise
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _CYamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+    _CYamlDumper = None
+
+_PLAIN_SCALARS = (str, int, float, bool, type(None), date_type)
+
+# Any line with something other than whitespace or a comment
+_CONTENT_LINE = re.compile(r'^[ \t]*[^\s#]', re.MULTILINE)
+
+
+def _c_dump_safe(data) -> bool:
+    """
+    True if libyaml will emit exactly what the pure-Python dumper would.
+
+    The emitters only disagree on how long double-quoted scalars are folded,
+    so strings that would be double-quoted (line breaks, tabs, non-printables,
+    leading/trailing whitespace) and non-plain types take the slow path.
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+        elif isinstance(value, str):
+            if value and (not value.isprintable() or value[0].isspace() or value[-1].isspace()):
+                return False
+        elif not isinstance(value, _PLAIN_SCALARS):
+            return False
+    return True
+
+
+def _yaml_load(text: str) -> Any:
+    return yaml.load(text, Loader=_YamlLoader)
+
+
+def _yaml_dump(data: Any) -> str:
+    dumper = _CYamlDumper if _CYamlDumper and _c_dump_safe(data) else yaml.Dumper
+    return yaml.dump(data, Dumper=dumper, default_flow_style=False, allow_unicode=True)
 
 
 def get_today() -> str:
@@ -55,42 +128,568 @@ def get_today() -> str:
     return datetime.now().strftime("%Y-%m-%d")
 
 
+# --- Parsed document cache ---
+# Parsed documents are cached process-wide, keyed by path and validated against
+# the file's (mtime_ns, size, inode). Entries are stored pickled: every hit
+# unpickles a private copy, which is far cheaper than parsing and means callers
+# can mutate what they get back. (ruamel's deepcopy drops shared comment tokens,
+# pickle keeps them.)
+#
+# snapshot.py persists the cache between runs; on a miss, the previous run's
+# parse is reused if the file's mtime and size, or failing that its content
+# hash, still match.
+#
+# Entries are always checked against a fresh stat. While watcher.py runs, it
+# also reports changes to forget_changed(), which drops stale entries early.
+
+_doc_cache: dict[Path, tuple[tuple, bytes, str]] = {}   # path -> (stat key, blob, parser name)
+_doc_cache_lock = threading.Lock()
+
+# path -> (mtime_ns, size, sha256, parser name, blob) from the last snapshot
+_snapshot_docs: dict[Path, tuple] = {}
+
+# (path, derive function) -> (stat key of the document, derived value)
+_derived: dict[tuple[Path, Callable], tuple[tuple, Any]] = {}
+
+# Content directory listings: dir -> ((mtime_ns, inode), sorted item names)
+_listings: dict[Path, tuple[tuple, tuple[str, ...]]] = {}
+
+
+def _stat_key(path: Path) -> tuple | None:
+    """Get the (mtime_ns, size, inode) cache key for a file, or None if missing."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _from_snapshot(path: Path, parse: Callable, key: tuple | None) -> bytes | None:
+    """The previous run's parse of path, if the file hasn't changed since."""
+    with _doc_cache_lock:
+        entry = _snapshot_docs.pop(path, None)
+    if entry is None or key is None:
+        return None
+    mtime_ns, size, digest, parser, blob = entry
+    if parser != parse.__name__:
+        return None
+    if (mtime_ns, size) != key[:2]:
+        try:
+            if hashlib.sha256(path.read_bytes()).hexdigest() != digest:
+                return None
+        except FileNotFoundError:
+            return None
+    return blob
+
+
+def _cached_parse(path: Path, parse: Callable[[Path, str], Any]) -> Any:
+    """Return a private copy of the parsed document at path, parsing only on a miss."""
+    txn = _active_txn.get()
+    if txn is not None and path in txn.docs:
+        # Pinned (or written) earlier in this transaction
+        return txn.with_appends(path, pickle.loads(txn.docs[path]))
+    if txn is not None and path in txn.texts:
+        # Patched earlier in this transaction
+        data = parse(path, txn.texts[path])
+        txn.docs[path] = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+        return txn.with_appends(path, data)
+
+    with _doc_cache_lock:
+        entry = _doc_cache.get(path)
+    key = _stat_key(path)
+    if entry is not None and key is not None and entry[0] == key:
+        blob = entry[1]
+        data = pickle.loads(blob)
+    else:
+        with _read_lock(path):
+            key = _stat_key(path)
+            blob = _from_snapshot(path, parse, key)
+            if blob is not None:
+                data = pickle.loads(blob)
+            else:
+                data = parse(path, path.read_text())
+                blob = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+        if key is not None:
+            with _doc_cache_lock:
+                _doc_cache[path] = (key, blob, parse.__name__)
+
+    if txn is not None:
+        txn.docs[path] = blob
+        _note_read(path, key)
+        data = txn.with_appends(path, data)
+    return data
+
+
+def _cached_derive(path: Path, parse: Callable[[Path, str], Any], derive: Callable[[Any], Any]) -> Any:
+    """
+    derive(document at path), recomputed only when the document changes.
+
+    derive must return something immutable: the value is shared between callers.
+    """
+    txn = _active_txn.get()
+    with _doc_cache_lock:
+        entry = _doc_cache.get(path)
+        derived = _derived.get((path, derive))
+    pending = txn is not None and (path in txn.texts or path in txn.appends)
+    pinned = txn.docs.get(path) if txn is not None else None
+    if entry is not None and derived is not None and derived[0] == entry[0] and not pending:
+        if pinned is entry[1]:
+            return derived[1]
+        if pinned is None and _stat_key(path) == entry[0]:
+            if txn is not None:
+                # Pin the same snapshot a full read would have
+                txn.docs[path] = entry[1]
+                _note_read(path, entry[0])
+            return derived[1]
+
+    data = _cached_parse(path, parse)
+    with _doc_cache_lock:
+        entry = _doc_cache.get(path)
+    if entry is None or pending or (txn is not None and txn.docs.get(path) is not entry[1]):
+        return derive(data)
+    if txn is None:
+        # Another thread may have replaced the entry since; derive from the one we key on
+        data = pickle.loads(entry[1])
+    value = derive(data)
+    with _doc_cache_lock:
+        _derived[(path, derive)] = (entry[0], value)
+    return value
+
+
+def get_version(path: Path) -> tuple | None:
+    """
+    A value that changes whenever the file at path does, or for a directory,
+    whenever any file directly inside it does. None if path doesn't exist.
+    """
+    try:
+        st = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        version = None
+    else:
+        version = (st.st_mtime_ns, st.st_size, st.st_ino)
+        if stat.S_ISDIR(st.st_mode):
+            entries = []
+            with os.scandir(path) as it:
+                for entry in it:
+                    if not entry.name.startswith("."):
+                        est = entry.stat()
+                        entries.append((entry.name, est.st_mtime_ns, est.st_size, est.st_ino))
+            version = (st.st_ino, tuple(sorted(entries)))
+    return version
+
+
+def has_pending_writes(paths) -> bool:
+    """True if the current transaction has unwritten changes to any of paths (or files directly in them)."""
+    txn = _active_txn.get()
+    if txn is None or not (txn.dirty or txn.appends or txn.journal):
+        return False
+    wanted = set(paths)
+    journals = [get_journal_path(goal_id) for goal_id in txn.journal]
+    return any(p in wanted or p.parent in wanted for p in (*txn.dirty, *txn.appends, *journals))
+
+
+def forget_changed(path: Path) -> None:
+    """Drop cached documents and listings at or under path that no longer match."""
+    for directory in [d for d in list(_listings) if d == path or d == path.parent or path in d.parents]:
+        _listings.pop(directory, None)
+    with _doc_cache_lock:
+        if path in _doc_cache:
+            paths = [path]
+        else:
+            paths = [p for p in _doc_cache if path in p.parents]
+    for p in paths:
+        key = _stat_key(p)
+        with _doc_cache_lock:
+            entry = _doc_cache.get(p)
+            if entry is not None and entry[0] != key:
+                del _doc_cache[p]
+
+
+# Called with the path after every write, append or removal of a data file
+_write_hooks: list[Callable[[Path], None]] = []
+
+
+def add_write_hook(hook: Callable[[Path], None]) -> None:
+    """Register a callback run after storage changes a file (e.g. to update a derived index)."""
+    if hook not in _write_hooks:
+        _write_hooks.append(hook)
+
+
+def _invalidate(path: Path) -> None:
+    """Drop a cached document after writing it, and notify write hooks."""
+    with _doc_cache_lock:
+        _doc_cache.pop(path, None)
+        _snapshot_docs.pop(path, None)
+    for hook in _write_hooks:
+        hook(path)
+
+
+# --- Writes and transactions ---
+# All YAML writes go through _queue_write(): temp file + fsync + rename, so a
+# crash or a concurrent reader never sees a truncated file. Inside a
+# transaction() writes are deferred instead, and each dirty path is
+# serialized once at commit with its latest data.
+
+class _Transaction:
+    """Documents read and written inside one transaction() block."""
+
+    def __init__(self):
+        self.docs: dict[Path, bytes] = {}         # path -> pickled snapshot
+        self.read_keys: dict[Path, tuple] = {}    # path -> stat key when first read
+        self.dirty: dict[Path, tuple] = {}        # path -> (render, after-write callbacks)
+        self.texts: dict[Path, str] = {}          # path -> patched text (dirty paths written as text)
+        self.appends: dict[Path, list] = {}       # path -> items to append to a block list
+        self.journal: dict[str, list[str]] = {}   # goal_id -> log journal lines to append
+        self.replaced_logs: set[str] = set()      # goal_ids saved in full (journal dropped at commit)
+
+    def with_appends(self, path: Path, data: Any) -> Any:
+        """data plus any items appended to path in this transaction."""
+        if path in self.appends and isinstance(data, list):
+            data.extend(pickle.loads(pickle.dumps(self.appends[path])))
+        return data
+
+    def commit(self) -> None:
+        if not self.dirty and not self.appends and not self.journal:
+            return
+
+        with sync_lock(shared=True):
+            held = []
+            try:
+                # In path order, so concurrent commits can't deadlock
+                for path in sorted({*self.dirty, *self.appends}):
+                    if _lockable(path):
+                        held.append(locks.acquire(path))
+
+                for path in self.dirty:
+                    if path in self.read_keys and _stat_key(path) != self.read_keys[path]:
+                        raise TransactionConflict(f"{path.name} was changed by another call; nothing was saved")
+
+                # Render everything first so a serialization error writes nothing
+                rendered = []
+                for path, (render, callbacks) in self.dirty.items():
+                    text = self.texts[path] if path in self.texts else render(pickle.loads(self.docs[path]))
+                    rendered.append((path, text, callbacks))
+
+                for path, text, _ in rendered:
+                    _atomic_write_text(path, text)
+                for path, items in self.appends.items():
+                    _append_items_now(path, items)
+                for goal_id, lines in self.journal.items():
+                    _append_journal_now(goal_id, lines)
+                # Still locked: callbacks may record the version just written
+                for _, _, callbacks in rendered:
+                    for callback in callbacks:
+                        callback()
+            finally:
+                for h in reversed(held):
+                    locks.release(h)
+
+
+_active_txn: ContextVar[_Transaction | None] = ContextVar("_active_txn", default=None)
+
+
+# --- Locking ---
+# Concurrent tool calls (SSE sessions, a stdio instance sharing the checkout)
+# must not interleave read-modify-write cycles. A file is read under a shared
+# lock, held just for the read, and the transaction records the version it
+# read. At commit the transaction locks every file it writes exclusively, in
+# path order, and checks that none of them changed since it read them; if one
+# did, it raises TransactionConflict and writes nothing (tools.py re-runs the
+# call). Nothing is locked while a handler runs, so readers never wait on
+# writers' handlers or each other, and lock order can't deadlock.
+#
+# Config the server never writes and the log journals (which have their own
+# append lock) are not locked. Commits hold the sync lock shared; git sync
+# takes it exclusively so it never stages a half-written transaction.
+
+class TransactionConflict(RuntimeError):
+    """A file a transaction wrote was changed by someone else after it was read."""
+
+
+def _lockable(path: Path) -> bool:
+    return path.suffix == ".yml" and path.name not in ("goals.yml", "schedule.yml")
+
+
+@contextmanager
+def _read_lock(path: Path):
+    """Shared lock on a data file while it's read, so its stat key matches its text."""
+    if not _lockable(path):
+        yield
+        return
+    with locks.locked(path, shared=True):
+        yield
+
+
+def _note_read(path: Path, key: tuple | None) -> None:
+    """Record the version of path the current transaction read (its first read wins)."""
+    txn = _active_txn.get()
+    if txn is not None:
+        txn.read_keys.setdefault(path, key)
+
+
+@contextmanager
+def sync_lock(shared: bool = False):
+    """Repo-wide lock: shared while committing data, exclusive for git sync."""
+    with locks.locked(REPO_PATH / "_data" / "sync", shared=shared):
+        yield
+
+
+@contextmanager
+def _outside_transaction():
+    """Run reads against the files on disk, bypassing the current transaction."""
+    token = _active_txn.set(None)
+    try:
+        yield
+    finally:
+        _active_txn.reset(token)
+
+
+def _exists(path: Path) -> bool:
+    """Like path.exists(), but also true for files written in the current transaction."""
+    txn = _active_txn.get()
+    return bool(txn and path in txn.dirty) or path.exists()
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    """Write text to path via temp file + fsync + rename."""
+    _atomic_write_bytes(path, text.encode())
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write data to path via temp file + fsync + rename."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+    # Make the rename itself durable
+    dir_fd = os.open(path.parent, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+    _invalidate(path)
+
+
+def _queue_write(path: Path, data: Any, render: Callable[[Any], str],
+                 after: Callable[[], None] = None) -> None:
+    """Write data (serialized by render) now, or when the current transaction commits."""
+    txn = _active_txn.get()
+    if txn is None:
+        with locks.locked(path):
+            _atomic_write_text(path, render(data))
+        if after:
+            after()
+        return
+
+    # Snapshot now: callers may keep mutating data after saving it. A full
+    # save supersedes appends queued earlier for the same file.
+    txn.appends.pop(path, None)
+    txn.texts.pop(path, None)
+    txn.docs[path] = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+    callbacks = txn.dirty[path][1] if path in txn.dirty else []
+    if after:
+        callbacks.append(after)
+    txn.dirty[path] = (render, callbacks)
+
+
+def _queue_text(path: Path, text: str, after: Callable[[], None] = None) -> None:
+    """Like _queue_write, for callers that already have the file's new text."""
+    txn = _active_txn.get()
+    if txn is None:
+        with locks.locked(path):
+            _atomic_write_text(path, text)
+        if after:
+            after()
+        return
+
+    txn.appends.pop(path, None)
+    txn.docs.pop(path, None)
+    txn.texts[path] = text
+    callbacks = txn.dirty[path][1] if path in txn.dirty else []
+    if after:
+        callbacks.append(after)
+    txn.dirty[path] = (None, callbacks)
+
+
+def _patch_text(path: Path) -> str | None:
+    """
+    Text to patch for path: the patched text pending in this transaction, or
+    the file itself. None if the file is missing or has a full save pending.
+    """
+    txn = _active_txn.get()
+    if txn is not None and path in txn.dirty:
+        return txn.texts.get(path)
+    with _read_lock(path):
+        key = _stat_key(path)
+        try:
+            text = path.read_text()
+        except FileNotFoundError:
+            return None
+    _note_read(path, key)
+    return text
+
+
+def _patch_yaml(path: Path, text: str, expected: Any, sets: dict, deletes: list = (),
+                after: Callable[[], None] = None) -> bool:
+    """
+    Rewrite only the changed value spans of text and queue the result.
+
+    expected is the plain data the patched text must parse to; if the patch
+    can't be expressed as span edits or doesn't parse back to it, nothing is
+    written and False is returned so the caller can fall back to ruamel.
+    """
+    from . import yaml_patch
+
+    new_text = yaml_patch.apply(text, sets, deletes)
+    if new_text is None:
+        return False
+    try:
+        if _yaml_load(new_text) != expected:
+            return False
+    except yaml.YAMLError:
+        return False
+    _queue_text(path, new_text, after)
+    return True
+
+
+def _append_items_now(path: Path, items: list) -> None:
+    """
+    Append items to a block-list YAML file, re-dumping it if it can't take
+    appends. The caller holds the file's lock.
+    """
+    from . import yaml_list
+
+    if not path.exists():
+        _atomic_write_text(path, "".join(yaml_list.render_item(item) for item in items))
+        return
+    if yaml_list.can_append(path):
+        # Only the new items' bytes are written; readers take the shared lock
+        yaml_list.append_items(path, items)
+        _invalidate(path)
+        return
+
+    data = load_yaml(path) if path.exists() else []
+    if not isinstance(data, list):
+        data = []
+    _atomic_write_text(path, _render_yaml(path, data + items))
+
+
+def _queue_append(path: Path, item: Any) -> bool:
+    """
+    Append one item to a block-list YAML file now, or when the current
+    transaction commits.
+
+    Returns False if the file already has a full save pending in this
+    transaction; the caller should load, append and save instead.
+    """
+    txn = _active_txn.get()
+    if txn is None:
+        with locks.locked(path):
+            _append_items_now(path, [item])
+        return True
+    if path in txn.dirty:
+        return False
+    txn.appends.setdefault(path, []).append(item)
+    return True
+
+
+@contextmanager
+def transaction():
+    """
+    Unit of work for multi-file updates.
+
+    Each file is parsed at most once and later reads return the same snapshot,
+    including data saved earlier in the block. Saves are deferred and every
+    dirty file is written once when the block exits; nothing is written if it
+    raises, or if a file it saves was changed by someone else since it read
+    it (TransactionConflict). Nested blocks join the outermost one.
+    """
+    if _active_txn.get() is not None:
+        yield
+        return
+
+    txn = _Transaction()
+    token = _active_txn.set(txn)
+    try:
+        yield
+    finally:
+        _active_txn.reset(token)
+    txn.commit()
+
+
+def _render_ruamel(data: Any) -> str:
+    buf = io.StringIO()
+    _ruamel().dump(data, buf)
+    return buf.getvalue()
+
+
+def _parse_yaml(path: Path, content: str) -> Any:
+    if not _CONTENT_LINE.search(content):
+        return []
+    return _yaml_load(content) or []
+
+
+def _parse_ruamel(path: Path, content: str) -> Any:
+    return _ruamel().load(content)
+
+
 def load_yaml(path: Path) -> Any:
     """Load YAML file, return empty dict/list if only comments."""
-    if not path.exists():
+    if not _exists(path):
         return {}
-    content = path.read_text()
-    lines = [l.strip() for l in content.split('\n') if l.strip() and not l.strip().startswith('#')]
-    if not lines:
-        return []
-    return yaml.safe_load(content) or []
+    return _cached_parse(path, _parse_yaml)
 
 
-def save_yaml(path: Path, data: Any) -> None:
-    """Save data to YAML file, preserving header comments."""
-    if path.exists():
-        content = path.read_text()
-        header_lines = []
-        for line in content.split('\n'):
-            if line.strip().startswith('#') or not line.strip():
-                header_lines.append(line)
-            else:
-                break
-        header = '\n'.join(header_lines) + '\n' if header_lines else ''
+def _render_yaml(path: Path, data: Any, header_from: Path = None) -> str:
+    """
+    Serialize data for path, keeping the header comments already in the file
+    (or, for a new file, those of header_from).
+    """
+    source = path if path.exists() else header_from
+    if source is not None and source.exists():
+        content = source.read_text()
+        # Header = leading comment/blank lines
+        m = _CONTENT_LINE.search(content)
+        header = content[:m.start()] if m else content + '\n'
     else:
         header = ''
 
     # Don't write empty arrays - just keep header
     if isinstance(data, list) and len(data) == 0:
-        path.write_text(header.rstrip() + '\n')
-        return
+        return header.rstrip() + '\n'
+    return header + _yaml_dump(data)
 
-    path.write_text(header + yaml.dump(data, default_flow_style=False, allow_unicode=True))
+
+def save_yaml(path: Path, data: Any, after: Callable[[], None] = None) -> None:
+    """Save data to YAML file, preserving header comments."""
+    _queue_write(path, data, lambda d: _render_yaml(path, d), after)
 
 
 def get_goals_config() -> dict:
-    """Load goals configuration."""
-    return load_yaml(REPO_PATH / "_data" / "goals.yml")
+    """
+    Load goals configuration, compiled (see goals_config.GoalsConfig).
+
+    The result is read-only and shared between callers.
+    """
+    from .goals_config import compile_config
+    path = REPO_PATH / "_data" / "goals.yml"
+    if not _exists(path):
+        return compile_config({})
+    return _cached_derive(path, _parse_yaml, compile_config)
 
 
 # --- Schedule and Current Progress ---
@@ -103,10 +702,9 @@ def get_schedule() -> dict:
 def _load_current_progress_ruamel():
     """Load current.yml with ruamel to preserve comments."""
     path = REPO_PATH / "_data" / "current.yml"
-    if not path.exists():
+    if not _exists(path):
         return {}
-    with open(path) as f:
-        return _ruamel.load(f) or {}
+    return _cached_parse(path, _parse_ruamel) or {}
 
 
 def get_current_progress() -> dict:
@@ -119,8 +717,7 @@ def get_current_progress() -> dict:
 def save_current_progress(data) -> None:
     """Save current progress state (expects ruamel CommentedMap to preserve comments)."""
     path = REPO_PATH / "_data" / "current.yml"
-    with open(path, 'w') as f:
-        _ruamel.dump(data, f)
+    _queue_write(path, data, _render_ruamel)
 
 
 def update_current_goal(goal_id: str, updates: dict) -> dict:
@@ -135,6 +732,21 @@ def update_current_goal(goal_id: str, updates: dict) -> dict:
     Returns:
         The updated goal section
     """
+    # Fast path: every key already exists with a single-line value
+    path = REPO_PATH / "_data" / "current.yml"
+    text = _patch_text(path)
+    if text is not None:
+        try:
+            plain = _parse_yaml(path, text)
+        except yaml.YAMLError:
+            plain = None
+        section = plain.get(goal_id) if isinstance(plain, dict) else None
+        if isinstance(section, dict) and all(key in section for key in updates):
+            sets = {(goal_id, key): value for key, value in updates.items() if section[key] != value}
+            section.update(updates)
+            if not sets or _patch_yaml(path, text, plain, sets):
+                return dict(section)
+
     # Load with ruamel to preserve comments
     current = _load_current_progress_ruamel()
 
@@ -178,7 +790,8 @@ def get_current_week(schedule: dict = None) -> dict:
         end: End date string
     """
     if schedule is None:
-        schedule = get_schedule()
+        from . import schedule_index
+        return schedule_index.current_week()
 
     today = get_today()
 
@@ -218,6 +831,11 @@ def get_effective_week(goal_id: str, schedule: dict = None, current: dict = None
         paused: True if goal is paused
         reason: Adjustment reason if set
     """
+    if schedule is None and current is None:
+        from . import schedule_index
+        week = schedule_index.effective_week(goal_id)
+        if week is not None:
+            return week
     if schedule is None:
         schedule = get_schedule()
     if current is None:
@@ -291,29 +909,469 @@ def get_effective_week(goal_id: str, schedule: dict = None, current: dict = None
     }
 
 
-def get_goal_logs(goal_id: str) -> list:
-    """Load logs for a specific goal."""
-    return load_yaml(REPO_PATH / "_data" / "logs" / f"{goal_id}.yml")
+# --- Goal logs ---
+# A goal's log is either one flat list, _data/logs/<goal>.yml, or sharded by
+# month into _data/logs/<goal>/YYYY-MM.yml (records without a usable date go
+# in undated.yml). Sharded logs let date-range reads load only the months
+# they cover. A goal is sharded if its directory exists, or if it has no flat
+# log yet; migrate_goal_logs() converts existing flat logs.
+#
+# In "journal" mode (default) done() appends one JSON line per entry to
+# _data/logs/<goal>.journal instead of rewriting the log, so write cost
+# doesn't grow with history. get_goal_logs() returns the YAML merged with the
+# journal, and compact_goal_logs() folds the journal back into the YAML that
+# Jekyll reads (run periodically and before every git sync).
+#
+# Set GOALS_LOG_MODE=direct to rewrite the YAML on every append instead.
+
+LOG_MODE = os.environ.get("GOALS_LOG_MODE", "journal")
+
+_MONTH = re.compile(r'^\d{4}-\d{2}')
+
+
+def get_log_path(goal_id: str) -> Path:
+    """Get path to the flat YAML log for a goal."""
+    return REPO_PATH / "_data" / "logs" / f"{goal_id}.yml"
+
+
+def get_log_dir(goal_id: str) -> Path:
+    """Get path to the directory of month shards for a goal."""
+    return REPO_PATH / "_data" / "logs" / goal_id
+
+
+def get_log_shard_path(goal_id: str, month: str) -> Path:
+    """Get path to one month's shard (month is YYYY-MM or "undated")."""
+    return get_log_dir(goal_id) / f"{month}.yml"
+
+
+def get_journal_path(goal_id: str) -> Path:
+    """Get path to the append-only journal for a goal."""
+    return REPO_PATH / "_data" / "logs" / f"{goal_id}.journal"
+
+
+def _compacting_path(goal_id: str) -> Path:
+    return REPO_PATH / "_data" / "logs" / f"{goal_id}.journal.compacting"
+
+
+def get_goal_log_paths(goal_id: str) -> list[Path]:
+    """Every file or directory that can hold part of a goal's log."""
+    return [get_log_path(goal_id), get_log_dir(goal_id), get_journal_path(goal_id), _compacting_path(goal_id)]
+
+
+def _is_sharded(goal_id: str) -> bool:
+    return get_log_dir(goal_id).is_dir() or not _exists(get_log_path(goal_id))
+
+
+def _log_month(record) -> str:
+    """Shard a log record belongs in."""
+    date = to_date_str(record.get("date")) if isinstance(record, dict) else ""
+    return date[:7] if _MONTH.match(date) else "undated"
+
+
+def _shard_months(goal_id: str) -> list[str]:
+    """Months with a shard on disk (or written in the current transaction), oldest first."""
+    log_dir = get_log_dir(goal_id)
+    try:
+        with os.scandir(log_dir) as entries:
+            months = {e.name[:-4] for e in entries if e.name.endswith(".yml") and not e.name.startswith(".")}
+    except (FileNotFoundError, NotADirectoryError):
+        months = set()
+    txn = _active_txn.get()
+    if txn is not None:
+        months.update(p.stem for p in txn.dirty if p.parent == log_dir)
+    return sorted(months)
+
+
+def get_goal_log_months(goal_id: str) -> list[str] | None:
+    """
+    Months (YYYY-MM, oldest first) that have log records for a sharded goal,
+    including entries still in the journal. None for a flat log.
+    """
+    if not _is_sharded(goal_id):
+        return None
+    months = {m for m in _shard_months(goal_id) if m != "undated"}
+    months.update(_log_month(r) for r in _read_journal(goal_id))
+    months.discard("undated")
+    return sorted(months)
+
+
+def _parse_journal(path: Path, content: str) -> list[dict]:
+    records = []
+    for line in content.splitlines():
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            # Torn final line from a crash mid-append
+            logger.warning(f"Skipping unreadable journal line in {path.name}")
+    return records
+
+
+def _read_journal(goal_id: str) -> list[dict]:
+    """Journal records not yet folded into the YAML, oldest first."""
+    txn = _active_txn.get()
+    if txn is not None and goal_id in txn.replaced_logs:
+        # Already in the log saved earlier in this transaction
+        return []
+    records = []
+    for path in (_compacting_path(goal_id), get_journal_path(goal_id)):
+        if path.exists():
+            records.extend(_cached_parse(path, _parse_journal))
+    if txn is not None and goal_id in txn.journal:
+        # Appended earlier in this transaction
+        records.extend(json.loads(line) for line in txn.journal[goal_id])
+    return records
+
+
+def _apply_log_entry(logs: list, date: str, entry: dict) -> None:
+    """Add an entry to the day's nested log record, creating it if needed."""
+    day_entry = None
+    for d in logs:
+        if d.get("date") == date:
+            day_entry = d
+            break
+
+    if not day_entry:
+        day_entry = {"date": date, "entries": []}
+        logs.append(day_entry)
+
+    if "entries" not in day_entry:
+        day_entry["entries"] = []
+
+    day_entry["entries"].append(entry)
+
+    # Update total
+    total = sum(e.get("value", 0) for e in day_entry["entries"] if isinstance(e.get("value"), (int, float)))
+    day_entry["total"] = total
+
+
+def _inode(path: Path) -> int | None:
+    try:
+        return os.stat(path).st_ino
+    except FileNotFoundError:
+        return None
+
+
+def _load_list(path: Path) -> list:
+    data = load_yaml(path)
+    return data if isinstance(data, list) else []
+
+
+def get_goal_logs(goal_id: str, start: str = None, end: str = None) -> list:
+    """
+    Load logs for a specific goal (YAML merged with any pending journal entries).
+
+    With start and/or end (YYYY-MM-DD, inclusive) only records dated in that
+    range are returned, and a sharded log reads just the months it covers.
+    """
+    if _is_sharded(goal_id):
+        logs = []
+        for month in _shard_months(goal_id):
+            if month == "undated":
+                if start or end:
+                    continue
+            elif (start and month < start[:7]) or (end and month > end[:7]):
+                continue
+            logs.extend(_load_list(get_log_shard_path(goal_id, month)))
+    else:
+        logs = load_yaml(get_log_path(goal_id))
+
+    records = _read_journal(goal_id)
+    if records:
+        if not isinstance(logs, list):
+            logs = []
+        for record in records:
+            _apply_log_entry(logs, record["date"], record["entry"])
+
+    if start or end:
+        def in_range(log) -> bool:
+            date = to_date_str(log.get("date")) if isinstance(log, dict) else ""
+            return bool(date) and (not start or date >= start) and (not end or date <= end)
+        logs = [log for log in logs if in_range(log)] if isinstance(logs, list) else []
+    return logs
+
+
+def _completed_items(logs: Any) -> frozenset:
+    """Top-level content items that log records mark done."""
+    if not isinstance(logs, list):
+        return frozenset()
+    return frozenset(log["path"].split("/")[0] for log in logs if log.get("done") and log.get("path"))
+
+
+def get_goal_completed_items(goal_id: str) -> frozenset:
+    """
+    Content items a goal's logs mark done, cached per log file so only files
+    that changed are rescanned. (Journal entries only add to a day's entries,
+    so they never mark an item done.)
+    """
+    if _is_sharded(goal_id):
+        paths = [get_log_shard_path(goal_id, m) for m in _shard_months(goal_id)]
+    else:
+        paths = [get_log_path(goal_id)]
+    completed = frozenset()
+    for path in paths:
+        try:
+            completed |= _cached_derive(path, _parse_yaml, _completed_items)
+        except FileNotFoundError:
+            continue
+    return completed
+
+
+def _render_shard(goal_id: str, path: Path, records: list) -> str:
+    """Serialize a shard, taking the header for a new shard from its newest sibling."""
+    siblings = [get_log_shard_path(goal_id, m) for m in reversed(_shard_months(goal_id))]
+    template = next((p for p in siblings + [get_log_path(goal_id)] if p != path and p.exists()), None)
+    return _render_yaml(path, records, header_from=template)
+
+
+def _group_by_month(logs: list) -> dict[str, list]:
+    groups = {}
+    for record in logs:
+        groups.setdefault(_log_month(record), []).append(record)
+    return groups
 
 
 def save_goal_logs(goal_id: str, logs: list) -> None:
-    """Save logs for a specific goal."""
-    save_yaml(REPO_PATH / "_data" / "logs" / f"{goal_id}.yml", logs)
+    """Save the full log for a goal, replacing the YAML and any pending journal."""
+    def drop_journal():
+        for path in (get_journal_path(goal_id), _compacting_path(goal_id)):
+            path.unlink(missing_ok=True)
+            _invalidate(path)
+
+    txn = _active_txn.get()
+    if txn is not None:
+        # The new log replaces entries appended earlier in this transaction too
+        txn.journal.pop(goal_id, None)
+        txn.replaced_logs.add(goal_id)
+
+    if not _is_sharded(goal_id):
+        save_yaml(get_log_path(goal_id), logs, after=drop_journal)
+        return
+
+    # Rewrite only the shards whose records changed; emptied shards keep their header
+    groups = _group_by_month(logs)
+    changed = []
+    for month in sorted(set(groups) | set(_shard_months(goal_id))):
+        path = get_log_shard_path(goal_id, month)
+        records = groups.get(month, [])
+        if _exists(path) and _load_list(path) == records:
+            continue
+        changed.append((path, records))
+
+    if not changed:
+        drop_journal()
+        return
+    for i, (path, records) in enumerate(changed):
+        _queue_write(path, records, lambda d, p=path: _render_shard(goal_id, p, d),
+                     after=drop_journal if i == len(changed) - 1 else None)
+
+
+def append_goal_log(goal_id: str, date: str, entry: dict) -> None:
+    """
+    Append one entry to a goal's log for the given date.
+
+    In journal mode this is a single fsynced append, independent of history size.
+    Inside a transaction() it happens when the transaction commits.
+    """
+    txn = _active_txn.get()
+    if LOG_MODE != "journal" or (txn is not None and goal_id in txn.replaced_logs):
+        # Direct mode, or the log was saved earlier in this transaction: that
+        # save drops the journal, so the entry goes into the saved log instead
+        if _is_sharded(goal_id):
+            # Only the day's month is read and rewritten
+            path = get_log_shard_path(goal_id, _log_month({"date": date}))
+            logs = _load_list(path) if _exists(path) else []
+            _apply_log_entry(logs, date, entry)
+            _queue_write(path, logs, lambda d: _render_shard(goal_id, path, d))
+            return
+        logs = get_goal_logs(goal_id)
+        if not isinstance(logs, list):
+            logs = []
+        _apply_log_entry(logs, date, entry)
+        save_goal_logs(goal_id, logs)
+        return
+
+    line = json.dumps({"date": date, "entry": entry}, ensure_ascii=False) + "\n"
+    if txn is not None:
+        txn.journal.setdefault(goal_id, []).append(line)
+        return
+    _append_journal_now(goal_id, [line])
+
+
+def _append_journal_now(goal_id: str, lines: list[str]) -> None:
+    """Append lines to a goal's journal with a single fsynced write."""
+    path = get_journal_path(goal_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = "".join(lines).encode()
+
+    while True:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            # The compactor may have renamed this journal away while we waited
+            st = os.fstat(fd)
+            if st.st_ino != _inode(path):
+                continue
+            before = (st.st_mtime_ns, st.st_size, st.st_ino)
+            os.write(fd, data)
+            os.fsync(fd)
+            st = os.fstat(fd)
+            after = (st.st_mtime_ns, st.st_size, st.st_ino)
+            break
+        finally:
+            os.close(fd)
+    _invalidate(path)
+
+    from . import log_aggregates
+    log_aggregates.record_append(goal_id, [json.loads(line) for line in lines], before, after)
+
+
+def _journal_goal_ids() -> list[str]:
+    logs_dir = REPO_PATH / "_data" / "logs"
+    if not logs_dir.exists():
+        return []
+    ids = set()
+    for path in logs_dir.iterdir():
+        for suffix in (".journal", ".journal.compacting"):
+            if path.name.endswith(suffix):
+                ids.add(path.name[:-len(suffix)])
+    return sorted(ids)
+
+
+def _fold_into(path: Path, render: Callable[[list], str], records: list) -> None:
+    """Apply journal records to the log file at path and write it through."""
+    with locks.locked(path):
+        logs = _load_list(path) if path.exists() else []
+        for record in records:
+            _apply_log_entry(logs, record["date"], record["entry"])
+        _atomic_write_text(path, render(logs))
+
+
+def compact_goal_logs(goal_id: str = None) -> int:
+    """
+    Fold journal entries into the canonical YAML logs.
+
+    The journal is renamed aside first so concurrent appends start a fresh
+    one, then each affected log file (the flat log, or the shards of the
+    months involved) is rewritten once and the renamed journal removed.
+
+    Returns the number of entries folded.
+    """
+    folded = 0
+    for gid in ([goal_id] if goal_id else _journal_goal_ids()):
+        journal = get_journal_path(gid)
+        pending = _compacting_path(gid)
+
+        # A leftover .compacting file (interrupted run) is folded first
+        if journal.exists() and not pending.exists():
+            os.rename(journal, pending)
+            _invalidate(journal)
+        if not pending.exists():
+            continue
+
+        # Wait out appenders that opened the journal before the rename
+        fd = os.open(pending, os.O_RDONLY)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        finally:
+            os.close(fd)
+
+        records = _parse_journal(pending, pending.read_text())
+        # Written through immediately: the journal is deleted right after
+        with _outside_transaction():
+            if _is_sharded(gid):
+                by_month = {}
+                for record in records:
+                    by_month.setdefault(_log_month(record), []).append(record)
+                for month in sorted(by_month):
+                    path = get_log_shard_path(gid, month)
+                    _fold_into(path, lambda logs, p=path: _render_shard(gid, p, logs), by_month[month])
+            else:
+                log_path = get_log_path(gid)
+                _fold_into(log_path, lambda logs: _render_yaml(log_path, logs), records)
+        pending.unlink()
+        _invalidate(pending)
+        folded += len(records)
+
+    return folded
+
+
+def migrate_goal_logs(goal_id: str = None) -> dict[str, int]:
+    """
+    One-shot conversion of flat logs (logs/<goal>.yml) into month shards.
+
+    Pending journal entries are folded first. The shards are written to a
+    temporary directory that is renamed into place before the flat file is
+    removed; each shard keeps the flat file's header comments. An empty log
+    becomes a header-only shard for the current month.
+
+    Returns {goal_id: shards written} for the goals converted.
+    """
+    logs_dir = REPO_PATH / "_data" / "logs"
+    if goal_id:
+        goal_ids = [goal_id]
+    else:
+        goal_ids = sorted(p.stem for p in logs_dir.glob("*.yml")) if logs_dir.is_dir() else []
+
+    migrated = {}
+    for gid in goal_ids:
+        flat, log_dir = get_log_path(gid), get_log_dir(gid)
+        if not flat.exists() or log_dir.exists():
+            continue
+        compact_goal_logs(gid)
+
+        with sync_lock(), locks.locked(flat):
+            logs = _load_list(flat)
+            groups = _group_by_month(logs) or {get_today()[:7]: []}
+            tmp_dir = Path(tempfile.mkdtemp(dir=logs_dir, prefix=f".{gid}.", suffix=".migrating"))
+            try:
+                for month, records in groups.items():
+                    _atomic_write_text(tmp_dir / f"{month}.yml", _render_yaml(flat, records))
+                os.rename(tmp_dir, log_dir)
+            except BaseException:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                raise
+            flat.unlink()
+            _invalidate(flat)
+        for month in groups:
+            _invalidate(get_log_shard_path(gid, month))
+        migrated[gid] = len(groups)
+        logger.info(f"Sharded {gid} log into {len(groups)} month files")
+
+    return migrated
 
 
 def discover_content(content_path: str) -> list[str]:
-    """Discover subgoals/items from directory structure."""
+    """
+    Discover subgoals/items from directory structure.
+
+    Listings are cached until the directory's mtime changes (adding, removing
+    or renaming an entry bumps it).
+    """
     full_path = REPO_PATH / content_path
-    if not full_path.exists():
+    cached = _listings.get(full_path)
+    try:
+        st = os.stat(full_path)
+    except (FileNotFoundError, NotADirectoryError):
         return []
+    key = (st.st_mtime_ns, st.st_ino)
+    if cached is not None and cached[0] == key:
+        return list(cached[1])
 
     items = []
-    for item in full_path.iterdir():
-        if item.is_dir() and not item.name.startswith('.'):
-            items.append(item.name)
-        elif item.is_file() and item.suffix == '.md' and item.name != 'index.md':
-            items.append(item.stem)
-    return sorted(items)
+    with os.scandir(full_path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                if not entry.name.startswith('.'):
+                    items.append(entry.name)
+            elif entry.is_file():
+                stem, suffix = os.path.splitext(entry.name)
+                if suffix == '.md' and entry.name != 'index.md':
+                    items.append(stem)
+    items.sort()
+    _listings[full_path] = (key, tuple(items))
+    return items
 
 
 # --- Todo storage (uses ruamel.yaml for round-trip preservation) ---
@@ -337,11 +1395,10 @@ def get_unit_todo(goal_id: str, unit: str) -> dict:
     }
     """
     path = get_todo_path(goal_id, unit)
-    if not path.exists():
+    if not _exists(path):
         return {"unit": unit, "tasks": []}
 
-    with open(path) as f:
-        data = _ruamel.load(f)
+    data = _cached_parse(path, _parse_ruamel)
 
     if isinstance(data, dict):
         return dict(data)  # Convert from ruamel CommentedMap
@@ -350,11 +1407,11 @@ def get_unit_todo(goal_id: str, unit: str) -> dict:
 
 def save_unit_todo(goal_id: str, unit: str, todo_data: dict) -> None:
     """Save todo.yml for a specific unit, preserving structure."""
-    path = get_todo_path(goal_id, unit)
-    path.parent.mkdir(parents=True, exist_ok=True)
+    from . import task_index
 
-    with open(path, 'w') as f:
-        _ruamel.dump(todo_data, f)
+    path = get_todo_path(goal_id, unit)
+    _queue_write(path, todo_data, _render_ruamel,
+                 after=lambda: task_index.update_unit(goal_id, unit, todo_data))
 
 
 def update_todo_task(goal_id: str, unit: str, task_id: str,
@@ -372,12 +1429,52 @@ def update_todo_task(goal_id: str, unit: str, task_id: str,
     Returns the updated task or None if not found.
     """
     path = get_todo_path(goal_id, unit)
-    if not path.exists():
+    if not _exists(path):
         return None
 
-    # Load with ruamel for round-trip preservation
-    with open(path) as f:
-        data = _ruamel.load(f)
+    # Fast path: rewrite just the changed values in place
+    text = _patch_text(path)
+    if text is not None:
+        try:
+            plain = _parse_yaml(path, text)
+        except yaml.YAMLError:
+            plain = None
+        if not isinstance(plain, dict) or not isinstance(plain.get("tasks"), list):
+            return None
+        for i, task in enumerate(plain["tasks"]):
+            if isinstance(task, dict) and task.get("id") == task_id:
+                break
+        else:
+            return None
+
+        original_event_id = task.get("event_id")
+        sets, deletes = {}, []
+        for key, value in (("done", done), ("notes", notes),
+                           ("scheduled_for", scheduled_for), ("event_id", event_id)):
+            if value is not None and task.get(key) != value:
+                task[key] = value
+                sets[("tasks", i, key)] = value
+        if clear_schedule:
+            for key in ("scheduled_for", "event_id"):
+                if key in task:
+                    del task[key]
+                    sets.pop(("tasks", i, key), None)
+                    deletes.append(("tasks", i, key))
+
+        updated_task = dict(task)
+        if clear_schedule and original_event_id:
+            updated_task["_cleared_event_id"] = original_event_id
+
+        if not sets and not deletes:
+            return updated_task
+
+        from . import task_index
+        if _patch_yaml(path, text, plain, sets, deletes,
+                       after=lambda: task_index.update_unit(goal_id, unit, plain)):
+            return updated_task
+
+    # Structural change (new keys): load with ruamel for round-trip preservation
+    data = _cached_parse(path, _parse_ruamel)
 
     if not isinstance(data, dict) or "tasks" not in data:
         return None
@@ -409,8 +1506,9 @@ def update_todo_task(goal_id: str, unit: str, task_id: str,
 
     if updated_task:
         # Save back preserving structure
-        with open(path, 'w') as f:
-            _ruamel.dump(data, f)
+        from . import task_index
+        _queue_write(path, data, _render_ruamel,
+                     after=lambda: task_index.update_unit(goal_id, unit, data))
 
     return updated_task
 
@@ -421,31 +1519,10 @@ def get_all_pending_tasks(goal_id: str = None) -> list[dict]:
 
     Returns list of dicts with goal_id, unit, and task info.
     """
-    todos_dir = REPO_PATH / "_data" / "todos"
-    if not todos_dir.exists():
-        return []
-
-    pending = []
-    goal_dirs = [todos_dir / goal_id] if goal_id else todos_dir.iterdir()
-
-    for goal_dir in goal_dirs:
-        if not goal_dir.is_dir():
-            continue
-        gid = goal_dir.name
-
-        for todo_file in goal_dir.glob("*.yml"):
-            unit = todo_file.stem
-            todo = get_unit_todo(gid, unit)
-
-            for task in todo.get("tasks", []):
-                if not task.get("done", False):
-                    pending.append({
-                        "goal_id": gid,
-                        "unit": unit,
-                        "task": dict(task)
-                    })
-
-    return pending
+    from . import sqlite_mirror, task_index
+    if sqlite_mirror.ready("todos"):
+        return sqlite_mirror.pending_tasks(goal_id)
+    return task_index.pending_tasks(goal_id)
 
 
 def get_all_scheduled_tasks() -> list[dict]:
@@ -454,30 +1531,10 @@ def get_all_scheduled_tasks() -> list[dict]:
 
     Returns list of dicts with goal_id, unit, and task info.
     """
-    todos_dir = REPO_PATH / "_data" / "todos"
-    if not todos_dir.exists():
-        return []
-
-    scheduled = []
-
-    for goal_dir in todos_dir.iterdir():
-        if not goal_dir.is_dir():
-            continue
-        gid = goal_dir.name
-
-        for todo_file in goal_dir.glob("*.yml"):
-            unit = todo_file.stem
-            todo = get_unit_todo(gid, unit)
-
-            for task in todo.get("tasks", []):
-                if task.get("scheduled_for") and not task.get("done", False):
-                    scheduled.append({
-                        "goal_id": gid,
-                        "unit": unit,
-                        "task": dict(task)
-                    })
-
-    return scheduled
+    from . import sqlite_mirror, task_index
+    if sqlite_mirror.ready("todos"):
+        return sqlite_mirror.scheduled_tasks()
+    return task_index.scheduled_tasks()
 
 
 def find_task_by_event_id(event_id: str) -> dict | None:
@@ -486,28 +1543,10 @@ def find_task_by_event_id(event_id: str) -> dict | None:
 
     Returns dict with goal_id, unit, and task info, or None.
     """
-    todos_dir = REPO_PATH / "_data" / "todos"
-    if not todos_dir.exists():
-        return None
-
-    for goal_dir in todos_dir.iterdir():
-        if not goal_dir.is_dir():
-            continue
-        gid = goal_dir.name
-
-        for todo_file in goal_dir.glob("*.yml"):
-            unit = todo_file.stem
-            todo = get_unit_todo(gid, unit)
-
-            for task in todo.get("tasks", []):
-                if task.get("event_id") == event_id:
-                    return {
-                        "goal_id": gid,
-                        "unit": unit,
-                        "task": dict(task)
-                    }
-
-    return None
+    from . import sqlite_mirror, task_index
+    if sqlite_mirror.ready("todos"):
+        return sqlite_mirror.find_by_event_id(event_id)
+    return task_index.find_by_event_id(event_id)
 
 
 # --- Daily tracking ---
@@ -524,18 +1563,24 @@ def get_daily_entries() -> list:
 
 def save_daily_entries(entries: list) -> None:
     """Save daily entries."""
-    save_yaml(get_daily_path(), entries)
+    from . import daily_store
+    daily_store.save(entries)
 
 
 def get_daily_entry(date: str = None) -> dict | None:
     """Get a specific day's entry, or today's if no date specified."""
-    target_date = date or get_today()
-    entries = get_daily_entries()
+    from . import daily_store, sqlite_mirror
+    if sqlite_mirror.ready("daily"):
+        return sqlite_mirror.daily_entry(date or get_today())
+    return daily_store.get(date or get_today())
+
 
-    for entry in entries:
-        if to_date_str(entry.get("date")) == target_date:
-            return entry
-    return None
+def get_daily_entries_between(start: str, end: str) -> list:
+    """Get entries dated start..end (YYYY-MM-DD, inclusive), in date order."""
+    from . import daily_store, sqlite_mirror
+    if sqlite_mirror.ready("daily"):
+        return sqlite_mirror.daily_between(start, end)
+    return daily_store.between(start, end)
 
 
 # --- Memory storage ---
@@ -568,18 +1613,36 @@ def add_memory_entry(text: str, date: str = None) -> dict:
     Returns:
         The created entry
     """
-    entries = get_memory_entries()
     entry = {
         "date": date or get_today(),
         "text": text
     }
-    entries.append(entry)
-    save_memory_entries(entries)
+    # Appended as text; memory.yml is never re-parsed to add an entry
+    if not _queue_append(get_memory_path(), entry):
+        entries = get_memory_entries()
+        entries.append(entry)
+        save_memory_entries(entries)
     return entry
 
 
 def get_recent_memory(limit: int = 10) -> list:
     """Get the most recent memory entries."""
+    from . import sqlite_mirror, yaml_list
+
+    if limit > 0 and sqlite_mirror.ready("memory"):
+        return sqlite_mirror.recent_memory(limit)
+
+    path = get_memory_path()
+    txn = _active_txn.get()
+    if limit > 0 and path.exists() and not (txn and path in txn.dirty):
+        # Read just the tail of the file instead of parsing every entry
+        with _read_lock(path):
+            entries = yaml_list.read_tail(path, limit)
+        if entries is not None:
+            if txn and path in txn.appends:
+                entries = txn.with_appends(path, entries)[-limit:]
+            return entries
+
     entries = get_memory_entries()
     return entries[-limit:] if entries else []
 
@@ -595,38 +1658,5 @@ def update_daily_entry(date: str = None, **fields) -> dict:
     Returns:
         The updated entry
     """
-    target_date = date or get_today()
-    entries = get_daily_entries()
-
-    # Find existing entry
-    found_idx = None
-    for i, entry in enumerate(entries):
-        if to_date_str(entry.get("date")) == target_date:
-            found_idx = i
-            break
-
-    if found_idx is not None:
-        # Update existing
-        for key, value in fields.items():
-            if value is not None:
-                entries[found_idx][key] = value
-        result = entries[found_idx]
-    else:
-        # Create new entry with defaults
-        new_entry = {
-            "date": target_date,
-            "calendar": fields.get("calendar", False),
-            "fitness": fields.get("fitness", 0),
-            "hindi": fields.get("hindi", 0),
-        }
-        # Add optional fields if provided
-        if "mood" in fields:
-            new_entry["mood"] = fields["mood"]
-        if "notes" in fields:
-            new_entry["notes"] = fields["notes"]
-
-        entries.append(new_entry)
-        result = new_entry
-
-    save_daily_entries(entries)
-    return result
+    from . import daily_store
+    return daily_store.update(date or get_today(), fields)
@@ -0,0 +1,241 @@
+"""
+Persistent index of todo tasks under _data/todos.
+
+Replaces full-tree scans for pending/scheduled/event-id queries. The index is
+keyed by goal/unit/task_id with secondary indexes on event_id, done and
+scheduled_for, persisted as a JSON sidecar in ~/.goals-mcp/ and kept current
+in two ways:
+
+- Writers (save_unit_todo, update_todo_task) push the unit they just wrote.
+- Queries stat each todo file and reindex only files whose (mtime, size,
+  inode) changed, so hand edits and git pulls are still picked up.
+"""
+
+import copy
+import json
+import logging
+import threading
+from datetime import date as date_type
+from pathlib import Path
+
+from .storage import (
+    REPO_PATH, STATE_DIR, _atomic_write_text, _outside_transaction, _stat_key, get_unit_todo,
+)
+
+logger = logging.getLogger(__name__)
+
+INDEX_PATH = STATE_DIR / "task-index.json"
+INDEX_VERSION = 1
+
+_lock = threading.Lock()
+_loaded = False
+
+# unit key ("goal/unit") -> {"goal", "unit", "key", "tasks"}; insertion order
+# mirrors directory order so query results match the old scans.
+_units: dict[str, dict] = {}
+
+# Secondary indexes
+_by_task: dict[tuple[str, str, str], dict] = {}   # (goal, unit, task_id) -> task
+_by_event: dict[str, tuple[str, str, str]] = {}   # event_id -> (goal, unit, task_id)
+_pending: dict[str, list[int]] = {}               # unit key -> positions of not-done tasks
+_scheduled: dict[str, list[int]] = {}             # unit key -> positions of scheduled, not-done tasks
+
+
+def _todos_dir() -> Path:
+    return REPO_PATH / "_data" / "todos"
+
+
+def _plain(value):
+    """Convert ruamel containers/scalars into JSON-safe builtins."""
+    if isinstance(value, dict):
+        return {str(k): _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, float):
+        return float(value)
+    if isinstance(value, date_type):
+        return value.isoformat()
+    return str(value)
+
+
+def _drop_secondary(ukey: str) -> None:
+    entry = _units.get(ukey)
+    if not entry:
+        return
+    for task in entry["tasks"]:
+        tid = task.get("id")
+        ref = (entry["goal"], entry["unit"], tid)
+        if _by_task.get(ref) is task:
+            del _by_task[ref]
+        event_id = task.get("event_id")
+        if event_id and _by_event.get(event_id) == ref:
+            del _by_event[event_id]
+    _pending.pop(ukey, None)
+    _scheduled.pop(ukey, None)
+
+
+def _add_secondary(ukey: str) -> None:
+    entry = _units[ukey]
+    pending, scheduled = [], []
+    for pos, task in enumerate(entry["tasks"]):
+        ref = (entry["goal"], entry["unit"], task.get("id"))
+        _by_task.setdefault(ref, task)
+        if task.get("event_id"):
+            _by_event.setdefault(task["event_id"], ref)
+        if not task.get("done", False):
+            pending.append(pos)
+            if task.get("scheduled_for"):
+                scheduled.append(pos)
+    _pending[ukey] = pending
+    _scheduled[ukey] = scheduled
+
+
+def _set_unit(goal_id: str, unit: str, key: tuple | None, tasks: list) -> None:
+    ukey = f"{goal_id}/{unit}"
+    _drop_secondary(ukey)
+    _units[ukey] = {
+        "goal": goal_id,
+        "unit": unit,
+        "key": list(key) if key else None,
+        "tasks": [_plain(t) for t in tasks if isinstance(t, dict)],
+    }
+    _add_secondary(ukey)
+
+
+def _remove_unit(ukey: str) -> None:
+    _drop_secondary(ukey)
+    _units.pop(ukey, None)
+
+
+def _load_sidecar() -> None:
+    """Load the persisted index once per process (missing/stale files are ignored)."""
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+    if not INDEX_PATH.exists():
+        return
+    try:
+        data = json.loads(INDEX_PATH.read_text())
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable task index: {e}")
+        return
+    if data.get("version") != INDEX_VERSION or data.get("repo") != str(REPO_PATH):
+        return
+    for u in data.get("units", []):
+        ukey = f"{u['goal']}/{u['unit']}"
+        _units[ukey] = u
+        _add_secondary(ukey)
+
+
+def _save_sidecar() -> None:
+    data = {
+        "version": INDEX_VERSION,
+        "repo": str(REPO_PATH),
+        "units": list(_units.values()),
+    }
+    try:
+        _atomic_write_text(INDEX_PATH, json.dumps(data))
+    except OSError as e:
+        logger.warning(f"Could not persist task index: {e}")
+
+
+def _refresh() -> None:
+    """Reindex todo files whose stat key changed; drop units whose file is gone."""
+    _load_sidecar()
+
+    todos_dir = _todos_dir()
+    seen = []
+    changed = False
+
+    if todos_dir.is_dir():
+        for goal_dir in todos_dir.iterdir():
+            if not goal_dir.is_dir():
+                continue
+            for todo_file in goal_dir.glob("*.yml"):
+                goal_id, unit = goal_dir.name, todo_file.stem
+                ukey = f"{goal_id}/{unit}"
+                seen.append(ukey)
+                key = _stat_key(todo_file)
+                entry = _units.get(ukey)
+                if entry is not None and entry["key"] == (list(key) if key else None):
+                    continue
+                # Index what's on disk, without locking or pinning in the caller's transaction
+                with _outside_transaction():
+                    todo = get_unit_todo(goal_id, unit)
+                _set_unit(goal_id, unit, key, todo.get("tasks", []))
+                changed = True
+
+    seen_set = set(seen)
+    for ukey in [k for k in _units if k not in seen_set]:
+        _remove_unit(ukey)
+        changed = True
+
+    # Keep iteration order identical to a fresh directory walk
+    if list(_units) != seen:
+        reordered = {k: _units[k] for k in seen if k in _units}
+        _units.clear()
+        _units.update(reordered)
+
+    if changed:
+        _save_sidecar()
+
+
+def update_unit(goal_id: str, unit: str, todo_data: dict) -> None:
+    """Record a unit that was just written (called by storage after saving)."""
+    path = _todos_dir() / goal_id / f"{unit}.yml"
+    with _lock:
+        _load_sidecar()
+        tasks = todo_data.get("tasks", []) if isinstance(todo_data, dict) else []
+        _set_unit(goal_id, unit, _stat_key(path), tasks or [])
+        _save_sidecar()
+
+
+def _result(goal_id: str, unit: str, task: dict) -> dict:
+    return {"goal_id": goal_id, "unit": unit, "task": copy.deepcopy(task)}
+
+
+def pending_tasks(goal_id: str = None) -> list[dict]:
+    """All not-done tasks, optionally for one goal."""
+    with _lock:
+        _refresh()
+        results = []
+        for ukey, entry in _units.items():
+            if goal_id and entry["goal"] != goal_id:
+                continue
+            for pos in _pending.get(ukey, []):
+                results.append(_result(entry["goal"], entry["unit"], entry["tasks"][pos]))
+        return results
+
+
+def scheduled_tasks() -> list[dict]:
+    """All not-done tasks that have scheduled_for set."""
+    with _lock:
+        _refresh()
+        results = []
+        for ukey, entry in _units.items():
+            for pos in _scheduled.get(ukey, []):
+                results.append(_result(entry["goal"], entry["unit"], entry["tasks"][pos]))
+        return results
+
+
+def find_by_event_id(event_id: str) -> dict | None:
+    """Look up the task linked to a calendar event."""
+    with _lock:
+        _refresh()
+        ref = _by_event.get(event_id)
+        if not ref:
+            return None
+        return _result(ref[0], ref[1], _by_task[ref])
+
+
+def get_task(goal_id: str, unit: str, task_id: str) -> dict | None:
+    """Look up a single task by goal/unit/task_id."""
+    with _lock:
+        _refresh()
+        task = _by_task.get((goal_id, unit, task_id))
+        return copy.deepcopy(task) if task else None
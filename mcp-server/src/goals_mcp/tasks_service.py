@@ -7,6 +7,7 @@ from typing import Optional
 from googleapiclient.discovery import build
 from google.auth.transport.requests import Request
 
+from . import metrics
 from .calendar_service import TOKEN_PATH, CREDENTIALS_PATH
 
 
@@ -38,6 +39,7 @@ def get_tasks_service():
         return None
 
 
+@metrics.timed("google_tasks")
 def get_task_lists() -> list[dict]:
     """
     Get all task lists.
@@ -66,6 +68,7 @@ def get_default_task_list_id() -> Optional[str]:
     return "@default"
 
 
+@metrics.timed("google_tasks")
 def create_task(
     title: str,
     due_date: date = None,
@@ -118,6 +121,7 @@ def create_task(
         return {"success": False, "message": f"Failed to create task: {e}"}
 
 
+@metrics.timed("google_tasks")
 def complete_task(task_id: str, task_list_id: str = None) -> dict:
     """
     Mark a Google Task as complete.
@@ -150,6 +154,7 @@ def complete_task(task_id: str, task_list_id: str = None) -> dict:
         return {"success": False, "message": f"Failed to complete task: {e}"}
 
 
+@metrics.timed("google_tasks")
 def delete_task(task_id: str, task_list_id: str = None) -> dict:
     """
     Delete a Google Task.
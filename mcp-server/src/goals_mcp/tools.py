@@ -1,37 +1,97 @@
 """MCP tool definitions and handlers."""
 
+import inspect
 from datetime import datetime, timedelta
 
 from mcp.types import TextContent, Tool
 
 from .storage import (
-    get_goals_config, get_goal_logs, save_goal_logs,
+    get_goals_config, append_goal_log, transaction,
     get_unit_todo, save_unit_todo, update_todo_task, get_all_pending_tasks,
     get_all_scheduled_tasks, find_task_by_event_id,
-    get_today, get_daily_entry, update_daily_entry,
+    get_today, get_daily_entry, update_daily_entry, TransactionConflict,
     get_memory_entries, save_memory_entries, add_memory_entry, get_recent_memory,
-    get_schedule, get_current_progress, update_current_goal, get_current_week, get_effective_week
+    get_current_progress, update_current_goal, get_current_week, get_effective_week
 )
 from .goals import compute_todos, resolve_goal_id
 from . import calendar_service
+from . import dispatch
+from . import metrics
+from . import schedule_index
 from . import wger_service
 
 
-def get_tool_definitions(urgent_summary: str = "") -> list[Tool]:
-    """Generate tool definitions with dynamic descriptions."""
-
-    # Dynamic check_in description with current urgent status
+def _check_in_description(urgent_summary: str) -> str:
+    """check_in's description, carrying the current urgent status."""
     if urgent_summary and urgent_summary != "All goals on track.":
-        check_in_desc = f"""⚠️ STOP - READ THIS FIRST ⚠️
+        return f"""⚠️ STOP - READ THIS FIRST ⚠️
 {urgent_summary}
 You MUST say this to the user in your FIRST sentence, BEFORE invoking any skill (debugging, brainstorming, etc).
 Also re-call when 30+ min elapsed: long-running scripts, logs with timestamps, user mentions time.
 Example: "Quick note: [overdue items]. Now, about your request..."
 This is non-negotiable accountability."""
-    else:
-        check_in_desc = """Check what goals need attention today.
+    return """Check what goals need attention today.
 Call at: (1) conversation start, (2) when 30+ min elapsed (scripts, logs, timestamps, user mentions)."""
 
+
+# Built once; only check_in's description changes between calls
+_tool_definitions: list[Tool] | None = None
+_definitions_for: tuple[str, list[Tool]] | None = None    # (summary, list) of the last call
+
+
+def get_tool_definitions(urgent_summary: str = "") -> list[Tool]:
+    """Generate tool definitions with dynamic descriptions."""
+    global _tool_definitions, _definitions_for
+    last = _definitions_for
+    if last is not None and last[0] == urgent_summary:
+        return list(last[1])
+    if _tool_definitions is None:
+        _tool_definitions = _build_tool_definitions(_check_in_description(""))
+    check_in, *rest = _tool_definitions
+    check_in = check_in.model_copy(update={"description": _check_in_description(urgent_summary)})
+    _definitions_for = (urgent_summary, [check_in, *rest])
+    return [check_in, *rest]
+
+
+def _batch_tool(single: Tool, name: str, key: str, description: str) -> Tool:
+    """A tool taking an array of single's arguments."""
+    return Tool(
+        name=name,
+        description=description,
+        inputSchema={
+            "type": "object",
+            "properties": {
+                key: {
+                    "type": "array",
+                    "minItems": 1,
+                    "items": single.inputSchema,
+                    "description": f"Arguments for each {single.name} call, applied in order"
+                }
+            },
+            "required": [key]
+        }
+    )
+
+
+def _build_tool_definitions(check_in_desc: str) -> list[Tool]:
+    tools = _single_tool_definitions(check_in_desc)
+    by_name = {tool.name: tool for tool in tools}
+    return tools + [
+        _batch_tool(by_name["done"], "done_many", "items",
+                    "Like done, for several tasks/durations at once (e.g. closing out a week). "
+                    "Returns a result per item. An item that can't apply (unknown goal, task not "
+                    "found) says why and the rest still apply; if one fails with an error, none "
+                    "of the batch is saved."),
+        _batch_tool(by_name["plan"], "plan_many", "tasks",
+                    "Like plan, for several tasks at once (e.g. planning a week). "
+                    "Each todo file is read and written once. Returns a result per task."),
+        _batch_tool(by_name["edit"], "edit_many", "edits",
+                    "Like edit, for several tasks at once. "
+                    "Each todo file is read and written once. Returns a result per edit."),
+    ]
+
+
+def _single_tool_definitions(check_in_desc: str) -> list[Tool]:
     return [
         # ==================== CHECK-IN ====================
         Tool(
@@ -317,6 +377,26 @@ Use to update task properties, add notes, or delete tasks.
             }
         ),
 
+        # ==================== SYNC_CALENDAR ====================
+        Tool(
+            name="sync_calendar",
+            description="Compare scheduled todo tasks with their calendar events. Shows tasks whose event was moved or deleted; with apply=true, updates todo.yml to match the calendar.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "goal": {
+                        "type": "string",
+                        "description": "Only check this goal's tasks (default: all)"
+                    },
+                    "apply": {
+                        "type": "boolean",
+                        "description": "Update the todos (default: false, just report)"
+                    }
+                },
+                "required": []
+            }
+        ),
+
         # ==================== MEMORY_CONDENSE ====================
         Tool(
             name="memory_condense",
@@ -748,6 +828,12 @@ Use to review eating patterns or check daily intake.""",
 
 def handle_check_in() -> list[TextContent]:
     """Handle check_in tool."""
+    # Start the calendar reads first; they're collected below against one deadline
+    calendar_reads = dispatch.FanOut()
+    calendar_reads.submit("upcoming events", calendar_service.get_upcoming_events, 4)
+    calendar_reads.submit("missed events", calendar_service.get_missed_scheduled, 24)
+    calendar_reads.submit("calendar drift", calendar_service.diff_scheduled_tasks, get_all_scheduled_tasks())
+
     config = get_goals_config()
     goal_todos = compute_todos(config)
     pending_tasks = get_all_pending_tasks()
@@ -758,6 +844,9 @@ def handle_check_in() -> list[TextContent]:
     # Get recent memory entries
     recent_memory = get_recent_memory(limit=5)
 
+    # Last local read: nothing below touches storage while waiting on the calendar
+    current_week_info = get_current_week()
+
     # Get current time for display
     now = datetime.now()
     time_str = now.strftime("%I:%M%p").lower().lstrip("0")
@@ -765,8 +854,6 @@ def handle_check_in() -> list[TextContent]:
     lines = [f"Goals Check-in ({get_today()}, {time_str})", ""]
 
     # Show current week for time-based goals
-    schedule = get_schedule()
-    current_week_info = get_current_week(schedule)
     if current_week_info:
         week_num = current_week_info.get("number", "?")
         week_start = current_week_info.get("start", "")
@@ -794,8 +881,11 @@ def handle_check_in() -> list[TextContent]:
         lines.append("")
 
     # Show upcoming calendar events (next 4 hours)
-    upcoming_events = calendar_service.get_upcoming_events(hours_ahead=4)
-    if upcoming_events:
+    upcoming_events = calendar_reads.result("upcoming events")
+    if upcoming_events is dispatch.TIMED_OUT:
+        lines.append("**Coming up:** unavailable (timed out)")
+        lines.append("")
+    elif upcoming_events:
         lines.append("**Coming up:**")
         for e in upcoming_events:
             prefix = "[Goal] " if e["is_goal"] else ""
@@ -840,50 +930,31 @@ def handle_check_in() -> list[TextContent]:
         lines.append("")
 
     # Show missed scheduled events (past 24 hours)
-    missed = calendar_service.get_missed_scheduled(hours_back=24)
-    if missed:
+    missed = calendar_reads.result("missed events")
+    if missed is dispatch.TIMED_OUT:
+        lines.append("**Missed scheduled:** unavailable (timed out)")
+        lines.append("")
+    elif missed:
         lines.append("**Missed scheduled:**")
         for m in missed:
             lines.append(f"- {m['title']} was scheduled for {m['date']} {m['time']} - not logged")
         lines.append("")
 
     # Detect drift between todo.yml scheduled tasks and calendar
-    scheduled_tasks = get_all_scheduled_tasks()
-    drift_items = []
-    for st in scheduled_tasks:
-        task = st["task"]
-        event_id = task.get("event_id")
-        scheduled_for = task.get("scheduled_for")
-
-        if not event_id or not scheduled_for:
-            continue
-
-        event_info = calendar_service.get_event_info(event_id)
-        if event_info is None:
-            continue  # Not authenticated
-
-        task_name = task.get("name", task.get("id"))
-
-        if not event_info.get("exists"):
-            drift_items.append(f"- {task_name}: calendar event deleted (was {scheduled_for[:16]})")
-        elif event_info.get("start"):
-            cal_start = event_info["start"]
-            todo_time = datetime.fromisoformat(scheduled_for)
-            # Check if times differ by more than 1 minute
-            if abs((cal_start - todo_time).total_seconds()) > 60:
-                cal_time_str = cal_start.strftime("%I:%M%p").lower().lstrip("0")
-                drift_items.append(f"- {task_name}: moved to {cal_time_str} in calendar (todo says {scheduled_for[:16]})")
-
-    if drift_items:
+    drift = calendar_reads.result("calendar drift")
+    if drift is dispatch.TIMED_OUT:
+        lines.append("**Calendar drift:** unavailable (timed out)")
+        lines.append("")
+    elif drift:
         lines.append("**Calendar drift detected:**")
-        lines.extend(drift_items)
-        lines.append("(Use reschedule/unschedule to sync)")
+        lines.extend(_drift_line(d) for d in drift)
+        lines.append("(Use sync_calendar to update todos, or reschedule/unschedule)")
         lines.append("")
 
     # Add pending tasks from todos
     # Filter to only show current week (or earlier) for time-weekly goals
     current_week_num = current_week_info.get("number") if current_week_info else None
-    time_weekly_goals = {"fitness", "calendar", "work-boundaries"}
+    time_weekly_goals = config.goals_of_kind("time-weekly")
 
     def is_current_or_past_week(goal_id: str, unit: str) -> bool:
         """Check if task is from current week or earlier."""
@@ -922,6 +993,17 @@ def handle_check_in() -> list[TextContent]:
     return [TextContent(type="text", text="\n".join(lines))]
 
 
+def _drift_line(drift: dict) -> str:
+    """One calendar_service.diff_scheduled_tasks() entry as a list item."""
+    was = drift["scheduled_for"][:16]
+    if drift["status"] == "unknown":
+        return f"- {drift['name']}: couldn't check calendar event ({drift['error']})"
+    if drift["status"] == "deleted":
+        return f"- {drift['name']}: calendar event deleted (was {was})"
+    cal_time_str = drift["calendar_start"].strftime("%I:%M%p").lower().lstrip("0")
+    return f"- {drift['name']}: moved to {cal_time_str} in calendar (todo says {was})"
+
+
 def handle_done(arguments: dict) -> list[TextContent]:
     """
     Handle done tool - unified completion action with cascading updates.
@@ -931,6 +1013,29 @@ def handle_done(arguments: dict) -> list[TextContent]:
     2. If duration provided: log to goal logs
     3. Sync to daily.yml based on goal type
     """
+    goals = get_goals_config().get("goals", {})
+    return [TextContent(type="text", text=_done_one(goals, arguments))]
+
+
+def handle_done_many(arguments: dict) -> list[TextContent]:
+    """
+    Handle done_many tool - several done calls in one transaction.
+
+    Invalid items report their error and the others still apply. An item
+    that raises discards the whole batch (todos, logs and daily), but calendar
+    events already marked complete by earlier items stay that way.
+    """
+    items = arguments.get("items") or []
+    if not items:
+        return [TextContent(type="text", text="items is required")]
+
+    goals = get_goals_config().get("goals", {})
+    results = [_done_one(goals, item) for item in items]
+    return [TextContent(type="text", text=_numbered(results))]
+
+
+def _done_one(goals: dict, arguments: dict) -> str:
+    """Apply one done call; returns its result message."""
     goal_input = arguments.get("goal", "")
     task_id = arguments.get("task")
     duration = arguments.get("duration")
@@ -938,27 +1043,23 @@ def handle_done(arguments: dict) -> list[TextContent]:
     notes = arguments.get("notes")
 
     if not goal_input:
-        return [TextContent(type="text", text="goal is required")]
+        return "goal is required"
 
     # Resolve goal ID
-    config = get_goals_config()
-    goals = config.get("goals", {})
     goal_id = resolve_goal_id(goals, goal_input)
 
     if not goal_id:
         available = ", ".join(goals.keys())
-        return [TextContent(type="text", text=f"Unknown goal: '{goal_input}'. Available: {available}")]
+        return f"Unknown goal: '{goal_input}'. Available: {available}"
 
     # Get current week for this date
-    schedule = get_schedule()
-    week_info = get_current_week(schedule)
+    week_info = get_current_week()
     week_num = week_info.get("number", 1)
 
     # Check if the date falls in a different week
-    for week in schedule.get("weeks", []):
-        if week["start"] <= date <= week["end"]:
-            week_num = week["number"]
-            break
+    week = schedule_index.week_for(date)
+    if week:
+        week_num = week["number"]
 
     unit = f"week-{week_num}"
 
@@ -984,37 +1085,15 @@ def handle_done(arguments: dict) -> list[TextContent]:
                 if cal_result.get("success"):
                     result_lines.append("Calendar event marked complete")
         else:
-            return [TextContent(type="text", text=f"Task '{task_id}' not found in {goal_id}/{unit}")]
+            return f"Task '{task_id}' not found in {goal_id}/{unit}"
 
     # Log duration if provided
     if duration:
-        logs = get_goal_logs(goal_id)
-
-        # Find or create day entry
-        day_entry = None
-        for d in logs:
-            if d.get("date") == date:
-                day_entry = d
-                break
-
-        if not day_entry:
-            day_entry = {"date": date, "entries": []}
-            logs.append(day_entry)
-
-        if "entries" not in day_entry:
-            day_entry["entries"] = []
-
         entry = {"value": duration}
         if notes:
             entry["notes"] = notes
 
-        day_entry["entries"].append(entry)
-
-        # Update total
-        total = sum(e.get("value", 0) for e in day_entry["entries"] if isinstance(e.get("value"), (int, float)))
-        day_entry["total"] = total
-
-        save_goal_logs(goal_id, logs)
+        append_goal_log(goal_id, date, entry)
         result_lines.append(f"Logged {duration} min to {goal_id}")
 
     # Sync to daily.yml based on goal type
@@ -1041,9 +1120,14 @@ def handle_done(arguments: dict) -> list[TextContent]:
         result_lines.append(f"Daily updated: {updates_str}")
 
     if not result_lines:
-        return [TextContent(type="text", text="No action taken. Provide task and/or duration.")]
+        return "No action taken. Provide task and/or duration."
 
-    return [TextContent(type="text", text="\n".join(result_lines))]
+    return "\n".join(result_lines)
+
+
+def _numbered(results: list[str]) -> str:
+    """Per-item results of a batch tool, in request order."""
+    return "\n".join(f"{n}. {r}" for n, r in enumerate(results, 1))
 
 
 def handle_status(arguments: dict) -> list[TextContent]:
@@ -1065,6 +1149,10 @@ def handle_status(arguments: dict) -> list[TextContent]:
             available = ", ".join(goals.keys())
             return [TextContent(type="text", text=f"Unknown goal. Available: {available}")]
 
+    # Start the calendar read now, collect it when rendering (bounded by its deadline)
+    calendar_reads = dispatch.FanOut()
+    calendar_reads.submit("upcoming events", calendar_service.get_upcoming_events, 4)
+
     # Get current time and day info
     now = datetime.now()
     time_str = now.strftime("%I:%M%p").lower().lstrip("0")
@@ -1076,15 +1164,13 @@ def handle_status(arguments: dict) -> list[TextContent]:
     day_abbrev = days[date_obj.weekday()]
 
     # Get current week
-    schedule = get_schedule()
-    week_info = get_current_week(schedule)
+    week_info = get_current_week()
     week_num = week_info.get("number", 1) if week_info else 1
 
     # Check if date falls in a different week
-    for week in schedule.get("weeks", []):
-        if week["start"] <= date <= week["end"]:
-            week_num = week["number"]
-            break
+    week = schedule_index.week_for(date)
+    if week:
+        week_num = week["number"]
 
     lines = [f"Status ({date}, {time_str})", ""]
 
@@ -1118,7 +1204,7 @@ def handle_status(arguments: dict) -> list[TextContent]:
         pending_tasks = [pt for pt in pending_tasks if pt["goal_id"] == goal_filter]
 
     # Filter to current week or earlier for time-weekly goals
-    time_weekly_goals = {"fitness", "calendar", "work-boundaries"}
+    time_weekly_goals = config.goals_of_kind("time-weekly")
 
     def is_current_or_past_week(goal_id: str, task_unit: str) -> bool:
         if goal_id not in time_weekly_goals:
@@ -1133,6 +1219,9 @@ def handle_status(arguments: dict) -> list[TextContent]:
 
     pending_tasks = [pt for pt in pending_tasks if is_current_or_past_week(pt["goal_id"], pt["unit"])]
 
+    # Last local read: nothing below touches storage while waiting on the calendar
+    recent_memory = get_recent_memory(limit=3)
+
     # Separate today's tasks (day-prefixed) from others
     today_tasks = []
     other_tasks = []
@@ -1186,8 +1275,11 @@ def handle_status(arguments: dict) -> list[TextContent]:
         lines.append("")
 
     # Upcoming calendar events
-    upcoming_events = calendar_service.get_upcoming_events(hours_ahead=4)
-    if upcoming_events:
+    upcoming_events = calendar_reads.result("upcoming events")
+    if upcoming_events is dispatch.TIMED_OUT:
+        lines.append("**Coming Up:** unavailable (timed out)")
+        lines.append("")
+    elif upcoming_events:
         lines.append("**Coming Up:**")
         for e in upcoming_events:
             prefix = "[Goal] " if e["is_goal"] else ""
@@ -1195,7 +1287,6 @@ def handle_status(arguments: dict) -> list[TextContent]:
         lines.append("")
 
     # Recent memory
-    recent_memory = get_recent_memory(limit=3)
     if recent_memory:
         lines.append("**Recent Memory:**")
         for entry in recent_memory:
@@ -1219,50 +1310,87 @@ def handle_remember(arguments: dict) -> list[TextContent]:
 
 def handle_plan(arguments: dict) -> list[TextContent]:
     """Handle plan tool - add a single task to a goal's todo list."""
-    goal_input = arguments.get("goal", "")
-    task_id = arguments.get("task", "")
-    name = arguments.get("name", "")
-    unit = arguments.get("unit")
-    description = arguments.get("description")
+    return [TextContent(type="text", text=_plan_tasks([arguments])[0])]
 
-    if not goal_input or not task_id or not name:
-        return [TextContent(type="text", text="goal, task, and name are required")]
 
-    # Resolve goal
-    config = get_goals_config()
-    goals = config.get("goals", {})
-    goal_id = resolve_goal_id(goals, goal_input)
+def handle_plan_many(arguments: dict) -> list[TextContent]:
+    """Handle plan_many tool - add several tasks, one read and write per todo file."""
+    items = arguments.get("tasks") or []
+    if not items:
+        return [TextContent(type="text", text="tasks is required")]
+    return [TextContent(type="text", text=_numbered(_plan_tasks(items)))]
 
-    if not goal_id:
-        available = ", ".join(goals.keys())
-        return [TextContent(type="text", text=f"Unknown goal: '{goal_input}'. Available: {available}")]
 
-    # Default to current week if no unit specified
-    if not unit:
-        schedule = get_schedule()
-        week_info = get_current_week(schedule)
-        week_num = week_info.get("number", 1) if week_info else 1
-        unit = f"week-{week_num}"
+def _current_week_unit() -> str:
+    week_info = get_current_week()
+    week_num = week_info.get("number", 1) if week_info else 1
+    return f"week-{week_num}"
 
-    # Load existing todo or create new
-    todo = get_unit_todo(goal_id, unit)
-    tasks = todo.get("tasks", [])
 
-    # Check if task already exists
-    for t in tasks:
-        if t.get("id") == task_id:
-            return [TextContent(type="text", text=f"Task '{task_id}' already exists in {goal_id}/{unit}")]
+def _group_by_unit(items: list[dict], required: tuple, missing: str, results: list) -> dict:
+    """
+    Resolve each item's goal and unit (default: current week) and group item
+    positions by (goal_id, unit). Items missing a required key or naming an
+    unknown goal get their error in results instead.
+    """
+    goals = get_goals_config().get("goals", {})
+    groups = {}
+    default_unit = None
+    for pos, item in enumerate(items):
+        if not all(item.get(key) for key in required):
+            results[pos] = missing
+            continue
+
+        goal_id = resolve_goal_id(goals, item["goal"])
+        if not goal_id:
+            available = ", ".join(goals.keys())
+            results[pos] = f"Unknown goal: '{item['goal']}'. Available: {available}"
+            continue
+
+        unit = item.get("unit")
+        if not unit:
+            if default_unit is None:
+                default_unit = _current_week_unit()
+            unit = default_unit
+        groups.setdefault((goal_id, unit), []).append(pos)
+    return groups
+
+
+def _plan_tasks(items: list[dict]) -> list[str]:
+    """Add tasks (plan arguments); returns a result message per item."""
+    results = [None] * len(items)
+    groups = _group_by_unit(items, ("goal", "task", "name"), "goal, task, and name are required", results)
+    for (goal_id, unit), positions in groups.items():
+        # Load existing todo or create new
+        todo = get_unit_todo(goal_id, unit)
+        tasks = todo.get("tasks", [])
+        existing = {t.get("id") for t in tasks}
+        changed = False
 
-    # Add new task
-    new_task = {"id": task_id, "name": name, "done": False}
-    if description:
-        new_task["description"] = description
+        for pos in positions:
+            item = items[pos]
+            task_id = item["task"]
 
-    tasks.append(new_task)
-    todo["tasks"] = tasks
-    save_unit_todo(goal_id, unit, todo)
+            # Check if task already exists
+            if task_id in existing:
+                results[pos] = f"Task '{task_id}' already exists in {goal_id}/{unit}"
+                continue
 
-    return [TextContent(type="text", text=f"Added task '{task_id}' to {goal_id}/{unit}")]
+            # Add new task
+            new_task = {"id": task_id, "name": item["name"], "done": False}
+            if item.get("description"):
+                new_task["description"] = item["description"]
+
+            tasks.append(new_task)
+            existing.add(task_id)
+            changed = True
+            results[pos] = f"Added task '{task_id}' to {goal_id}/{unit}"
+
+        if changed:
+            todo["tasks"] = tasks
+            save_unit_todo(goal_id, unit, todo)
+
+    return results
 
 
 def handle_schedule(arguments: dict) -> list[TextContent]:
@@ -1332,8 +1460,7 @@ def handle_schedule(arguments: dict) -> list[TextContent]:
 
     # If task specified, link to todo
     if goal_id and task_id:
-        schedule = get_schedule()
-        week_info = get_current_week(schedule)
+        week_info = get_current_week()
         week_num = week_info.get("number", 1) if week_info else 1
         unit = f"week-{week_num}"
 
@@ -1355,74 +1482,73 @@ def handle_schedule(arguments: dict) -> list[TextContent]:
 
 def handle_edit(arguments: dict) -> list[TextContent]:
     """Handle edit tool - modify an existing goal task."""
-    goal_input = arguments.get("goal", "")
-    task_id = arguments.get("task", "")
+    return [TextContent(type="text", text=_edit_tasks([arguments])[0])]
 
-    if not goal_input or not task_id:
-        return [TextContent(type="text", text="goal and task are required")]
 
-    # Resolve goal
-    config = get_goals_config()
-    goals = config.get("goals", {})
-    goal_id = resolve_goal_id(goals, goal_input)
+def handle_edit_many(arguments: dict) -> list[TextContent]:
+    """Handle edit_many tool - several edits, one read and write per todo file."""
+    items = arguments.get("edits") or []
+    if not items:
+        return [TextContent(type="text", text="edits is required")]
+    return [TextContent(type="text", text=_numbered(_edit_tasks(items)))]
 
-    if not goal_id:
-        available = ", ".join(goals.keys())
-        return [TextContent(type="text", text=f"Unknown goal: '{goal_input}'. Available: {available}")]
-
-    # Get unit (default to current week)
-    unit = arguments.get("unit")
-    if not unit:
-        schedule = get_schedule()
-        week_info = get_current_week(schedule)
-        week_num = week_info.get("number", 1) if week_info else 1
-        unit = f"week-{week_num}"
 
-    # Handle delete
-    if arguments.get("delete"):
+def _edit_tasks(items: list[dict]) -> list[str]:
+    """Apply edits (edit arguments) in order; returns a result message per item."""
+    results = [None] * len(items)
+    groups = _group_by_unit(items, ("goal", "task"), "goal and task are required", results)
+    for (goal_id, unit), positions in groups.items():
         todo = get_unit_todo(goal_id, unit)
         tasks = todo.get("tasks", [])
-        original_len = len(tasks)
-        tasks = [t for t in tasks if t.get("id") != task_id]
-
-        if len(tasks) == original_len:
-            return [TextContent(type="text", text=f"Task '{task_id}' not found in {goal_id}/{unit}")]
-
-        todo["tasks"] = tasks
-        save_unit_todo(goal_id, unit, todo)
-        return [TextContent(type="text", text=f"Deleted task '{task_id}' from {goal_id}/{unit}")]
-
-    # Handle updates
-    updates = {}
-    if "name" in arguments:
-        updates["name"] = arguments["name"]
-    if "notes" in arguments:
-        updates["notes"] = arguments["notes"]
-    if "done" in arguments:
-        updates["done"] = arguments["done"]
-
-    if not updates:
-        return [TextContent(type="text", text="No updates specified. Provide name, notes, done, or delete.")]
-
-    # Apply updates
-    todo = get_unit_todo(goal_id, unit)
-    tasks = todo.get("tasks", [])
-    found = False
-
-    for t in tasks:
-        if t.get("id") == task_id:
-            t.update(updates)
-            found = True
-            break
+        changed = False
+
+        for pos in positions:
+            item = items[pos]
+            task_id = item["task"]
+
+            # Handle delete
+            if item.get("delete"):
+                original_len = len(tasks)
+                tasks = [t for t in tasks if t.get("id") != task_id]
+
+                if len(tasks) == original_len:
+                    results[pos] = f"Task '{task_id}' not found in {goal_id}/{unit}"
+                else:
+                    changed = True
+                    results[pos] = f"Deleted task '{task_id}' from {goal_id}/{unit}"
+                continue
+
+            # Handle updates
+            updates = {}
+            if "name" in item:
+                updates["name"] = item["name"]
+            if "notes" in item:
+                updates["notes"] = item["notes"]
+            if "done" in item:
+                updates["done"] = item["done"]
+
+            if not updates:
+                results[pos] = "No updates specified. Provide name, notes, done, or delete."
+                continue
+
+            # Apply updates
+            for t in tasks:
+                if t.get("id") == task_id:
+                    t.update(updates)
+                    break
+            else:
+                results[pos] = f"Task '{task_id}' not found in {goal_id}/{unit}"
+                continue
 
-    if not found:
-        return [TextContent(type="text", text=f"Task '{task_id}' not found in {goal_id}/{unit}")]
+            changed = True
+            updates_str = ", ".join(f"{k}={v}" for k, v in updates.items())
+            results[pos] = f"Updated {task_id}: {updates_str}"
 
-    todo["tasks"] = tasks
-    save_unit_todo(goal_id, unit, todo)
+        if changed:
+            todo["tasks"] = tasks
+            save_unit_todo(goal_id, unit, todo)
 
-    updates_str = ", ".join(f"{k}={v}" for k, v in updates.items())
-    return [TextContent(type="text", text=f"Updated {task_id}: {updates_str}")]
+    return results
 
 
 def handle_reschedule_event(arguments: dict) -> list[TextContent]:
@@ -1488,6 +1614,51 @@ def handle_delete_event(arguments: dict) -> list[TextContent]:
     return [TextContent(type="text", text=message)]
 
 
+def handle_sync_calendar(arguments: dict) -> list[TextContent]:
+    """Handle sync_calendar tool - bring scheduled todos in line with the calendar."""
+    goal_filter = arguments.get("goal")
+    apply = arguments.get("apply", False)
+
+    scheduled_tasks = get_all_scheduled_tasks()
+    if goal_filter:
+        goals = get_goals_config().get("goals", {})
+        goal_id = resolve_goal_id(goals, goal_filter)
+        if not goal_id:
+            available = ", ".join(goals.keys())
+            return [TextContent(type="text", text=f"Unknown goal: '{goal_filter}'. Available: {available}")]
+        scheduled_tasks = [st for st in scheduled_tasks if st["goal_id"] == goal_id]
+
+    drift = calendar_service.diff_scheduled_tasks(scheduled_tasks)
+    if drift is None:
+        return [TextContent(type="text", text="Not authenticated. Run: goals-mcp auth")]
+    if not drift:
+        return [TextContent(type="text", text="Scheduled todos match the calendar.")]
+
+    if not apply:
+        lines = ["**Calendar drift:**"]
+        lines.extend(_drift_line(d) for d in drift)
+        lines.append("(Call again with apply=true to update the todos)")
+        return [TextContent(type="text", text="\n".join(lines))]
+
+    lines = ["**Synced from calendar:**"]
+    for d in drift:
+        ref = f"{d['goal_id']}/{d['unit']}/{d['task_id']}"
+        if d["status"] == "unknown":
+            # A failed lookup says nothing about the event; leave the todo alone
+            lines.append(f"- {ref}: skipped (couldn't check calendar event: {d['error']})")
+            continue
+        if d["status"] == "deleted":
+            updated = update_todo_task(d["goal_id"], d["unit"], d["task_id"], clear_schedule=True)
+            action = "cleared schedule (event deleted)"
+        else:
+            updated = update_todo_task(d["goal_id"], d["unit"], d["task_id"],
+                                       scheduled_for=d["calendar_start"].isoformat())
+            action = f"moved to {d['calendar_start'].isoformat()[:16]}"
+        lines.append(f"- {ref}: {action}" if updated else f"- {ref}: task not found")
+
+    return [TextContent(type="text", text="\n".join(lines))]
+
+
 def handle_list_calendar_events(arguments: dict) -> list[TextContent]:
     """Handle list_calendar_events tool - show calendar events."""
     hours = arguments.get("hours", 24)
@@ -1561,21 +1732,11 @@ def handle_manage_progress(arguments: dict) -> list[TextContent]:
         return [TextContent(type="text", text="action is required")]
 
     # Normalize goal aliases
-    goal_map = {
-        "hindi": "hindi",
-        "fitness": "fitness",
-        "gym": "fitness",
-        "calendar": "calendar",
-        "work-boundaries": "work-boundaries",
-        "work": "work-boundaries",
-        "spend-less": "spend-less",
-        "spending": "spend-less",
-        "trading": "trading",
-    }
-    goal_id = goal_map.get(goal, goal)
+    config = get_goals_config()
+    goal_id = resolve_goal_id(config.get("goals", {}), goal) or goal
+    time_weekly = config.kinds.get(goal_id) == "time-weekly"
 
     current = get_current_progress()
-    schedule = get_schedule()
 
     # Handle VIEW action
     if action == "view":
@@ -1595,10 +1756,10 @@ def handle_manage_progress(arguments: dict) -> list[TextContent]:
             if completed:
                 lines.append(f"  {', '.join(completed)}")
 
-        elif goal_id in ("fitness", "calendar", "work-boundaries"):
+        elif time_weekly:
             goal_data = current.get(goal_id, {})
-            current_week_info = get_current_week(schedule)
-            effective = get_effective_week(goal_id, schedule, current)
+            current_week_info = get_current_week()
+            effective = get_effective_week(goal_id)
 
             lines.append(f"**Schedule week:** {current_week_info.get('number', '?')}")
             lines.append(f"**Effective week:** {effective.get('number', '?')}")
@@ -1750,7 +1911,7 @@ def handle_manage_progress(arguments: dict) -> list[TextContent]:
 
     # Handle OFFSET action (time-based goals)
     if action == "offset":
-        if goal_id not in ("fitness", "calendar", "work-boundaries", "spend-less", "trading"):
+        if not time_weekly and goal_id not in ("spend-less", "trading"):
             return [TextContent(type="text", text=f"'offset' action not applicable to {goal_id}")]
 
         weeks = arguments.get("weeks")
@@ -1759,7 +1920,7 @@ def handle_manage_progress(arguments: dict) -> list[TextContent]:
         if weeks is None:
             return [TextContent(type="text", text="weeks is required for offset action")]
 
-        if goal_id in ("fitness", "calendar", "work-boundaries"):
+        if time_weekly:
             updates = {"offset_weeks": int(weeks)}
             if reason:
                 updates["adjustment_reason"] = reason
@@ -1767,7 +1928,7 @@ def handle_manage_progress(arguments: dict) -> list[TextContent]:
             updates["override_week"] = None
             update_current_goal(goal_id, updates)
 
-            effective = get_effective_week(goal_id, schedule)
+            effective = get_effective_week(goal_id)
             return [TextContent(type="text", text=f"Offset set: {weeks} weeks\nEffective week: {effective.get('number', '?')}" + (f"\nReason: {reason}" if reason else ""))]
 
         elif goal_id == "spend-less":
@@ -1780,13 +1941,13 @@ def handle_manage_progress(arguments: dict) -> list[TextContent]:
 
     # Handle OVERRIDE action (time-based goals)
     if action == "override":
-        if goal_id not in ("fitness", "calendar", "work-boundaries", "spend-less"):
+        if not time_weekly and goal_id != "spend-less":
             return [TextContent(type="text", text=f"'override' action not applicable to {goal_id}")]
 
         week = arguments.get("week")
         reason = arguments.get("reason", "")
 
-        if goal_id in ("fitness", "calendar", "work-boundaries"):
+        if time_weekly:
             if week is None:
                 return [TextContent(type="text", text="week is required for override action")]
 
@@ -1808,14 +1969,14 @@ def handle_manage_progress(arguments: dict) -> list[TextContent]:
 
     # Handle CLEAR action
     if action == "clear":
-        if goal_id in ("fitness", "calendar", "work-boundaries"):
+        if time_weekly:
             update_current_goal(goal_id, {
                 "offset_weeks": 0,
                 "override_week": None,
                 "paused_until": None,
                 "adjustment_reason": None
             })
-            current_week_info = get_current_week(schedule)
+            current_week_info = get_current_week()
             return [TextContent(type="text", text=f"Cleared all adjustments for {goal_id}\nNow on schedule week: {current_week_info.get('number', '?')}")]
 
         elif goal_id == "spend-less":
@@ -2547,60 +2708,78 @@ def handle_get_nutrition_summary(arguments: dict) -> list[TextContent]:
     return [TextContent(type="text", text="\n".join(lines))]
 
 
-async def handle_tool(name: str, arguments: dict) -> list[TextContent]:
-    """Route tool calls to handlers."""
+# Tool name -> (handler, integration). Blocking handlers run in the dispatch
+# pool under their integration's limit, each in its own transaction.
+# Coroutine handlers run on the event loop, outside any transaction: they
+# should hand blocking work to dispatch.run().
+TOOL_HANDLERS = {
     # Core tools
-    if name == "check_in":
-        return handle_check_in()
-    elif name == "done":
-        return handle_done(arguments)
-    elif name == "status":
-        return handle_status(arguments)
-    elif name == "remember":
-        return handle_remember(arguments)
-    elif name == "plan":
-        return handle_plan(arguments)
-    elif name == "schedule":
-        return handle_schedule(arguments)
-    elif name == "edit":
-        return handle_edit(arguments)
+    "check_in": (lambda arguments: handle_check_in(), "calendar"),
+    "done": (handle_done, "calendar"),
+    "done_many": (handle_done_many, "calendar"),
+    "status": (handle_status, "calendar"),
+    "remember": (handle_remember, "local"),
+    "plan": (handle_plan, "local"),
+    "plan_many": (handle_plan_many, "local"),
+    "schedule": (handle_schedule, "calendar"),
+    "edit": (handle_edit, "local"),
+    "edit_many": (handle_edit_many, "local"),
 
     # Calendar tools
-    elif name == "reschedule_event":
-        return handle_reschedule_event(arguments)
-    elif name == "delete_event":
-        return handle_delete_event(arguments)
-    elif name == "list_calendar_events":
-        return handle_list_calendar_events(arguments)
+    "reschedule_event": (handle_reschedule_event, "calendar"),
+    "delete_event": (handle_delete_event, "calendar"),
+    "list_calendar_events": (handle_list_calendar_events, "calendar"),
+    "sync_calendar": (handle_sync_calendar, "calendar"),
 
     # Memory tools
-    elif name == "memory_condense":
-        return handle_memory_condense(arguments)
+    "memory_condense": (handle_memory_condense, "local"),
 
     # Progress tools
-    elif name == "manage_progress":
-        return handle_manage_progress(arguments)
+    "manage_progress": (handle_manage_progress, "local"),
 
     # Hindi practice
-    elif name == "push_hindi_practice":
-        return handle_push_hindi_practice(arguments)
+    "push_hindi_practice": (handle_push_hindi_practice, "practice"),
 
     # Wger tools
-    elif name == "get_workout_context":
-        return handle_get_workout_context(arguments)
-    elif name == "log_workout":
-        return handle_log_workout(arguments)
-    elif name == "search_exercise":
-        return handle_search_exercise(arguments)
-    elif name == "log_weight":
-        return handle_log_weight(arguments)
-    elif name == "get_workout_history":
-        return handle_get_workout_history(arguments)
-    elif name == "get_fitness_summary":
-        return handle_get_fitness_summary(arguments)
-    elif name == "log_meal":
-        return handle_log_meal(arguments)
-    elif name == "get_nutrition_summary":
-        return handle_get_nutrition_summary(arguments)
-
-    return [TextContent(type="text", text=f"Unknown tool: {name}")]
+    "get_workout_context": (handle_get_workout_context, "wger"),
+    "log_workout": (handle_log_workout, "wger"),
+    "search_exercise": (handle_search_exercise, "wger"),
+    "log_weight": (handle_log_weight, "wger"),
+    "get_workout_history": (handle_get_workout_history, "wger"),
+    "get_fitness_summary": (handle_get_fitness_summary, "wger"),
+    "log_meal": (handle_log_meal, "wger"),
+    "get_nutrition_summary": (handle_get_nutrition_summary, "wger"),
+}
+
+# Tools outside the "local" integration whose external calls are safe to
+# repeat (reads, marking events done). Like local tools they're re-run when
+# another call saved one of their files first (TransactionConflict).
+RERUNNABLE_TOOLS = frozenset({
+    "check_in", "status", "done", "done_many", "list_calendar_events", "sync_calendar",
+})
+
+# Runs of a re-runnable call before its conflict is reported
+CONFLICT_ATTEMPTS = 3
+
+
+async def handle_tool(name: str, arguments: dict) -> list[TextContent]:
+    """Route tool calls to handlers, writing each touched file once at the end."""
+    entry = TOOL_HANDLERS.get(name)
+    if entry is None:
+        return [TextContent(type="text", text=f"Unknown tool: {name}")]
+    handler, integration = entry
+    attempts = CONFLICT_ATTEMPTS if integration == "local" or name in RERUNNABLE_TOOLS else 1
+    with metrics.track_tool(name):
+        if inspect.iscoroutinefunction(handler):
+            return await handler(arguments)
+        return await dispatch.run(integration, _run_handler, handler, arguments, attempts)
+
+
+def _run_handler(handler, arguments: dict, attempts: int = 1) -> list[TextContent]:
+    for attempt in range(1, attempts + 1):
+        try:
+            with transaction():
+                return handler(arguments)
+        except TransactionConflict:
+            if attempt == attempts:
+                raise
@@ -0,0 +1,277 @@
+"""
+Change notifications for _data/ and the goals' content directories.
+
+Watches _data/** and every `content:` directory in goals.yml (Hindi/chapters/,
+fitness/weeks/...) and publishes the path of each file or directory that was
+created, written, renamed or deleted to the subscribed callbacks. Caches use
+this to drop what changed early, but none trust it in place of a stat:
+events arrive after the write (seconds after, when polling).
+
+Uses inotify on Linux (through libc, no extra dependency) and falls back to
+polling the trees every POLL_INTERVAL_SECONDS elsewhere, or if inotify can't
+be set up. GOALS_WATCH=auto|inotify|poll|off picks the backend.
+
+Callbacks run on the watcher thread and should be quick. A root path is
+published when the watcher may have missed events under it (inotify queue
+overflow): subscribers should treat everything below it as changed. Dot-files
+(temp files, lock files) are ignored.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Callable
+
+from .storage import REPO_PATH, _outside_transaction, forget_changed, get_goals_config
+
+logger = logging.getLogger(__name__)
+
+WATCH_MODE = os.environ.get("GOALS_WATCH", "auto")
+POLL_INTERVAL_SECONDS = 2.0
+
+_lock = threading.Lock()
+_subscribers: list[Callable[[Path], None]] = []
+_thread: threading.Thread | None = None
+_stop = threading.Event()
+_backend: str | None = None
+
+
+def subscribe(callback: Callable[[Path], None]) -> None:
+    """Call callback(path) for every change under a watched root."""
+    with _lock:
+        if callback not in _subscribers:
+            _subscribers.append(callback)
+
+
+def is_active() -> bool:
+    """True while a backend is running and every change will be published."""
+    return _backend is not None
+
+
+def backend() -> str | None:
+    """"inotify", "poll", or None if not running."""
+    return _backend
+
+
+def roots() -> list[Path]:
+    """Directories to watch: _data/ and each goal's content directory."""
+    found = [REPO_PATH / "_data"]
+    try:
+        with _outside_transaction():
+            goals = get_goals_config().get("goals", {})
+    except Exception as e:
+        logger.warning(f"Watcher: could not read goals.yml: {e}")
+        goals = {}
+    for goal in goals.values():
+        content = goal.get("content") if isinstance(goal, dict) else None
+        if content:
+            path = (REPO_PATH / content).resolve()
+            if path.is_dir() and path not in found and not any(r in path.parents for r in found):
+                found.append(path)
+    return found
+
+
+def _publish(paths) -> None:
+    with _lock:
+        subscribers = list(_subscribers)
+    for path in paths:
+        for callback in subscribers:
+            try:
+                callback(path)
+            except Exception as e:
+                logger.warning(f"Watcher subscriber failed for {path}: {e}")
+
+
+def _ignored(name: str) -> bool:
+    return name.startswith(".")
+
+
+# --- inotify backend ---
+
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = os.O_CLOEXEC
+
+_MASK = (_IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+         | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ATTRIB | _IN_ONLYDIR)
+
+_EVENT = struct.Struct("iIII")
+
+
+class _Inotify:
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs: dict[int, Path] = {}
+
+    def watch_tree(self, root: Path) -> list[Path]:
+        """Watch root and its subdirectories; returns files already inside (for new dirs)."""
+        found = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not _ignored(d)]
+            wd = self._add_watch(self.fd, os.fsencode(dirpath), _MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {dirpath}")
+            self.dirs[wd] = Path(dirpath)
+            found.extend(Path(dirpath) / f for f in filenames if not _ignored(f))
+        return found
+
+    def read(self) -> list[tuple[int, int, str]]:
+        try:
+            buf = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events, offset = [], 0
+        while offset + _EVENT.size <= len(buf):
+            wd, mask, _cookie, length = _EVENT.unpack_from(buf, offset)
+            offset += _EVENT.size
+            name = buf[offset:offset + length].rstrip(b"\0").decode(errors="surrogateescape")
+            offset += length
+            events.append((wd, mask, name))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def _run_inotify(inotify: _Inotify, watched: list[Path]) -> None:
+    while not _stop.is_set():
+        ready, _, _ = select.select([inotify.fd], [], [], 1.0)
+        if not ready:
+            continue
+        changed = {}
+        for wd, mask, name in inotify.read():
+            if mask & _IN_Q_OVERFLOW:
+                changed.update(dict.fromkeys(watched))
+                continue
+            if mask & _IN_IGNORED:
+                inotify.dirs.pop(wd, None)
+                continue
+            directory = inotify.dirs.get(wd)
+            if directory is None or (name and _ignored(name)):
+                continue
+            path = directory / name if name else directory
+            changed[path] = None
+            if mask & _IN_ISDIR and mask & (_IN_CREATE | _IN_MOVED_TO):
+                try:
+                    changed.update(dict.fromkeys(inotify.watch_tree(path)))
+                except OSError as e:
+                    logger.warning(f"Watcher: {e}")
+            if path.name == "goals.yml" and path.parent == REPO_PATH / "_data":
+                for root in roots():
+                    if root not in watched:
+                        watched.append(root)
+                        changed.update(dict.fromkeys(inotify.watch_tree(root)))
+        _publish(changed)
+
+
+# --- Polling backend ---
+
+def _scan(watched: list[Path]) -> dict[Path, tuple]:
+    state = {}
+    for root in watched:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not _ignored(d)]
+            for name in [*dirnames, *filenames]:
+                if _ignored(name):
+                    continue
+                path = Path(dirpath) / name
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    continue
+                state[path] = (st.st_mtime_ns, st.st_size, st.st_ino)
+    return state
+
+
+def _run_poll(watched: list[Path]) -> None:
+    state = _scan(watched)
+    while not _stop.wait(POLL_INTERVAL_SECONDS):
+        new_state = _scan(watched)
+        changed = [p for p in new_state.keys() | state.keys() if new_state.get(p) != state.get(p)]
+        state = new_state
+        if any(p.name == "goals.yml" and p.parent == REPO_PATH / "_data" for p in changed):
+            watched[:] = list(dict.fromkeys(watched + roots()))
+        _publish(changed)
+
+
+# --- Lifecycle ---
+
+def start() -> str | None:
+    """Start watching in a background thread. Returns the backend used, or None."""
+    global _thread, _backend
+    if _thread is not None or WATCH_MODE == "off":
+        return _backend
+
+    subscribe(forget_changed)
+    watched = roots()
+    inotify = None
+    if WATCH_MODE in ("auto", "inotify") and sys.platform.startswith("linux"):
+        try:
+            inotify = _Inotify()
+            for root in watched:
+                inotify.watch_tree(root)
+        except (OSError, AttributeError) as e:
+            logger.warning(f"inotify unavailable ({e}), polling for changes instead")
+            if inotify is not None:
+                inotify.close()
+            inotify = None
+    if inotify is None and WATCH_MODE == "inotify":
+        return None
+
+    _stop.clear()
+    if inotify is not None:
+        _backend = "inotify"
+        target, args = _run_inotify, (inotify, watched)
+    else:
+        _backend = "poll"
+        target, args = _run_poll, (watched,)
+
+    def run():
+        global _backend
+        try:
+            target(*args)
+        except Exception as e:
+            logger.error(f"Watcher stopped: {e}")
+        finally:
+            _backend = None
+            if inotify is not None:
+                inotify.close()
+
+    _thread = threading.Thread(target=run, name="goals-watcher", daemon=True)
+    _thread.start()
+    logger.info(f"Watching {len(watched)} directories for changes ({_backend})")
+    return _backend
+
+
+def stop() -> None:
+    """Stop the watcher thread."""
+    global _thread
+    if _thread is None:
+        return
+    _stop.set()
+    _thread.join(timeout=5)
+    _thread = None
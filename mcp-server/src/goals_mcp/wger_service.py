@@ -12,6 +12,8 @@ import logging
 import requests
 import yaml
 
+from . import metrics
+
 logger = logging.getLogger(__name__)
 
 CONFIG_PATH = Path.home() / ".goals-mcp" / "wger-config.yml"
@@ -120,11 +122,13 @@ class WgerClient:
         # Try refresh token first
         if self._refresh_token:
             try:
-                resp = requests.post(
-                    f"{self.host}/api/v2/token/refresh",
-                    json={"refresh": self._refresh_token},
-                    timeout=10
-                )
+                with metrics.dependency("wger", "token_refresh") as call:
+                    resp = requests.post(
+                        f"{self.host}/api/v2/token/refresh",
+                        json={"refresh": self._refresh_token},
+                        timeout=10
+                    )
+                    call.failed = not resp.ok
                 if resp.ok:
                     data = resp.json()
                     self._access_token = data["access"]
@@ -134,12 +138,13 @@ class WgerClient:
                 logger.debug(f"Token refresh failed: {e}")
 
         # Full login
-        resp = requests.post(
-            f"{self.host}/api/v2/token",
-            json={"username": self.username, "password": self.password},
-            timeout=10
-        )
-        resp.raise_for_status()
+        with metrics.dependency("wger", "token"):
+            resp = requests.post(
+                f"{self.host}/api/v2/token",
+                json={"username": self.username, "password": self.password},
+                timeout=10
+            )
+            resp.raise_for_status()
         data = resp.json()
         self._access_token = data["access"]
         self._refresh_token = data["refresh"]
@@ -155,8 +160,9 @@ class WgerClient:
         url = f"{self.host}/api/v2/{endpoint.lstrip('/')}"
         timeout = kwargs.pop("timeout", 30)
 
-        resp = requests.request(method, url, headers=headers, timeout=timeout, **kwargs)
-        resp.raise_for_status()
+        with metrics.dependency("wger", method.lower()):
+            resp = requests.request(method, url, headers=headers, timeout=timeout, **kwargs)
+            resp.raise_for_status()
         return resp.json()
 
     def get(self, endpoint: str, **params) -> dict:
@@ -0,0 +1,158 @@
+"""
+Helpers for YAML files holding a single top-level block sequence.
+
+daily.yml and memory.yml are lists of "- " items at column 0 under a comment
+header. Splitting the text into per-item chunks lets writers splice in just
+the items that changed instead of re-dumping the whole list, and the same
+layout allows appending items as text or parsing only the last few.
+"""
+
+import os
+import re
+
+import yaml
+
+from .storage import _yaml_dump, _yaml_load
+
+
+def render_item(item) -> str:
+    """Serialize one list item exactly as save_yaml would inside the full list."""
+    return _yaml_dump([item])
+
+
+def split_items(text: str) -> tuple[str, list[str]] | None:
+    """
+    Split text into (header, item chunks).
+
+    Each chunk runs from its "- " line up to the next one, so header + chunks
+    joined is the original text. Returns None if the text is not a plain block
+    sequence (flow style, document markers, top-level mappings...).
+    """
+    header_lines = []
+    chunks: list[list[str]] = []
+
+    for line in text.splitlines(keepends=True):
+        if line.startswith("- ") or line.rstrip("\r\n") == "-":
+            chunks.append([line])
+        elif chunks:
+            if line[:1] not in (" ", "#", "\n", "\r"):
+                return None
+            chunks[-1].append(line)
+        else:
+            if line.strip() and not line.lstrip().startswith("#"):
+                return None
+            header_lines.append(line)
+
+    if chunks and not chunks[-1][-1].endswith("\n"):
+        chunks[-1][-1] += "\n"
+    return "".join(header_lines), ["".join(c) for c in chunks]
+
+
+def render_list(header: str, items: list, old_items: list = None, old_chunks: list[str] = None) -> tuple[str, list[str]]:
+    """
+    Render header + items, reusing old_chunks for items equal to old_items.
+
+    Returns (text, chunks). An empty list renders as the bare header, like
+    save_yaml.
+    """
+    chunks = []
+    old_items = old_items or []
+    old_chunks = old_chunks or []
+    for i, item in enumerate(items):
+        if i < len(old_chunks) and i < len(old_items) and item == old_items[i]:
+            chunks.append(old_chunks[i])
+        else:
+            chunks.append(render_item(item))
+
+    if not chunks:
+        return header.rstrip() + "\n", chunks
+    return header + "".join(chunks), chunks
+
+
+_ITEM_START = re.compile(rb"\n(?=-(?: |\r?\n))")
+
+
+def _is_item_start(buf: bytes, i: int) -> bool:
+    return buf.startswith(b"- ", i) or buf[i:i + 2] in (b"-\n", b"-\r")
+
+
+def read_tail(path, limit: int, block_size: int = 8192) -> list | None:
+    """
+    Parse only the last `limit` items of a block-sequence file.
+
+    Reads backwards in blocks until enough "- " item starts are found, so the
+    cost depends on the size of the items returned, not the file. Returns None
+    if the tail doesn't look like a block sequence (callers fall back to a
+    full parse).
+    """
+    with open(path, "rb") as f:
+        pos = f.seek(0, 2)
+        buf = b""
+        while True:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+
+            starts = [m.end() for m in _ITEM_START.finditer(buf)]
+            if pos == 0 and _is_item_start(buf, 0):
+                starts.insert(0, 0)
+            if len(starts) >= limit or pos == 0:
+                break
+
+    if not starts:
+        # Header only (or not a block list at all)
+        return [] if not buf.strip() or all(
+            not line.strip() or line.lstrip().startswith(b"#") for line in buf.splitlines()
+        ) else None
+
+    chunk = buf[starts[-limit]:] if len(starts) >= limit else buf[starts[0]:]
+    try:
+        items = _yaml_load(chunk.decode())
+    except (yaml.YAMLError, UnicodeDecodeError):
+        return None
+    expected = min(limit, len(starts))
+    if not isinstance(items, list) or len(items) != expected:
+        return None
+    return items
+
+
+def can_append(path) -> bool:
+    """True if path is missing or its last top-level line belongs to a block sequence."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return True
+    with f:
+        size = f.seek(0, 2)
+        f.seek(max(0, size - 8192))
+        tail = f.read()
+
+    for line in reversed(tail.splitlines()):
+        if not line.strip() or line.startswith((b" ", b"#")):
+            continue
+        return _is_item_start(line + b"\n", 0)
+    # Only comments/indented lines in view: fine if the file is header-only
+    return size <= len(tail) and not any(line.startswith(b" ") for line in tail.splitlines())
+
+
+def append_items(path, items: list) -> None:
+    """
+    Append items to an existing block-sequence file with one fsynced
+    O_APPEND write, so the cost doesn't depend on the file's size. The caller
+    holds the file's lock; if the write fails the file is truncated back.
+    """
+    data = "".join(render_item(item) for item in items).encode()
+    fd = os.open(path, os.O_RDWR | os.O_APPEND)
+    try:
+        size = os.fstat(fd).st_size
+        if size and os.pread(fd, 1, size - 1) != b"\n":
+            data = b"\n" + data
+        try:
+            os.write(fd, data)
+            os.fsync(fd)
+        except BaseException:
+            os.ftruncate(fd, size)
+            raise
+    finally:
+        os.close(fd)
@@ -0,0 +1,228 @@
+"""
+Byte-range patching of block-style YAML documents.
+
+index_spans() records where each single-line scalar value sits in the text,
+keyed by its path (("tasks", 2, "done"), ("fitness", "offset_weeks")).
+apply() then rewrites just those spans, or drops a key's line, leaving every
+comment and all other formatting untouched. Anything it can't express as a
+span edit (new keys, multi-line or block values, flow collections) makes it
+return None and the caller falls back to a ruamel round-trip dump.
+"""
+
+import re
+
+import yaml
+
+# key line, optionally starting a sequence item: "  - id: foo", "done: false"
+_KEY_LINE = re.compile(r'^(?P<indent> *)(?P<dash>- +)?(?P<key>[A-Za-z0-9_][\w.-]*) *:(?= |$)')
+_ITEM_LINE = re.compile(r'^(?P<indent> *)-(?: |$)')
+
+
+class _Unindexable(Exception):
+    pass
+
+
+def _value_end(line: str, start: int) -> int | None:
+    """End of the scalar starting at line[start], excluding any trailing comment."""
+    if start >= len(line):
+        return start
+    quote = line[start]
+    if quote in "'\"":
+        i = start + 1
+        while i < len(line):
+            if quote == "'" and line.startswith("''", i):
+                i += 2
+                continue
+            if quote == '"' and line[i] == "\\":
+                i += 2
+                continue
+            if line[i] == quote:
+                end = i + 1
+                rest = line[end:].strip()
+                return end if not rest or rest.startswith("#") else None
+            i += 1
+        return None  # closes on a later line
+    comment = line.find(" #", start)
+    return len(line[:comment].rstrip()) if comment != -1 else len(line.rstrip())
+
+
+def index_spans(text: str) -> dict[tuple, tuple[int, int, int]] | None:
+    """
+    Map each key path to (line number, value start, value end).
+
+    Only keys whose value fits on their own line are included. Returns None
+    if the layout isn't something this indexer understands.
+    """
+    spans = {}
+    lines = text.split("\n")
+    # (kind, column, path, item count); kind is "map" (column of its keys)
+    # or "seq" (column of its dashes)
+    stack = [("map", 0, (), 0)]
+    parent = None       # path whose nested block may start on the next line
+    scalar_col = None   # column of the last key with an inline value
+    last_key = None
+
+    def open_map(col: int) -> tuple:
+        nonlocal parent
+        while stack[-1][1] > col or (stack[-1][0] == "seq" and stack[-1][1] >= col):
+            stack.pop()
+        kind, top_col, path, _ = stack[-1]
+        if kind == "map" and top_col == col:
+            return path
+        if parent is None:
+            raise _Unindexable
+        stack.append(("map", col, parent, 0))
+        path, parent = parent, None
+        return path
+
+    def open_item(col: int) -> tuple:
+        nonlocal parent
+        while stack[-1][1] > col:
+            stack.pop()
+        kind, top_col, path, count = stack[-1]
+        if kind == "seq" and top_col == col:
+            stack[-1] = (kind, top_col, path, count + 1)
+            return path + (count + 1,)
+        if parent is None:
+            raise _Unindexable
+        stack.append(("seq", col, parent, 0))
+        path, parent = parent, None
+        return path + (0,)
+
+    try:
+        for lineno, line in enumerate(lines):
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#"):
+                continue
+            if stripped in ("---", "...") or "\t" in line[:len(line) - len(line.lstrip())]:
+                raise _Unindexable
+            indent = len(line) - len(line.lstrip(" "))
+
+            # Continuation of the previous key's inline value (folded plain
+            # scalar, block scalar body, multi-line quote): not patchable
+            if scalar_col is not None and indent > scalar_col:
+                spans.pop(last_key, None)
+                continue
+            scalar_col = None
+
+            m = _KEY_LINE.match(line)
+            if m:
+                dash = m.group("dash")
+                if dash:
+                    item_path = open_item(indent)
+                    key_col = indent + len(dash)
+                    stack.append(("map", key_col, item_path, 0))
+                    map_path = item_path
+                else:
+                    key_col = indent
+                    map_path = open_map(key_col)
+
+                path = map_path + (m.group("key"),)
+                start = m.end()
+                while start < len(line) and line[start] == " ":
+                    start += 1
+                value = line[start:]
+                if not value or value.startswith("#"):
+                    # Nested block (or null) follows
+                    spans[path] = (lineno, m.end(), m.end())
+                    parent = path
+                    last_key = None
+                    continue
+
+                parent = None
+                scalar_col, last_key = key_col, path
+                if value[0] in "|>&*!":
+                    continue  # block scalar, anchor, alias or tag
+                end = _value_end(line, start)
+                if end is not None:
+                    spans[path] = (lineno, start, end)
+                continue
+
+            m = _ITEM_LINE.match(line)
+            if m:
+                open_item(indent)
+                rest = line[m.end():].strip()
+                if not rest or rest.startswith("#"):
+                    raise _Unindexable  # mapping item starting on the next line
+                parent = None
+                scalar_col, last_key = indent, None
+                continue
+
+            raise _Unindexable
+    except _Unindexable:
+        return None
+    return spans
+
+
+def render_scalar(value) -> str | None:
+    """Single-line YAML for a scalar value, or None if it needs more than one line."""
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list, tuple, set)):
+        return None
+    text = yaml.safe_dump(value, allow_unicode=True, width=float("inf"))
+    if text.endswith("\n...\n"):
+        text = text[:-5]
+    text = text.rstrip("\n")
+    return None if "\n" in text else text
+
+
+def apply(text: str, sets: dict[tuple, object] = None, deletes: list[tuple] = ()) -> str | None:
+    """
+    Return text with the values at `sets` paths replaced and the keys at
+    `deletes` removed, or None if any edit isn't a pure span edit.
+    """
+    spans = index_spans(text)
+    if spans is None:
+        return None
+
+    lines = text.split("\n")
+    edits = []
+    for path, value in (sets or {}).items():
+        span = spans.get(path)
+        rendered = render_scalar(value)
+        if span is None or rendered is None:
+            return None
+        lineno, start, end = span
+        if start == end and _nested_below(lines, lineno):
+            return None  # replacing a nested block is structural
+        edits.append((lineno, start, end, rendered))
+
+    drop = set()
+    for path in deletes:
+        span = spans.get(path)
+        if span is None:
+            continue  # already absent
+        lineno, start, end = span
+        if start == end and _nested_below(lines, lineno):
+            return None
+        line = lines[lineno]
+        if _KEY_LINE.match(line).group("dash"):
+            return None  # first key of a sequence item
+        drop.add(lineno)
+
+    for lineno, start, end, rendered in edits:
+        if lineno in drop:
+            return None
+        line = lines[lineno]
+        if rendered:
+            prefix = line[:start] if line[start - 1:start] == " " else line[:start] + " "
+            lines[lineno] = prefix + rendered + line[end:]
+        else:
+            lines[lineno] = line[:start].rstrip() + line[end:]
+
+    return "\n".join(line for i, line in enumerate(lines) if i not in drop)
+
+
+def _nested_below(lines: list[str], lineno: int) -> bool:
+    """True if the key on lines[lineno] has an indented block under it."""
+    key_line = lines[lineno]
+    m = _KEY_LINE.match(key_line)
+    col = len(m.group("indent")) + len(m.group("dash") or "")
+    for line in lines[lineno + 1:]:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        indent = len(line) - len(line.lstrip(" "))
+        return indent > col or (indent == col and stripped.startswith("- "))
+    return False
@@ -0,0 +1,17 @@
+"""Point the server at a scratch copy of the repo (data and content) before goals_mcp is imported."""
+
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+_scratch = Path(tempfile.mkdtemp(prefix="goals-mcp-tests-"))
+shutil.copytree(ROOT, _scratch, dirs_exist_ok=True,
+                ignore=shutil.ignore_patterns(".git", "mcp-server", "scripts", "*.png", "*.patch"))
+os.environ["REPO_PATH"] = str(_scratch)
+os.environ["HOME"] = str(_scratch / "home")
+os.environ.setdefault("GOALS_WATCH", "off")
+sys.path.insert(0, str(ROOT / "mcp-server" / "src"))
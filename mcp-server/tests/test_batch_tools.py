@@ -0,0 +1,66 @@
+"""done_many: per-item results, and all-or-nothing when an item raises."""
+
+from pathlib import Path
+
+import pytest
+
+from goals_mcp import storage, tools
+
+DATE = "2026-01-20"
+
+
+def _data_files() -> dict[Path, bytes]:
+    data = storage.REPO_PATH / "_data"
+    return {p: p.read_bytes() for p in data.rglob("*") if p.is_file() and not p.name.startswith(".")}
+
+
+def _done_many(items: list[dict]) -> str:
+    return tools._run_handler(tools.handle_done_many, {"items": items})[0].text
+
+
+def _fitness_on(date: str) -> int:
+    return (storage.get_daily_entry(date) or {}).get("fitness", 0)
+
+
+def test_invalid_item_reports_and_others_apply():
+    logs = storage.get_goal_logs("fitness")
+    fitness = _fitness_on(DATE)
+
+    text = _done_many([
+        {"goal": "no-such-goal", "duration": 10, "date": DATE},
+        {"goal": "fitness", "duration": 20, "date": DATE},
+    ])
+
+    assert text.startswith("1. Unknown goal: 'no-such-goal'")
+    assert "2. Logged 20 min to fitness" in text
+    assert storage.get_goal_logs("fitness") != logs
+    assert _fitness_on(DATE) == fitness + 20
+
+
+def test_item_raising_midway_saves_nothing(monkeypatch):
+    before = _data_files()
+    fitness_logs = storage.get_goal_logs("fitness")
+    daily = storage.get_daily_entry(DATE)
+
+    real_append = tools.append_goal_log
+    calls = []
+
+    def append_then_fail(goal_id, date, entry):
+        calls.append(goal_id)
+        if len(calls) == 2:
+            raise RuntimeError("disk full")
+        real_append(goal_id, date, entry)
+
+    monkeypatch.setattr(tools, "append_goal_log", append_then_fail)
+
+    with pytest.raises(RuntimeError, match="disk full"):
+        _done_many([
+            {"goal": "fitness", "duration": 30, "date": DATE},
+            {"goal": "hindi", "duration": 15, "date": DATE},
+        ])
+
+    assert calls == ["fitness", "hindi"]
+    # Includes the log journals: the first item's append was never flushed
+    assert _data_files() == before
+    assert storage.get_goal_logs("fitness") == fitness_logs
+    assert storage.get_daily_entry(DATE) == daily
@@ -0,0 +1,97 @@
+"""diff_scheduled_tasks: one listing, per-event fallback, and failed lookups never read as deleted."""
+
+from datetime import datetime
+
+import httplib2
+from gcsa.event import Event
+from googleapiclient.errors import HttpError
+
+from goals_mcp import calendar_service, tools
+
+
+def _http_error(status: int) -> HttpError:
+    return HttpError(httplib2.Response({"status": status}), b"")
+
+
+class FakeCalendar:
+    default_calendar = "primary"
+
+    def __init__(self, listed: dict, lookups: dict):
+        self.listed = listed      # event_id -> start, returned by get_events
+        self.lookups = lookups    # event_id -> start, Event, or exception for get_event
+        self.queries = []
+        self.fetched = []
+
+    def get_events(self, **kwargs):
+        self.queries.append(kwargs)
+        return [Event("[Goal] x", start=start, event_id=eid) for eid, start in self.listed.items()]
+
+    def get_event(self, event_id, **kwargs):
+        self.fetched.append(event_id)
+        value = self.lookups[event_id]
+        if isinstance(value, Exception):
+            raise value
+        if isinstance(value, Event):
+            return value
+        return Event("[Goal] x", start=value, event_id=event_id)
+
+
+def _task(task_id: str, event_id: str, when: str) -> dict:
+    return {"goal_id": "fitness", "unit": "week-3",
+            "task": {"id": task_id, "name": task_id, "event_id": event_id, "scheduled_for": when}}
+
+
+def test_listing_is_goal_events_on_the_default_calendar(monkeypatch):
+    gc = FakeCalendar({"e1": datetime(2026, 1, 20, 9, 0)}, {})
+    monkeypatch.setattr(calendar_service, "get_calendar", lambda: gc)
+
+    assert calendar_service.diff_scheduled_tasks([_task("a", "e1", "2026-01-20T09:00:00")]) == []
+    assert gc.queries[0]["query"] == "[Goal]"
+    assert gc.queries[0]["calendar_id"] == "primary"
+    assert gc.fetched == []
+
+
+def test_statuses(monkeypatch):
+    cancelled = Event("[Goal] x", start=datetime(2026, 1, 21, 9, 0), event_id="cancelled", status="cancelled")
+    gc = FakeCalendar(
+        {"moved": datetime(2026, 1, 20, 11, 0)},
+        {
+            "far": datetime(2026, 3, 1, 9, 0),
+            "gone": _http_error(404),
+            "cancelled": cancelled,
+            "flaky": _http_error(503),
+            "offline": TimeoutError("timed out"),
+        },
+    )
+    monkeypatch.setattr(calendar_service, "get_calendar", lambda: gc)
+
+    drift = calendar_service.diff_scheduled_tasks([
+        _task("moved", "moved", "2026-01-20T09:00:00"),
+        _task("far", "far", "2026-01-20T09:00:00"),
+        _task("gone", "gone", "2026-01-21T09:00:00"),
+        _task("cancelled", "cancelled", "2026-01-21T09:00:00"),
+        _task("flaky", "flaky", "2026-01-22T09:00:00"),
+        _task("offline", "offline", "2026-01-22T09:00:00"),
+    ])
+
+    status = {d["task_id"]: d["status"] for d in drift}
+    assert status == {"moved": "moved", "far": "moved", "gone": "deleted", "cancelled": "deleted",
+                      "flaky": "unknown", "offline": "unknown"}
+    by_id = {d["task_id"]: d for d in drift}
+    assert by_id["moved"]["calendar_start"] == datetime(2026, 1, 20, 11, 0)
+    assert by_id["flaky"]["error"] == "HTTP 503"
+    assert "moved" not in gc.fetched
+
+
+def test_sync_never_clears_on_a_failed_lookup(monkeypatch):
+    scheduled = [_task("mon-run", "e-flaky", "2026-01-20T09:00:00")]
+    monkeypatch.setattr(tools, "get_all_scheduled_tasks", lambda: scheduled)
+    monkeypatch.setattr(calendar_service, "get_calendar",
+                        lambda: FakeCalendar({}, {"e-flaky": _http_error(500)}))
+    calls = []
+    monkeypatch.setattr(tools, "update_todo_task", lambda *a, **k: calls.append((a, k)))
+
+    text = tools.handle_sync_calendar({"apply": True})[0].text
+
+    assert "skipped (couldn't check calendar event: HTTP 500)" in text
+    assert calls == []
@@ -0,0 +1,46 @@
+"""daily.yml updates splice one entry's text and match a full re-dump byte for byte."""
+
+import pytest
+
+from goals_mcp import daily_store, storage
+
+
+@pytest.fixture
+def daily():
+    path = storage.get_daily_path()
+    original = path.read_bytes()
+    yield path
+    path.write_bytes(original)
+
+
+def _full_dump(path) -> str:
+    return storage._render_yaml(path, storage._yaml_load(path.read_text()))
+
+
+def _scan(start: str, end: str) -> list:
+    entries = storage._yaml_load(storage.get_daily_path().read_text())
+    return sorted((e for e in entries if start <= storage.to_date_str(e["date"]) <= end),
+                  key=lambda e: storage.to_date_str(e["date"]))
+
+
+@pytest.mark.parametrize("date, fields", [
+    ("2026-01-23", {"fitness": 45}),
+    ("2026-01-23", {"calendar": True, "notes": "spliced: with a colon"}),
+    ("2026-10-18", {"hindi": 1, "mood": "good"}),
+    ("2026-10-17", {"notes": "tab\there and\na second line"}),
+])
+def test_update_matches_full_dump(daily, date, fields):
+    entry = storage.update_daily_entry(date, **fields)
+    assert daily_store._chunks is not None  # spliced, not re-dumped
+    assert {k: entry[k] for k in fields} == fields
+    assert daily.read_text() == _full_dump(daily)
+    assert storage.get_daily_entry(date) == entry
+
+
+def test_index_follows_hand_edits(daily):
+    storage.update_daily_entry("2026-10-18", fitness=10)
+    assert daily_store.between("2026-01-01", "2026-12-31") == _scan("2026-01-01", "2026-12-31")
+
+    daily.write_text(daily.read_text().replace("fitness: 10", "fitness: 99"))
+    assert storage.get_daily_entry("2026-10-18")["fitness"] == 99
+    assert daily_store.between("2026-10-01", "2026-10-31") == _scan("2026-10-01", "2026-10-31")
@@ -0,0 +1,63 @@
+"""FanOut reads run together against one deadline; run() honours integration limits."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from goals_mcp import dispatch
+
+
+def test_fanout_bounded_by_the_slowest_read():
+    reads = dispatch.FanOut(timeout=5)
+    start = time.monotonic()
+    for key in ("a", "b", "c"):
+        reads.submit(key, lambda k=key: time.sleep(0.2) or k)
+    assert [reads.result(k) for k in ("a", "b", "c")] == ["a", "b", "c"]
+    assert time.monotonic() - start < 0.5
+
+
+def test_fanout_deadline_is_shared():
+    hung = threading.Event()
+    reads = dispatch.FanOut(timeout=0.2)
+    try:
+        reads.submit("hung", hung.wait)
+        reads.submit("also hung", hung.wait)
+        reads.submit("fast", lambda: "ok")
+        reads.submit("fails", lambda: 1 / 0)
+
+        start = time.monotonic()
+        assert reads.result("hung") is dispatch.TIMED_OUT
+        # The deadline has passed: later collections don't wait again
+        assert reads.result("also hung") is dispatch.TIMED_OUT
+        assert time.monotonic() - start < 0.4
+        assert reads.result("fast") == "ok"
+        with pytest.raises(ZeroDivisionError):
+            reads.result("fails")
+    finally:
+        hung.set()
+
+
+def test_run_limits_calls_in_flight():
+    in_flight, peak = [0], [0]
+    lock = threading.Lock()
+
+    def call(value):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.05)
+        with lock:
+            in_flight[0] -= 1
+        return value
+
+    async def main():
+        return await asyncio.gather(*(dispatch.run("practice", call, i) for i in range(4)))
+
+    before = dispatch.queue_stats().get("practice", {}).get("calls", 0)
+    assert asyncio.run(main()) == [0, 1, 2, 3]
+    assert peak[0] == dispatch.INTEGRATION_LIMITS["practice"] == 1
+    stats = dispatch.queue_stats()["practice"]
+    assert stats["calls"] - before == 4
+    assert stats["queued"] == stats["in_flight"] == 0
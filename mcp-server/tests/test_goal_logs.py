@@ -0,0 +1,107 @@
+"""Goal log journals and month shards read and write the same logs as plain YAML."""
+
+import shutil
+
+import pytest
+
+from goals_mcp import storage
+
+ENTRIES = [
+    ("2026-01-09", {"value": 20, "notes": "same day as an existing record"}),
+    ("2026-02-03", {"value": 15, "notes": "new day"}),
+    ("2026-02-03", {"value": 5, "done": True}),
+    ("2026-03-01", {"notes": "no value"}),
+]
+
+
+@pytest.fixture
+def goal(request):
+    """A fresh goal whose flat log is a copy of hindi's."""
+    goal_id = f"test-{request.node.name.replace('_', '-')}"
+    paths = storage.get_goal_log_paths(goal_id)
+    shutil.copy(storage.get_log_path("hindi"), storage.get_log_path(goal_id))
+    yield goal_id
+    for path in paths:
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink(missing_ok=True)
+
+
+def _expected(goal_id: str) -> list:
+    logs = storage._load_list(storage.get_log_path(goal_id))
+    for date, entry in ENTRIES:
+        storage._apply_log_entry(logs, date, dict(entry))
+    return logs
+
+
+def _append_all(goal_id: str) -> None:
+    for date, entry in ENTRIES:
+        storage.append_goal_log(goal_id, date, dict(entry))
+
+
+def test_journal_compacts_to_the_direct_write(goal, monkeypatch):
+    flat = storage.get_log_path(goal)
+    original = flat.read_bytes()
+    expected = _expected(goal)
+
+    _append_all(goal)
+    assert flat.read_bytes() == original
+    assert storage.get_journal_path(goal).exists()
+    assert storage.get_goal_logs(goal) == expected
+
+    assert storage.compact_goal_logs(goal) == len(ENTRIES)
+    assert not storage.get_journal_path(goal).exists()
+    compacted = flat.read_bytes()
+    assert storage.get_goal_logs(goal) == expected
+
+    flat.write_bytes(original)
+    monkeypatch.setattr(storage, "LOG_MODE", "direct")
+    _append_all(goal)
+    assert flat.read_bytes() == compacted
+
+
+def test_torn_journal_line_is_skipped(goal):
+    storage.append_goal_log(goal, *ENTRIES[1])
+    with storage.get_journal_path(goal).open("a") as f:
+        f.write('{"date": "2026-02-04", "entry": {"val')
+    logs = storage.get_goal_logs(goal)
+    assert logs[-1]["date"] == "2026-02-03"
+    assert storage.compact_goal_logs(goal) == 1
+
+
+def test_migration_keeps_the_log(goal):
+    flat = storage.get_log_path(goal)
+    header = flat.read_text().split("\n- ")[0]
+    before = storage.get_goal_logs(goal)
+
+    assert storage.migrate_goal_logs(goal) == {goal: 1}
+    assert not flat.exists()
+    assert [p.name for p in sorted(storage.get_log_dir(goal).iterdir())] == ["2026-01.yml"]
+    assert storage.get_log_shard_path(goal, "2026-01").read_text().startswith(header)
+    assert storage.get_goal_logs(goal) == before
+    # Already sharded: nothing to do
+    assert storage.migrate_goal_logs(goal) == {}
+
+
+def test_shards_split_by_month_and_read_by_range(goal, monkeypatch):
+    expected = _expected(goal)
+    storage.migrate_goal_logs(goal)
+
+    _append_all(goal)
+    assert storage.get_goal_log_months(goal) == ["2026-01", "2026-02", "2026-03"]
+    assert storage.get_goal_logs(goal) == expected
+    assert storage.get_goal_logs(goal, "2026-02-01", "2026-02-28") == [
+        r for r in expected if str(r["date"]).startswith("2026-02")]
+
+    storage.compact_goal_logs(goal)
+    compacted = {p.name: p.read_bytes() for p in storage.get_log_dir(goal).iterdir()}
+    assert storage.get_goal_logs(goal) == expected
+
+    # Direct writes into the shards produce the same files
+    shutil.rmtree(storage.get_log_dir(goal))
+    shutil.copy(storage.get_log_path("hindi"), storage.get_log_path(goal))
+    storage.migrate_goal_logs(goal)
+    monkeypatch.setattr(storage, "LOG_MODE", "direct")
+    _append_all(goal)
+    assert {p.name: p.read_bytes() for p in storage.get_log_dir(goal).iterdir()} == compacted
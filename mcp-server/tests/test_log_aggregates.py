@@ -0,0 +1,38 @@
+"""Write-time log aggregates match a rebuild from the logs, and survive a restart."""
+
+from goals_mcp import log_aggregates, storage
+
+
+def _fields(agg: dict) -> dict:
+    return {k: agg[k] for k in ("last_date", "days", "dates", "anchors", "completed")}
+
+
+def _rebuilt(goal_id: str) -> dict:
+    versions = tuple(storage.get_version(p) for p in storage.get_goal_log_paths(goal_id))
+    return _fields(log_aggregates._build(goal_id, versions))
+
+
+def test_appends_match_a_rebuild(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_aggregates, "AGGREGATES_DIR", tmp_path)
+    goal = "fitness"
+    log_aggregates.current(goal)
+
+    for date, value in [("2026-10-12", 20), ("2026-10-12", 15), ("2026-10-18", 30), ("2026-10-18", 5)]:
+        before = log_aggregates._goals[goal]["versions"]
+        storage.append_goal_log(goal, date, {"value": value, "note": "test"})
+        # Applied as a delta, not rebuilt
+        assert log_aggregates._goals[goal]["versions"] != before
+
+    agg = log_aggregates.current(goal)
+    assert _fields(agg) == _rebuilt(goal)
+    assert agg["last_date"] == "2026-10-18"
+    assert log_aggregates.stats(agg, "2026-10-12", "2026-10-18") == log_aggregates.stats(
+        log_aggregates._build(goal, agg["versions"]), "2026-10-12", "2026-10-18")
+
+    # Persisted, and reloaded as-is by a fresh process
+    log_aggregates.save()
+    log_aggregates._goals.pop(goal)
+    log_aggregates._loaded.discard(goal)
+    reloaded = log_aggregates.current(goal)
+    assert reloaded is not agg and goal not in log_aggregates._unsaved
+    assert _fields(reloaded) == _fields(agg)
@@ -0,0 +1,50 @@
+"""memory.yml: entries are appended in place as text, and tail reads match a full parse."""
+
+import os
+
+from goals_mcp import storage, yaml_list
+
+
+def test_remember_appends_without_rewriting():
+    path = storage.get_memory_path()
+    before = path.read_bytes()
+    inode = os.stat(path).st_ino
+
+    entry = storage.add_memory_entry("weights felt light: 'really' # not a comment", "2026-01-20")
+
+    after = path.read_bytes()
+    assert os.stat(path).st_ino == inode  # same file, not a rename
+    assert after.startswith(before)
+    assert after[len(before):].decode() == yaml_list.render_item(entry)
+    assert storage.get_memory_entries()[-1] == entry
+
+
+def test_append_within_a_transaction_is_deferred():
+    path = storage.get_memory_path()
+    before = path.read_bytes()
+
+    with storage.transaction():
+        entry = storage.add_memory_entry("deferred", "2026-01-21")
+        assert path.read_bytes() == before
+        assert storage.get_recent_memory(1) == [entry]
+
+    assert storage.get_recent_memory(1) == [entry]
+
+
+def test_append_adds_missing_newline(tmp_path):
+    path = tmp_path / "list.yml"
+    path.write_text("# header\n- a: 1")
+
+    yaml_list.append_items(path, [{"b": 2}])
+
+    assert storage._yaml_load(path.read_text()) == [{"a": 1}, {"b": 2}]
+
+
+def test_tail_matches_full_parse():
+    for i in range(30):
+        storage.add_memory_entry(f"note {i}\nsecond line", "2026-01-22")
+    entries = storage.get_memory_entries()
+
+    for limit in (1, 5, 30):
+        assert yaml_list.read_tail(storage.get_memory_path(), limit) == entries[-limit:]
+        assert storage.get_recent_memory(limit) == entries[-limit:]
@@ -0,0 +1,87 @@
+"""/metrics text: lock contention, tool and dependency series."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from goals_mcp import locks, metrics, storage, tools
+
+
+def _series(text: str, name: str) -> dict[str, float]:
+    """{label string: value} for one metric name."""
+    out = {}
+    for line in text.splitlines():
+        if line.startswith(name + "{") or line.startswith(name + " "):
+            labels, _, value = line[len(name):].rpartition(" ")
+            out[labels] = float(value)
+    return out
+
+
+def test_lock_contention_is_exported():
+    path = storage.REPO_PATH / "_data" / "daily.yml"
+    held = locks.acquire(path)
+    waiter = threading.Thread(target=lambda: locks.release(locks.acquire(path)))
+    waiter.start()
+    time.sleep(0.05)
+    locks.release(held)
+    waiter.join()
+
+    text = metrics.render()
+    label = '{path="_data/daily.yml"}'
+    assert "# TYPE goals_lock_wait_seconds_total counter" in text
+    assert _series(text, "goals_lock_acquired_total")[label] >= 2
+    assert _series(text, "goals_lock_contended_total")[label] >= 1
+    assert _series(text, "goals_lock_wait_seconds_max")[label] >= 0.04
+    assert _series(text, "goals_lock_hold_seconds_total")[label] >= 0.04
+
+
+def test_tool_calls_are_timed_and_counted():
+    before = _series(metrics.render(), "goals_tool_duration_seconds_count").get('{tool="status"}', 0)
+    asyncio.run(tools.handle_tool("status", {}))
+    with pytest.raises(RuntimeError):
+        with metrics.track_tool("test-failing"):
+            raise RuntimeError("boom")
+
+    text = metrics.render()
+    assert "# TYPE goals_tool_duration_seconds histogram" in text
+    assert _series(text, "goals_tool_duration_seconds_count")['{tool="status"}'] == before + 1
+    assert _series(text, "goals_tool_in_flight")['{tool="status"}'] == 0
+    assert _series(text, "goals_tool_errors_total")['{tool="test-failing"}'] == 1
+    assert '{tool="status"}' not in _series(text, "goals_tool_errors_total")
+
+    # Cumulative buckets ending in +Inf == count
+    buckets = [v for k, v in _series(text, "goals_tool_duration_seconds_bucket").items()
+               if k.startswith('{tool="test-failing",')]
+    assert buckets == sorted(buckets) and buckets[-1] == 1
+    assert len(buckets) == len(metrics.BUCKETS) + 1
+
+
+def test_dependency_failures_are_counted():
+    @metrics.timed("test-dep")
+    def _fetch(ok):
+        return {"success": ok}
+
+    @metrics.timed("test-dep", "explode")
+    def explode():
+        raise OSError("down")
+
+    _fetch(True)
+    _fetch(False)
+    with pytest.raises(OSError):
+        explode()
+
+    text = metrics.render()
+    count = _series(text, "goals_dependency_duration_seconds_count")
+    errors = _series(text, "goals_dependency_errors_total")
+    fetch = '{dependency="test-dep",operation="fetch"}'
+    boom = '{dependency="test-dep",operation="explode"}'
+    assert (count[fetch], errors[fetch]) == (2, 1)
+    assert (count[boom], errors[boom]) == (1, 1)
+
+
+def test_label_values_are_escaped():
+    with metrics.track_tool('odd "name"\\\n'):
+        pass
+    assert 'tool="odd \\"name\\"\\\\\\n"' in metrics.render()
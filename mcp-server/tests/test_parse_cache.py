@@ -0,0 +1,59 @@
+"""The parse cache hands out private copies and follows every change to the file."""
+
+import os
+
+from goals_mcp import storage
+
+
+def _counting(calls):
+    def parse(path, content):
+        calls.append(content)
+        return storage._parse_yaml(path, content)
+    return parse
+
+
+def test_hits_are_private_copies(tmp_path):
+    path = tmp_path / "doc.yml"
+    path.write_text("items:\n- a\n")
+    calls = []
+    parse = _counting(calls)
+
+    first = storage._cached_parse(path, parse)
+    first["items"].append("mutated")
+    assert storage._cached_parse(path, parse) == {"items": ["a"]}
+    assert len(calls) == 1
+
+
+def test_stat_key_changes_reparse(tmp_path):
+    path = tmp_path / "doc.yml"
+    path.write_text("value: 1\n")
+    calls = []
+    parse = _counting(calls)
+    assert storage._cached_parse(path, parse) == {"value": 1}
+
+    # Same size, in place: caught by mtime
+    st = path.stat()
+    path.write_text("value: 2\n")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert storage._cached_parse(path, parse) == {"value": 2}
+
+    # Same size, replaced with the old mtime restored: caught by inode
+    st = path.stat()
+    tmp = tmp_path / "doc.tmp"
+    tmp.write_text("value: 3\n")
+    os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(tmp, path)
+    assert storage._cached_parse(path, parse) == {"value": 3}
+    assert len(calls) == 3
+
+
+def test_derived_values_follow_the_document(tmp_path):
+    path = tmp_path / "doc.yml"
+    path.write_text("items: [a, b]\n")
+
+    def count(data):
+        return len(data["items"])
+
+    assert storage._cached_derive(path, storage._parse_yaml, count) == 2
+    path.write_text("items: [a, b, c]\n")
+    assert storage._cached_derive(path, storage._parse_yaml, count) == 3
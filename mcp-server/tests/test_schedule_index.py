@@ -0,0 +1,65 @@
+"""The compiled schedule answers like the linear scan, for ordered and unordered weeks."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from goals_mcp import schedule_index, storage
+
+
+def _weeks(*spans) -> list[dict]:
+    return [{"number": n, "start": s, "end": e} for n, s, e in spans]
+
+
+ORDERED = _weeks(*[(n + 1, str(date(2026, 1, 5) + timedelta(weeks=n)),
+                    str(date(2026, 1, 11) + timedelta(weeks=n))) for n in range(8)])
+
+SCHEDULES = {
+    "ordered": ORDERED,
+    "gaps": ORDERED[::2],
+    "shuffled": [ORDERED[i] for i in (3, 0, 7, 1, 5, 2, 6, 4)],
+    "overlapping": ORDERED[:3] + _weeks((4, "2026-01-20", "2026-02-03"), (5, "2026-01-26", "2026-02-01")),
+    "backwards": ORDERED[::-1],
+}
+
+CURRENT = {
+    "fitness": {"offset_weeks": 2},
+    "hindi": {"override_week": 5},
+    "calendar": {"paused_until": "2026-02-01"},
+    "trading": {"override_week": 42},
+}
+
+
+def _days():
+    day = date(2025, 12, 28)
+    while day <= date(2026, 3, 8):
+        yield str(day)
+        day += timedelta(days=1)
+
+
+@pytest.mark.parametrize("name", SCHEDULES)
+def test_matches_linear_scan(name, monkeypatch):
+    schedule = {"weeks": SCHEDULES[name]}
+    compiled = schedule_index._Compiled(("test",), schedule, CURRENT)
+    assert compiled.ordered == (name in ("ordered", "gaps"))
+
+    for today in _days():
+        monkeypatch.setattr(storage, "get_today", lambda today=today: today)
+        assert compiled.current_week(today) == storage.get_current_week(schedule), today
+        found = next((w for w in schedule["weeks"] if w["start"] <= today <= w["end"]), None)
+        assert compiled.week_for(today) == found, today
+        for goal_id in [*CURRENT, "sell"]:
+            assert compiled.effective_week(goal_id, today) == \
+                storage.get_effective_week(goal_id, schedule, CURRENT), (goal_id, today)
+
+
+def test_follows_schedule_edits():
+    path = storage.REPO_PATH / "_data" / "schedule.yml"
+    original = path.read_text()
+    try:
+        assert schedule_index.current_week() == storage.get_current_week(storage.get_schedule())
+        path.write_text(original.replace('start: "2026-01-05"', 'start: "2026-01-04"'))
+        assert schedule_index.week_for("2026-01-04")["number"] == 1
+    finally:
+        path.write_text(original)
+    assert schedule_index.week_for("2026-01-04") is None
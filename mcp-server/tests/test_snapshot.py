@@ -0,0 +1,85 @@
+"""The parse snapshot serves unchanged files after a restart and nothing else."""
+
+import os
+
+import pytest
+
+from goals_mcp import snapshot, storage
+
+
+@pytest.fixture
+def parses(tmp_path, monkeypatch):
+    """YAML texts parsed since the last simulated restart."""
+    monkeypatch.setattr(snapshot, "SNAPSHOT_PATH", tmp_path / "parse-snapshot.pickle")
+    calls = []
+    real = storage._yaml_load
+
+    def counting(text):
+        calls.append(text)
+        return real(text)
+
+    monkeypatch.setattr(storage, "_yaml_load", counting)
+    yield calls
+    _restart(calls)
+
+
+def _restart(calls) -> None:
+    """Drop everything a new process wouldn't have."""
+    with storage._doc_cache_lock:
+        storage._doc_cache.clear()
+        storage._derived.clear()
+        storage._snapshot_docs.clear()
+    snapshot._digests.clear()
+    snapshot._saved = ({}, frozenset())
+    calls.clear()
+
+
+def test_unchanged_files_are_not_reparsed(parses):
+    path = storage.get_daily_path()
+    _restart(parses)
+    expected = storage.load_yaml(path)
+    saved = snapshot.warm()
+    assert saved > 0
+
+    _restart(parses)
+    assert snapshot.load() == saved
+    assert storage.load_yaml(path) == expected
+    assert parses == []
+
+    # Touched but unchanged (git checkout): the content hash still matches
+    _restart(parses)
+    snapshot.load()
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert storage.load_yaml(path) == expected
+    assert parses == []
+
+
+def test_changed_files_are_reparsed(parses):
+    path = storage.get_memory_path()
+    original = path.read_bytes()
+    _restart(parses)
+    snapshot.warm()
+
+    try:
+        path.write_bytes(original + b"- date: '2026-10-18'\n  text: after the snapshot\n")
+        _restart(parses)
+        snapshot.load()
+        assert storage.load_yaml(path)[-1]["text"] == "after the snapshot"
+        assert len(parses) == 1
+    finally:
+        path.write_bytes(original)
+
+
+def test_foreign_or_corrupt_snapshots_are_ignored(parses, monkeypatch):
+    _restart(parses)
+    snapshot.warm()
+
+    version = snapshot.SNAPSHOT_VERSION
+    monkeypatch.setattr(snapshot, "SNAPSHOT_VERSION", version + 1)
+    assert snapshot.load() == 0
+    monkeypatch.setattr(snapshot, "SNAPSHOT_VERSION", version)
+    assert snapshot.load() > 0
+
+    snapshot.SNAPSHOT_PATH.write_bytes(b"not a pickle")
+    assert snapshot.load() == 0
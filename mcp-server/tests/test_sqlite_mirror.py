@@ -0,0 +1,73 @@
+"""Queries answered from the SQLite mirror match the YAML path, across writes and hand edits."""
+
+import pytest
+
+from goals_mcp import goals, sqlite_mirror, storage
+
+GOALS = ["hindi", "fitness", "calendar", "brother", "trading", "sell", "spend-less", "work-boundaries"]
+
+
+@pytest.fixture
+def mirror(tmp_path, monkeypatch):
+    monkeypatch.setattr(sqlite_mirror, "ENABLED", True)
+    monkeypatch.setattr(sqlite_mirror, "DB_PATH", tmp_path / "mirror.sqlite3")
+    monkeypatch.setattr(sqlite_mirror, "_conn", None)
+    monkeypatch.setattr(sqlite_mirror, "_failed", False)
+    daily, memory = storage.get_daily_path(), storage.get_memory_path()
+    saved = daily.read_bytes(), memory.read_bytes()
+    yield monkeypatch
+    if sqlite_mirror._conn is not None:
+        sqlite_mirror._conn.close()
+    daily.write_bytes(saved[0])
+    memory.write_bytes(saved[1])
+
+
+def _answers() -> dict:
+    answers = {
+        "pending": storage.get_all_pending_tasks(),
+        "pending hindi": storage.get_all_pending_tasks("hindi"),
+        "scheduled": storage.get_all_scheduled_tasks(),
+        "event": storage.find_task_by_event_id("no-such-event"),
+        "day": storage.get_daily_entry("2026-10-18"),
+        "range": storage.get_daily_entries_between("2026-01-01", "2026-12-31"),
+        "memory": storage.get_recent_memory(3),
+    }
+    for goal_id in GOALS:
+        logs = goals._GoalLogs(goal_id)
+        answers[goal_id] = (logs.last_date(), logs.since("2026-01-01"), logs.since("2026-01-10", "2026-02-10"),
+                            sorted(logs.completed()))
+    return answers
+
+
+def _check(mirror) -> None:
+    mirrored = _answers()
+    assert sqlite_mirror._conn is not None
+    mirror.setattr(sqlite_mirror, "ENABLED", False)
+    try:
+        assert mirrored == _answers()
+    finally:
+        mirror.setattr(sqlite_mirror, "ENABLED", True)
+
+
+def test_matches_yaml(mirror):
+    _check(mirror)
+
+    storage.update_daily_entry("2026-10-18", fitness=25, notes="mirrored")
+    storage.add_memory_entry("mirror test", "2026-10-18")
+    storage.append_goal_log("fitness", "2026-10-18", {"value": 25})
+    _check(mirror)
+
+    task = storage.get_all_pending_tasks("hindi")[0]
+    todo = storage.get_todo_path("hindi", task["unit"])
+    original = todo.read_bytes()
+    try:
+        storage.update_todo_task("hindi", task["unit"], task["task"]["id"], done=True)
+        _check(mirror)
+    finally:
+        todo.write_bytes(original)
+
+    # Hand edits, seen through the stat check rather than the write hook
+    path = storage.get_daily_path()
+    path.write_text(path.read_text().replace("fitness: 25", "fitness: 52"))
+    _check(mirror)
+    assert storage.get_daily_entry("2026-10-18")["fitness"] == 52
@@ -0,0 +1,56 @@
+"""Task index: hand edits, new and removed files are seen on the next query, watcher or not."""
+
+import shutil
+
+import pytest
+
+from goals_mcp import storage, task_index, watcher
+
+
+@pytest.fixture(params=["off", "poll"])
+def watching(request, monkeypatch):
+    if request.param == "poll":
+        monkeypatch.setattr(watcher, "WATCH_MODE", "poll")
+        monkeypatch.setattr(watcher, "POLL_INTERVAL_SECONDS", 60.0)  # events would arrive far too late
+        watcher.start()
+        yield
+        watcher.stop()
+    else:
+        yield
+
+
+def _ids(goal_id: str) -> set[str]:
+    return {r["task"]["id"] for r in task_index.pending_tasks(goal_id)}
+
+
+def test_hand_edits_are_seen_immediately(watching):
+    unit_dir = storage.REPO_PATH / "_data" / "todos" / "indexgoal"
+    unit_dir.mkdir(exist_ok=True)
+    path = unit_dir / "week-1.yml"
+    path.write_text("tasks:\n  - id: a\n    name: A\n    done: false\n")
+    assert _ids("indexgoal") == {"a"}
+
+    path.write_text("tasks:\n  - id: a\n    name: A\n    done: true\n  - id: b\n    name: B\n    done: false\n")
+    assert _ids("indexgoal") == {"b"}
+
+    (unit_dir / "week-2.yml").write_text("tasks:\n  - id: c\n    event_id: ev-c\n    done: false\n")
+    assert _ids("indexgoal") == {"b", "c"}
+    assert task_index.find_by_event_id("ev-c")["unit"] == "week-2"
+
+    path.unlink()
+    (unit_dir / "week-2.yml").unlink()
+    assert _ids("indexgoal") == set()
+    assert task_index.find_by_event_id("ev-c") is None
+    shutil.rmtree(unit_dir)
+
+
+def test_index_matches_a_full_scan():
+    scanned = []
+    todos = storage.REPO_PATH / "_data" / "todos"
+    for goal_dir in todos.iterdir():
+        for f in goal_dir.glob("*.yml"):
+            for task in storage.get_unit_todo(goal_dir.name, f.stem).get("tasks", []):
+                if not task.get("done", False):
+                    scanned.append((goal_dir.name, f.stem, task["id"]))
+    indexed = [(r["goal_id"], r["unit"], r["task"]["id"]) for r in task_index.pending_tasks()]
+    assert sorted(indexed) == sorted(scanned)
@@ -0,0 +1,63 @@
+"""compute_todos' per-goal memo always matches a fresh computation."""
+
+from datetime import datetime
+
+from goals_mcp import goals, storage
+
+
+def _fresh(config) -> list[dict]:
+    saved = dict(goals._todo_memo)
+    goals._todo_memo.clear()
+    try:
+        return goals.compute_todos(config)
+    finally:
+        goals._todo_memo.clear()
+        goals._todo_memo.update(saved)
+
+
+def _check() -> list[dict]:
+    config = storage.get_goals_config()
+    memoized = goals.compute_todos(config)
+    assert memoized == _fresh(config)
+    return memoized
+
+
+def test_memo_follows_hand_edits_content_and_logs():
+    _check()
+    week = storage.get_current_week()["number"]
+    day = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"][datetime.now().weekday()]
+
+    # A pending task for today in every goal's current-week todo
+    paths = []
+    for goal_dir in (storage.REPO_PATH / "_data" / "todos").iterdir():
+        path = goal_dir / f"week-{week}.yml"
+        path.write_text(f"tasks:\n  - id: {day}-task\n    name: Today\n    done: false\n")
+        paths.append(path)
+    pending = _check()
+
+    # Hand edit in place (no rename, so the directory's mtime doesn't change)
+    for path in paths:
+        with open(path, "r+") as f:
+            text = f.read().replace("done: false", "done: true ")
+            f.seek(0)
+            f.write(text)
+    assert _check() != pending
+
+    # New content item
+    config = storage.get_goals_config()
+    content = next(g["content"] for g in config["goals"].values() if g.get("content"))
+    (storage.REPO_PATH / content / "zz-new-item.md").write_text("# new\n")
+    _check()
+
+    # Log for every goal
+    for goal_id in config["goals"]:
+        storage.append_goal_log(goal_id, storage.get_today(), {"value": 1})
+    _check()
+
+
+def test_hit_reuses_the_memo():
+    config = storage.get_goals_config()
+    goals.compute_todos(config)
+    memo = dict(goals._todo_memo)
+    goals.compute_todos(config)
+    assert all(goals._todo_memo[g] is memo[g] for g in memo)
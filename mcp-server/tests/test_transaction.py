@@ -0,0 +1,76 @@
+"""transaction(): deferred writes, read-your-writes, and all-or-nothing commits."""
+
+import pytest
+
+from goals_mcp import storage
+
+
+def _bytes(*paths) -> list[bytes]:
+    return [p.read_bytes() for p in paths]
+
+
+def test_writes_are_deferred_and_visible_inside():
+    daily, memory = storage.get_daily_path(), storage.get_memory_path()
+    before = _bytes(daily, memory)
+
+    with storage.transaction():
+        storage.update_daily_entry("2026-10-18", fitness=42)
+        storage.add_memory_entry("inside a transaction", "2026-10-18")
+        assert storage.get_daily_entry("2026-10-18")["fitness"] == 42
+        assert storage.get_memory_entries()[-1]["text"] == "inside a transaction"
+        assert _bytes(daily, memory) == before
+
+    assert _bytes(daily, memory) != before
+    assert storage.get_daily_entry("2026-10-18")["fitness"] == 42
+    assert storage.get_memory_entries()[-1]["text"] == "inside a transaction"
+
+
+def test_nothing_is_written_if_the_block_raises():
+    daily, memory = storage.get_daily_path(), storage.get_memory_path()
+    before = _bytes(daily, memory)
+
+    with pytest.raises(ValueError):
+        with storage.transaction():
+            storage.update_daily_entry("2026-10-18", fitness=7)
+            storage.add_memory_entry("never saved", "2026-10-18")
+            raise ValueError("handler failed")
+
+    assert _bytes(daily, memory) == before
+
+
+def _edit_elsewhere(**fields):
+    """Another call saving daily.yml after this transaction read it."""
+    with storage._outside_transaction():
+        storage.update_daily_entry("2026-10-18", **fields)
+
+
+def test_conflicting_commit_writes_nothing():
+    daily, memory = storage.get_daily_path(), storage.get_memory_path()
+
+    with pytest.raises(storage.TransactionConflict):
+        with storage.transaction():
+            storage.update_daily_entry("2026-10-18", fitness=11)
+            storage.add_memory_entry("lost to the conflict", "2026-10-18")
+            _edit_elsewhere(hindi=3)
+            edited = _bytes(daily, memory)
+
+    assert _bytes(daily, memory) == edited
+
+
+def test_handlers_are_rerun_on_conflict():
+    from goals_mcp import tools
+
+    attempts = []
+
+    def handler(arguments):
+        entry = storage.update_daily_entry("2026-10-18", fitness=len(attempts) + 20)
+        attempts.append(entry["fitness"])
+        if len(attempts) == 1:
+            _edit_elsewhere(hindi=5)
+        return "ok"
+
+    assert tools._run_handler(handler, {}, attempts=2) == "ok"
+    assert attempts == [20, 21]
+    # The rerun saw the other call's change instead of overwriting it
+    entry = storage.get_daily_entry("2026-10-18")
+    assert (entry["fitness"], entry["hindi"]) == (21, 5)
@@ -0,0 +1,40 @@
+"""get_urgent_summary: cached without the watcher, dropped on storage writes."""
+
+import pytest
+
+from goals_mcp import server, storage
+
+
+@pytest.fixture
+def computed(monkeypatch):
+    calls = []
+    real = server._urgent_summary
+
+    def counting():
+        calls.append(1)
+        return real()
+
+    monkeypatch.setattr(server, "_urgent_summary", counting)
+    monkeypatch.setattr(server, "_summary_cache", None)
+    return calls
+
+
+def test_cached_under_stdio(computed):
+    assert not server.watcher.is_active()
+    first = server.get_urgent_summary()
+    assert server.get_urgent_summary() == first
+    assert len(computed) == 1
+
+
+def test_storage_write_drops_it(computed):
+    server.get_urgent_summary()
+    storage.add_memory_entry("summary test")
+    server.get_urgent_summary()
+    assert len(computed) == 2
+
+
+def test_expires_without_the_watcher(computed, monkeypatch):
+    monkeypatch.setattr(server, "SUMMARY_UNWATCHED_SECONDS", 0)
+    server.get_urgent_summary()
+    server.get_urgent_summary()
+    assert len(computed) == 2
@@ -0,0 +1,100 @@
+"""In-place value patches: same data as a ruamel round-trip, every other byte kept."""
+
+import shutil
+
+import pytest
+
+from goals_mcp import storage, yaml_patch
+
+UNIT = "week-1"
+
+# (task, update_todo_task arguments)
+UPDATES = [
+    ("anki-3", {"done": True}),
+    ("nahid-prep", {"done": False, "notes": "Redo: 10 sentences"}),
+    ("session-jan9", {"clear_schedule": True, "notes": "~45 min session"}),
+]
+
+
+@pytest.fixture
+def patches(monkeypatch):
+    """Results of the in-place patches attempted, so tests know the fast path ran."""
+    results = []
+    real = storage._patch_yaml
+
+    def recording(*args, **kwargs):
+        results.append(real(*args, **kwargs))
+        return results[-1]
+
+    monkeypatch.setattr(storage, "_patch_yaml", recording)
+    return results
+
+
+@pytest.fixture
+def todo_paths():
+    """Two copies of a todo unit: one patched in place, one through ruamel."""
+    source = storage.get_todo_path("hindi", UNIT)
+    paths = []
+    for goal_id in ("test-patched", "test-ruamel"):
+        path = storage.get_todo_path(goal_id, UNIT)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(source, path)
+        paths.append(path)
+    yield paths
+    for path in paths:
+        shutil.rmtree(path.parent)
+
+
+@pytest.mark.parametrize("task_id, changes", UPDATES)
+def test_patch_matches_ruamel(todo_paths, patches, monkeypatch, task_id, changes):
+    patched_path, ruamel_path = todo_paths
+    patched = storage.update_todo_task("test-patched", UNIT, task_id, **changes)
+    assert patches == [True]
+
+    monkeypatch.setattr(storage, "_patch_yaml", lambda *args, **kwargs: False)
+    via_ruamel = storage.update_todo_task("test-ruamel", UNIT, task_id, **changes)
+
+    assert patched == via_ruamel
+    assert patched_path.read_bytes() == ruamel_path.read_bytes()
+
+
+def test_quoted_values_round_trip(todo_paths, patches):
+    patched_path, _ = todo_paths
+    before = patched_path.read_text().split("\n")
+    notes = "Moved: see 'week 2' # not a comment"
+    storage.update_todo_task("test-patched", UNIT, "nahid-prep", notes=notes)
+    assert patches == [True]
+
+    after = patched_path.read_text().split("\n")
+    assert [i for i, (a, b) in enumerate(zip(before, after)) if a != b] == [8]
+    assert len(after) == len(before)
+    tasks = storage._parse_ruamel(patched_path, patched_path.read_text())["tasks"]
+    assert tasks[1]["notes"] == notes
+
+
+def test_structural_changes_are_left_to_ruamel():
+    text = "tasks:\n  - id: a\n    done: false\n"
+    assert yaml_patch.apply(text, {("tasks", 0, "notes"): "new key"}) is None
+    assert yaml_patch.apply(text, {("tasks", 0, "done"): ["a", "list"]}) is None
+    assert yaml_patch.apply(text, {("tasks", 0, "done"): True}) == "tasks:\n  - id: a\n    done: true\n"
+
+
+@pytest.mark.parametrize("goal_id, updates", [
+    ("fitness", {"level": 2, "offset_weeks": -1}),
+    ("trading", {"last_execution": "2026-10-16"}),
+    ("brother", {"last_execution": None, "current_call": 3}),
+])
+def test_current_goal_patch_matches_ruamel(patches, monkeypatch, goal_id, updates):
+    path = storage.REPO_PATH / "_data" / "current.yml"
+    original = path.read_bytes()
+    try:
+        patched = storage.update_current_goal(goal_id, updates)
+        patched_bytes = path.read_bytes()
+        assert patches == [True]
+
+        path.write_bytes(original)
+        monkeypatch.setattr(storage, "_patch_yaml", lambda *args, **kwargs: False)
+        assert storage.update_current_goal(goal_id, updates) == patched
+        assert path.read_bytes() == patched_bytes
+    finally:
+        path.write_bytes(original)